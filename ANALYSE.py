@@ -0,0 +1,45 @@
+########################################################################################################################
+# This is the python file to compute the credit assignment effects of every participant (see creditAssignment.py).
+# It reads the results of the experiments (see ResultsLoader) chunk by chunk and writes in analyses/:
+# creditAssignment_stayProbabilities.csv (the stay probabilities of each participant, post type and rewards) and
+# creditAssignment_effects.csv (the effect of the reward of the common and unique rooms for each participant).
+#
+# Example (the experimental trials of one experiment):
+#     python ANALYSE.py --experiments MoranEtAl2019
+########################################################################################################################
+
+#################################################
+#                    Imports                    #
+#################################################
+from argparse import ArgumentParser
+from os import makedirs
+from resultsLoader import ResultsLoader
+from creditAssignment import getStayProbabilities, getRewardEffects
+#################################################
+
+
+#################################################
+#                    Launch                     #
+#################################################
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compute the credit assignment effects of every participant.")
+    parser.add_argument("--results", default="results/", help="the directory of the results")
+    parser.add_argument("--experiments", nargs="+", default=None,
+                        help="the IDs of the experiments to analyse (by default, all of them)")
+    parser.add_argument("--includePractice", action="store_true", help="also use the practice trials")
+    parser.add_argument("--chunkSize", type=int, default=100000, help="the number of lines read at once")
+    parser.add_argument("--output", default="analyses/", help="the directory of the analyses")
+    arguments = parser.parse_args()
+
+    loader = ResultsLoader(pathToResults=arguments.results,
+                           experimentIDs=arguments.experiments,
+                           chunkSize=arguments.chunkSize)
+    stayProbabilities = getStayProbabilities(loader, includePractice=arguments.includePractice)
+    effects = getRewardEffects(stayProbabilities)
+
+    makedirs(arguments.output, exist_ok=True)
+    stayProbabilities.to_csv(arguments.output + "creditAssignment_stayProbabilities.csv", index=False)
+    effects.to_csv(arguments.output + "creditAssignment_effects.csv", index=False)
+    print(effects.groupby(["experimentID", "postType"])[["commonEffect", "uniqueEffect", "interaction"]].mean())
+
+########################################################################################################################
@@ -0,0 +1,50 @@
+########################################################################################################################
+# This is the python file to build the texture atlases of the stimuli for screen resolutions before the experiment (see
+# textureAtlas.py), e.g. on the lab computers after the images were changed. It also puts the other images (e.g., the
+# treasure) in the image cache for these resolutions, so that the first launch does not have to decode them either.
+# The atlases are used by Stimuli in atlas mode (useAtlas=True); they are kept in resources/cache/.
+#
+# Example (a full HD and a 4K screen):
+#     python ATLAS.py --resolutions 1920x1080 3840x2160
+########################################################################################################################
+
+#################################################
+#                    Imports                    #
+#################################################
+from argparse import ArgumentParser
+from imageCache import ImageCache
+from stimuliEngine import StimuliEngine
+from textureAtlas import makeStimuliAtlases
+#################################################
+
+
+#################################################
+#                    Launch                     #
+#################################################
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Build the texture atlases of the stimuli for screen resolutions.")
+    parser.add_argument("--resolutions", nargs="+", default=["1920x1080"],
+                        help="the resolutions of the screens, as widthxheight (e.g. 1920x1080)")
+    parser.add_argument("--images", default="resources/", help="the directory of the images")
+    arguments = parser.parse_args()
+
+    stimuli = StimuliEngine()
+    imageCache = ImageCache(pathToCache=arguments.images + "cache/")
+    for resolution in arguments.resolutions:
+        width, height = (int(value) for value in resolution.split("x"))
+
+        # The sizes and colours of the stimuli (the objects on their position rectangles), and the treasure the whole
+        # screen
+        objectSize, roomSize = stimuli.getStimuliSizes(height)
+        objectAtlas, roomAtlas = makeStimuliAtlases(objectNames=stimuli.objectNames,
+                                                    roomNames=stimuli.roomNames,
+                                                    objectSize=objectSize,
+                                                    roomSize=roomSize,
+                                                    objectBackground=stimuli.positionRectColour,
+                                                    pathToImages=arguments.images,
+                                                    imageCache=imageCache)
+        for atlas in [objectAtlas, roomAtlas]:
+            print(f"{resolution}: {atlas.buildAtlas()} ({atlas.atlasSize}x{atlas.atlasSize})")
+        imageCache.getImage(arguments.images + "treasure.jpg", (width, height))
+
+########################################################################################################################
@@ -0,0 +1,107 @@
+########################################################################################################################
+# This is the python file to fit the agents (see populationAgents.py) to recorded results by maximum likelihood.
+# It takes results files (allResults.csv or _experimentResults.csv files), fits every participant with every model in
+# parallel on all the cores of the computer, and writes all the fits in one CSV (one row per participant and model).
+# The fits are cached (see modelFitting.py), so fitting the same results again only fits the new participants.
+#
+# Example (fit the three models to every participant of an experiment, in fits/MoranEtAl2019_fits.csv):
+#     python FIT.py results/MoranEtAl2019/allResults.csv
+########################################################################################################################
+
+#################################################
+#                    Imports                    #
+#################################################
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from os import makedirs, path
+import pandas as pd
+from modelFitting import readParticipants, readCachedFit, fitAndCache
+from populationAgents import populationAgentTypes
+#################################################
+
+
+#################################################
+#                  fitResults                   #
+#################################################
+# This function fits every participant of the results files with every model and returns the fits as a dataframe.
+# Only the fits that are not cached are sent to the processes. The rooms of each participant's objects are read from
+# their _combinations.csv file (next to their results), or else found from the rooms they visited.
+def fitResults(resultsFileNames, modelNames, cacheDirectory="fits/cache/", nbProcesses=None):
+    participants = {}
+    for resultsFileName in resultsFileNames:
+        participants.update(readParticipants(resultsFileName))
+
+    fits = {}
+    fitsToDo = []
+    for participant in participants:
+        for modelName in modelNames:
+            fit = readCachedFit(cacheDirectory, participants[participant]["results"], modelName)
+            if fit is None:
+                fitsToDo.append((participant, modelName))
+            else:
+                fits[(participant, modelName)] = fit
+
+    if fitsToDo:
+        with ProcessPoolExecutor(max_workers=nbProcesses) as executor:
+            newFits = executor.map(fitAndCache,
+                                   [participants[participant]["results"] for participant, modelName in fitsToDo],
+                                   [modelName for participant, modelName in fitsToDo],
+                                   [cacheDirectory] * len(fitsToDo),
+                                   [participants[participant]["combinations"] for participant, modelName in fitsToDo])
+            for fitToDo, fit in zip(fitsToDo, newFits):
+                fits[fitToDo] = fit
+                # (a participant that could not be fitted has a row with the error instead of the fit)
+                if "error" in fit:
+                    (experimentID, participantID), modelName = fitToDo
+                    print(f"Warning: participant {participantID} of {experimentID} could not be fitted with "
+                          f"{modelName} ({fit['error']})")
+
+    # One row per participant and model, in the order of the results:
+    rows = []
+    for participant in participants:
+        for modelName in modelNames:
+            experimentID, participantID = participant
+            rows.append({"experimentID": experimentID, "participant": participantID,
+                         **fits[(participant, modelName)]})
+    return pd.DataFrame(rows)
+
+
+#################################################
+#                    Launch                     #
+#################################################
+# (the processes of the pool import this file, so the fitting is only launched from the main process)
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Fit the agents to recorded results by maximum likelihood.")
+    parser.add_argument("resultsFiles", nargs="+", help="allResults.csv or _experimentResults.csv files")
+    parser.add_argument("--models", nargs="+", default=list(populationAgentTypes), choices=list(populationAgentTypes),
+                        help="the models to fit (by default, all of them)")
+    parser.add_argument("--output", default=None,
+                        help="the CSV of the fits (by default, fits/<experimentID>_fits.csv for the first file)")
+    parser.add_argument("--cache", default="fits/cache/", help="the directory of the cached fits")
+    parser.add_argument("--processes", type=int, default=None, help="the number of processes (by default, all cores)")
+    arguments = parser.parse_args()
+
+    fits = fitResults(resultsFileNames=arguments.resultsFiles,
+                      modelNames=arguments.models,
+                      cacheDirectory=arguments.cache,
+                      nbProcesses=arguments.processes)
+
+    if fits.empty:
+        print("No participants were found in the results files, nothing was fitted.")
+    else:
+        outputFileName = arguments.output
+        if outputFileName is None:
+            outputFileName = f"fits/{fits['experimentID'].iloc[0]}_fits.csv"
+        if path.dirname(outputFileName):
+            makedirs(path.dirname(outputFileName), exist_ok=True)
+        fits.to_csv(outputFileName, index=False)
+
+        # (the participants that could not be fitted have no likelihood, only their error)
+        if "error" in fits:
+            fits = fits[fits["error"].isna()]
+        if fits.empty:
+            print(f"No participant could be fitted, the errors are in {outputFileName}.")
+        else:
+            print(fits.groupby("model")[["logLikelihood", "AIC", "BIC"]].sum())
+
+########################################################################################################################
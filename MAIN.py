@@ -5,13 +5,14 @@
 #################################################
 #                    Imports                    #
 #################################################
-from psychopy import visual
+# Only what the GUI needs is imported here, so that the experimenter gets the GUI as soon as possible: PsychoPy and the
+# experiment are imported once the GUI is done, and the results (pandas and matplotlib) at the end of the experiment.
+# The time of each phase of the start is printed (see startupTimer.py, and STARTUP.py to benchmark them).
+from startupTimer import StartupTimer
+startupTimer = StartupTimer()
 from screen import *  # provides all the screen setting up
-from stimuli import Stimuli
-from experiment import Experiment
 from gui import experimentGUI
-from quiz import Quiz
-from recordingResults import ResultsRecorder
+startupTimer.mark("importing the GUI")
 #################################################
 
 #################################################
@@ -25,8 +26,10 @@ from recordingResults import ResultsRecorder
 myGUI = experimentGUI(uiFile="resources/experimentGUI.ui",
                       screenSizes=pyqtScreen,
                       app=app)
+startupTimer.mark("loading the GUI form")
 # Launching it:
 myGUI.launchGUI()
+startupTimer.restart()  # (the time spent on the forms is not part of the start)
 # Getting the demographic data and the experiment ID (for the results):
 demographics = myGUI.participantDemographics
 experimentID = myGUI.experimentID
@@ -39,6 +42,19 @@ quiz100 = myGUI.quiz100
 
 #################################################
 
+#################################################
+#     Importing PsychoPy and the Experiment     #
+#################################################
+from psychopy import visual
+from stimuli import Stimuli
+from experiment import Experiment
+from frameTimeline import measureFrameDuration
+from quiz import Quiz
+from randomStreams import RandomStreams
+from resultsJournal import ResultsJournal
+startupTimer.mark("importing PsychoPy and the experiment")
+#################################################
+
 #################################################
 #            Creating PsychoPy Window           #
 #################################################
@@ -54,28 +70,50 @@ windowPsychoPy.setMouseVisible(False)
 
 # Get window/screen size information:
 windowPsychoPy.screen = getScreenSize(windowPsychoPy)
+# Measure the duration of its frames (the screens of the trials last numbers of frames, see frameTimeline.py):
+windowPsychoPy.frameDuration = measureFrameDuration(windowPsychoPy)
+startupTimer.mark("opening the window")
+#################################################
+
+#################################################
+#          Creating our Random Streams          #
+#################################################
+# All the randomness of the session comes from one seed (it is recorded with the results, and giving it back to
+# RandomStreams(seed=...) replays the same session). The stimuli, experiment and quiz each use their own streams.
+randomStreams = RandomStreams()
 #################################################
 
 #################################################
 #             Creating our Stimuli              #
 #################################################
 # Create a stimuli object:
-myStimuli = Stimuli(window=windowPsychoPy)
+myStimuli = Stimuli(window=windowPsychoPy,
+                    randomStreams=randomStreams,
+                    useAtlas=False,  # True to draw the objects and rooms of the trials from texture atlases
+                    streamImages=False)  # True to only make the images when they are used (large stimulus sets)
 # Launch the function that will create all the stimuli:
 myStimuli.createStimuli()
 
 # Obtain the room/object combinations from it (for the results):
 roomsOfTheObjects = myStimuli.combiRoomsOfTheObjects
 objectsOfTheRooms = myStimuli.combiObjectsOfTheRooms
+startupTimer.mark("creating the stimuli")
+print(startupTimer.report())
 #################################################
 
 #################################################
 #            Creating our Experiment            #
 #################################################
+# The results of the trials are written in a journal as the experiment goes (so they are not lost if it crashes): #
+myJournal = ResultsJournal(experimentID=experimentID,
+                           randomStreams=randomStreams)
+
 # Creating our experiment object #
 myExperiment = Experiment(window=windowPsychoPy,
                           stimuliClass=myStimuli,
-                          experimentalSetUp=experimentSetUp)  # This is where you set the experiment set-up
+                          experimentalSetUp=experimentSetUp,  # This is where you set the experiment set-up
+                          journal=myJournal,
+                          recordFrames=False)  # True to record the time of every frame of the trials (frameTimeline.py)
 
 # We also create our beginning quiz object #
 # We launch this, and then it will launch our experiment, and when it is all done it will close the window:
@@ -85,16 +123,20 @@ myQuiz = Quiz(window=windowPsychoPy,
               experiment=myExperiment)
 myQuiz.launchWholeQuiz()
 windowPsychoPy.close()
+# How long the screens of the quiz and of the trials actually lasted:
+print(myQuiz.timeline.report())
+print(myExperiment.timeline.report())
 #################################################
 
 #################################################
 #               Generating Results              #
 #################################################
+from recordingResults import ResultsRecorder  # (pandas and matplotlib are only needed from here)
 
 # Get all the information from our experiment that we need for the results: #
 quizAttempts = myQuiz.numberOfAttempts  # how many times the participant had to do the quiz to get 100% accuracy
 randomWalk = myExperiment.randomWalk  # random gaussian walk of the room probabilities
-experimentResults = myExperiment.results  # participant's results
+experimentResults = myJournal  # participant's results (the final files are made from the journal)
 
 # Create a result recorder object and launch it so it creates all the CSVs and PNGs necessary for keeping the results: #
 myResultsRecorder = ResultsRecorder(experimentID=experimentID,
@@ -103,7 +145,12 @@ myResultsRecorder = ResultsRecorder(experimentID=experimentID,
                                     randomWalk=randomWalk,
                                     experimentResults=experimentResults,
                                     roomsOfTheObjects=roomsOfTheObjects,
-                                    objectsOfTheRooms=objectsOfTheRooms)
+                                    objectsOfTheRooms=objectsOfTheRooms,
+                                    randomStreams=randomStreams,
+                                    frameTimeline=myExperiment.timeline,  # (written if its frames were recorded)
+                                    parquet=False,  # True to also write the results in parquet/ (needs pyarrow)
+                                    database=False,  # True to also write the results in results/results.sqlite
+                                    normalized=False)  # True to write the participants and trials in separate files
 myResultsRecorder.recordResults()
 # Results will be generated in the results directory, under a directory with the ID of the experiment, under a
 # directory named with the participant's ID
@@ -0,0 +1,106 @@
+########################################################################################################################
+# This is the python file to run a parameter recovery and model comparison study on an experiment set up (see
+# parameterRecovery.py). The participants are simulated in parallel, then every (participant, model) fit is run in
+# parallel, on all the cores of the computer.
+# It writes in recovery/: <experimentID>_recoveryFits.csv (every fit, with the true parameters),
+# <experimentID>_recoveryCorrelations.csv and <experimentID>_confusionMatrix.csv.
+#
+# Example (50 participants per model on the set up of Moran et al. 2019):
+#     python RECOVERY.py experimentFormats/MoranEtAl2019_settings.csv --settings 50 --seed 1
+########################################################################################################################
+
+#################################################
+#                    Imports                    #
+#################################################
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from os import makedirs
+import pandas as pd
+from experimentSettings import readSettings, makeExperimentSetUp
+from randomStreams import RandomStreams
+from populationAgents import populationAgentTypes
+from parameterRecovery import makeTrueParameters, simulateWithModel, fitSimulation, getRecoveryResults
+#################################################
+
+
+#################################################
+#               runRecoveryStudy                #
+#################################################
+# This function simulates nbSettings participants per model (or a grid of nbGridValues values per parameter), fits each
+# of them with every model, and returns every fit (with the true parameters) as a dataframe.
+def runRecoveryStudy(experimentSetUp, modelNames, nbSettings=50, nbGridValues=None, seed=None, nbProcesses=None):
+    studyStreams = RandomStreams(seed=seed)
+
+    # Every participant to simulate: its model, its true parameters and its own random streams
+    simulations = []
+    for modelName in modelNames:
+        for parameters in makeTrueParameters(modelName, studyStreams.parameters, nbSettings, nbGridValues):
+            simulations.append({"simulatingModel": modelName, "parameters": parameters})
+    participantsStreams = studyStreams.spawn(len(simulations))
+
+    with ProcessPoolExecutor(max_workers=nbProcesses) as executor:
+        # Simulating:
+        simulatedResults = list(executor.map(simulateWithModel,
+                                             [experimentSetUp] * len(simulations),
+                                             [simulation["simulatingModel"] for simulation in simulations],
+                                             [simulation["parameters"] for simulation in simulations],
+                                             [streams.seed for streams in participantsStreams],
+                                             [streams.spawnKey for streams in participantsStreams]))
+
+        # Fitting every simulated participant with every model (with the rooms of its objects from the simulation):
+        fitsToDo = [(i, modelName) for i in range(len(simulations)) for modelName in modelNames]
+        fits = executor.map(fitSimulation,
+                            [simulatedResults[i][0] for i, modelName in fitsToDo],
+                            [simulatedResults[i][1] for i, modelName in fitsToDo],
+                            [modelName for i, modelName in fitsToDo])
+
+        rows = []
+        for (i, modelName), fit in zip(fitsToDo, fits):
+            # (a fit that failed has a row with the error instead of the fit)
+            if "error" in fit:
+                print(f"Warning: participant {i + 1} could not be fitted with {modelName} ({fit['error']})")
+            trueParameters = {"true" + parameterName[0].upper() + parameterName[1:]: value
+                              for parameterName, value in simulations[i]["parameters"].items()}
+            rows.append({"participant": i + 1,
+                         "simulatingModel": simulations[i]["simulatingModel"],
+                         **trueParameters,
+                         **fit})
+    return pd.DataFrame(rows)
+
+
+#################################################
+#                    Launch                     #
+#################################################
+# (the processes of the pool import this file, so the study is only launched from the main process)
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Run a parameter recovery and model comparison study on an experiment set up.")
+    parser.add_argument("settingsFile", help="the settings of the experiment, e.g. "
+                                             "experimentFormats/MoranEtAl2019_settings.csv")
+    parser.add_argument("--models", nargs="+", default=list(populationAgentTypes), choices=list(populationAgentTypes),
+                        help="the models to simulate and fit (by default, all of them)")
+    parser.add_argument("--settings", type=int, default=50,
+                        help="the number of parameter settings (participants) drawn per model")
+    parser.add_argument("--gridValues", type=int, default=None,
+                        help="use a grid of this many values per parameter instead of drawn settings")
+    parser.add_argument("--seed", type=int, default=None, help="the seed of the study (by default, a new one)")
+    parser.add_argument("--processes", type=int, default=None, help="the number of processes (by default, all cores)")
+    parser.add_argument("--output", default="recovery/", help="the directory of the results of the study")
+    arguments = parser.parse_args()
+
+    expSetUp = readSettings(arguments.settingsFile)
+    fits = runRecoveryStudy(experimentSetUp=makeExperimentSetUp(expSetUp),
+                            modelNames=arguments.models,
+                            nbSettings=arguments.settings,
+                            nbGridValues=arguments.gridValues,
+                            seed=arguments.seed,
+                            nbProcesses=arguments.processes)
+    correlations, confusionMatrix = getRecoveryResults(fits, arguments.models)
+
+    makedirs(arguments.output, exist_ok=True)
+    fits.to_csv(arguments.output + expSetUp["id"] + "_recoveryFits.csv", index=False)
+    correlations.to_csv(arguments.output + expSetUp["id"] + "_recoveryCorrelations.csv", index=False)
+    confusionMatrix.to_csv(arguments.output + expSetUp["id"] + "_confusionMatrix.csv")
+    print(correlations)
+    print(confusionMatrix)
+
+########################################################################################################################
@@ -0,0 +1,138 @@
+########################################################################################################################
+# This is the python file to simulate a cohort of participants on an experiment set up (without any window).
+# Each simulated participant is answered by an agent (see agents.py) and gets the same result files as a real
+# participant (see recordingResults.py), in results/<experimentID>/ (with allResults.csv).
+# The participants are simulated in parallel on all the cores of the computer.
+#
+# Example (100 random agents on the set up of Moran et al. 2019, in results/MoranEtAl2019Simulated/):
+#     python SIMULATE.py experimentFormats/MoranEtAl2019_settings.csv random --participants 100 --seed 1
+########################################################################################################################
+
+#################################################
+#                    Imports                    #
+#################################################
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from os import makedirs
+import matplotlib
+from experimentSettings import readSettings, makeExperimentSetUp
+from randomStreams import RandomStreams
+from stimuliEngine import StimuliEngine
+from experimentEngine import ExperimentEngine
+from agents import createAgent, parseAgentSpec
+#################################################
+
+
+#################################################
+#             simulateParticipant               #
+#################################################
+# This function simulates one participant (it is run in the processes of the pool). It is given the experiment set up,
+# the agent spec, and the seed and spawn key of the participant's random streams, and it returns everything needed to
+# record the participant's results.
+def simulateParticipant(experimentSetUp, agentSpec, seed, spawnKey):
+    randomStreams = RandomStreams(seed=seed, spawnKey=spawnKey)
+
+    stimuli = StimuliEngine(randomStreams=randomStreams)
+    stimuli.createStimuli()
+
+    experiment = ExperimentEngine(stimuliClass=stimuli,
+                                  experimentalSetUp=experimentSetUp,
+                                  responder=createAgent(agentSpec, randomStreams),
+                                  randomStreams=randomStreams)
+    experiment.launchExperiment()
+
+    return {"randomStreams": randomStreams,
+            "randomWalk": experiment.randomWalk,
+            "experimentResults": experiment.results,
+            "roomsOfTheObjects": stimuli.combiRoomsOfTheObjects,
+            "objectsOfTheRooms": stimuli.combiObjectsOfTheRooms}
+
+
+#################################################
+#                simulateCohort                 #
+#################################################
+# This function simulates all the participants in parallel and records their results as they are done (the recording
+# is done in this process only, so that the participants' IDs are given one after the other).
+def simulateCohort(experimentSetUp, agentSpec, nbParticipants, experimentID, seed=None, nbProcesses=None,
+                   recordResults=True, parquet=False, database=False, normalized=False):
+    # The random streams of the cohort, each participant has its own streams spawned from them:
+    cohortStreams = RandomStreams(seed=seed)
+    participantsStreams = cohortStreams.spawn(nbParticipants)
+
+    # Simulated participants have no demographics and no quiz:
+    demographics = {"age": "NA", "gender": "NA", "education": "NA", "student": "NA", "fieldOfStudy": "NA",
+                    "timeToComplete": "NA"}
+    quizAttempts = "NA"
+
+    if recordResults:
+        # The plots of the random walks are saved without being shown:
+        matplotlib.use("Agg")
+        from recordingResults import ResultsRecorder
+        makedirs("results/", exist_ok=True)
+
+    allParticipants = []
+    with ProcessPoolExecutor(max_workers=nbProcesses) as executor:
+        participants = executor.map(simulateParticipant,
+                                    [experimentSetUp] * nbParticipants,
+                                    [agentSpec] * nbParticipants,
+                                    [streams.seed for streams in participantsStreams],
+                                    [streams.spawnKey for streams in participantsStreams],
+                                    chunksize=max(1, nbParticipants // (8 * (nbProcesses or 8))))
+
+        for participant in participants:
+            if recordResults:
+                resultsRecorder = ResultsRecorder(experimentID=experimentID,
+                                                  demographics=demographics,
+                                                  quizAttempts=quizAttempts,
+                                                  parquet=parquet,
+                                                  database=database,
+                                                  normalized=normalized,
+                                                  **participant)
+                resultsRecorder.recordResults()
+            allParticipants.append(participant)
+
+    return allParticipants
+
+
+#################################################
+#                    Launch                     #
+#################################################
+# (the processes of the pool import this file, so the simulation is only launched from the main process)
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Simulate a cohort of participants on an experiment set up.")
+    parser.add_argument("settingsFile", help="the settings of the experiment, e.g. "
+                                             "experimentFormats/MoranEtAl2019_settings.csv")
+    parser.add_argument("agentSpec", help="the agent and its parameters, e.g. random")
+    parser.add_argument("--participants", type=int, default=10, help="the number of participants to simulate")
+    parser.add_argument("--experimentID", default=None,
+                        help="the ID of the results directory (by default, the ID of the settings + Simulated)")
+    parser.add_argument("--seed", type=int, default=None, help="the seed of the cohort (by default, a new one)")
+    parser.add_argument("--processes", type=int, default=None, help="the number of processes (by default, all cores)")
+    parser.add_argument("--parquet", action="store_true",
+                        help="also write the results in the Parquet dataset (parquet/, needs pyarrow)")
+    parser.add_argument("--database", action="store_true",
+                        help="also write the results in the SQLite database (results/results.sqlite)")
+    parser.add_argument("--normalized", action="store_true",
+                        help="write allParticipants.csv and allTrials.csv instead of allResults.csv")
+    arguments = parser.parse_args()
+
+    parseAgentSpec(arguments.agentSpec)  # check the agent spec before starting the processes
+    if arguments.parquet:
+        from parquetResults import importPyarrow
+        importPyarrow()  # check pyarrow is there before simulating
+    expSetUp = readSettings(arguments.settingsFile)
+    experimentID = arguments.experimentID
+    if experimentID is None:
+        experimentID = expSetUp["id"] + "Simulated"
+
+    simulateCohort(experimentSetUp=makeExperimentSetUp(expSetUp),
+                   agentSpec=arguments.agentSpec,
+                   nbParticipants=arguments.participants,
+                   experimentID=experimentID,
+                   seed=arguments.seed,
+                   nbProcesses=arguments.processes,
+                   parquet=arguments.parquet,
+                   database=arguments.database,
+                   normalized=arguments.normalized)
+
+########################################################################################################################
@@ -0,0 +1,109 @@
+########################################################################################################################
+# This is the python file to benchmark the start of the experiment on a computer: it starts it several times, each time
+# in a new python process (as for a new participant), without the forms and the experiment themselves, and prints the
+# wall time of each phase (see startupTimer.py), as in MAIN.py: importing the GUI, loading the GUI form, importing
+# PsychoPy and the experiment, opening the window, creating the stimuli and importing the results modules. The time to
+# start python itself is the rest of the total time of each process.
+#
+# Example (5 starts, with the stimuli drawn from texture atlases):
+#     python STARTUP.py --repeats 5 --atlas
+########################################################################################################################
+
+#################################################
+#                    Imports                    #
+#################################################
+from argparse import ArgumentParser
+import json
+from subprocess import run
+import sys
+from time import perf_counter
+from startupTimer import StartupTimer
+#################################################
+
+
+#################################################
+#                measureStartup                 #
+#################################################
+# This function starts the experiment as MAIN.py does (it is run in a new process) and prints the time of each phase.
+def measureStartup(useAtlas=False, streamImages=False):
+    startupTimer = StartupTimer()
+    from screen import app, pyqtScreen, getScreenSize
+    from gui import experimentGUI
+    startupTimer.mark("importing the GUI")
+
+    myGUI = experimentGUI(uiFile="resources/experimentGUI.ui",
+                          screenSizes=pyqtScreen,
+                          app=app)
+    myGUI.setUp()
+    startupTimer.mark("loading the GUI form")
+
+    # (everything MAIN.py imports, even what is not used here)
+    from psychopy import visual
+    from stimuli import Stimuli
+    from experiment import Experiment
+    from frameTimeline import measureFrameDuration
+    from quiz import Quiz
+    from randomStreams import RandomStreams
+    from resultsJournal import ResultsJournal
+    startupTimer.mark("importing PsychoPy and the experiment")
+
+    windowPsychoPy = visual.Window(
+        units="pix",
+        fullscr=True,
+        color=[.8, .8, .8],
+        screen=0,
+        size=[1500, 1500])
+    windowPsychoPy.screen = getScreenSize(windowPsychoPy)
+    windowPsychoPy.frameDuration = measureFrameDuration(windowPsychoPy)
+    startupTimer.mark("opening the window")
+
+    myStimuli = Stimuli(window=windowPsychoPy,
+                        randomStreams=RandomStreams(),
+                        useAtlas=useAtlas,
+                        streamImages=streamImages)
+    myStimuli.createStimuli()
+    startupTimer.mark("creating the stimuli")
+    windowPsychoPy.close()
+
+    from recordingResults import ResultsRecorder
+    startupTimer.mark("importing the results modules")
+
+    print(json.dumps(startupTimer.phaseTimes))
+
+
+#################################################
+#                    Launch                     #
+#################################################
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark the start of the experiment.")
+    parser.add_argument("--repeats", type=int, default=5, help="the number of starts")
+    parser.add_argument("--atlas", action="store_true", help="create the stimuli with texture atlases")
+    parser.add_argument("--stream", action="store_true", help="create the stimuli with streamed images")
+    parser.add_argument("--measure", action="store_true", help="used by the benchmark: one start in this process")
+    arguments = parser.parse_args()
+
+    if arguments.measure:
+        measureStartup(useAtlas=arguments.atlas, streamImages=arguments.stream)
+        sys.exit()
+
+    # Each start is a new process, and the times of its phases are the last line it prints:
+    allPhaseTimes = []
+    for repeat in range(arguments.repeats):
+        processStart = perf_counter()
+        process = run([sys.executable, __file__, "--measure"]
+                      + ["--atlas"] * arguments.atlas + ["--stream"] * arguments.stream,
+                      capture_output=True, text=True, check=True)
+        totalTime = perf_counter() - processStart
+        phaseTimes = json.loads(process.stdout.strip().splitlines()[-1])
+        phaseTimes["starting python (and closing)"] = totalTime - sum(phaseTimes.values())
+        phaseTimes["total"] = totalTime
+        allPhaseTimes.append(phaseTimes)
+        print(f"start {repeat + 1}: {totalTime:.3f} s")
+
+    # The first start can be slower (the files are not in the disk cache yet, nor the images in the image cache):
+    print(f"\n{'phase':<40}{'first':>10}{'mean':>10}{'min':>10}")
+    for phase in allPhaseTimes[0]:
+        times = [phaseTimes[phase] for phaseTimes in allPhaseTimes]
+        print(f"{phase:<40}{times[0]:>10.3f}{sum(times) / len(times):>10.3f}{min(times):>10.3f}")
+
+########################################################################################################################
@@ -0,0 +1,50 @@
+########################################################################################################################
+# This is the python file to generate the synthetic results of many participants (see syntheticResults.py), e.g. to test
+# the loading and the analyses of the results on millions of trials. No session is run: the trials are generated with
+# array operations, in batches of participants in parallel, on all the cores of the computer.
+# It writes results/<experimentID>Synthetic/allResults.csv, with the same layout as the results of real participants.
+#
+# Example (10000 participants, about 1.7 million trials, on the set up of Moran et al. 2019):
+#     python SYNTHESISE.py experimentFormats/MoranEtAl2019_settings.csv --participants 10000 --seed 1
+########################################################################################################################
+
+#################################################
+#                    Imports                    #
+#################################################
+from argparse import ArgumentParser
+from os import makedirs
+from experimentSettings import readSettings, makeExperimentSetUp
+from syntheticResults import writeSyntheticResults
+#################################################
+
+
+#################################################
+#                    Launch                     #
+#################################################
+# (the processes of the pool import syntheticResults.py, so the generation is only launched from the main process)
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Generate the synthetic results of many participants.")
+    parser.add_argument("settingsFile", help="the settings of the experiment, e.g. "
+                                             "experimentFormats/MoranEtAl2019_settings.csv")
+    parser.add_argument("--participants", type=int, default=1000, help="the number of participants to generate")
+    parser.add_argument("--experimentID", default=None,
+                        help="the ID of the results (by default, the ID of the settings followed by Synthetic)")
+    parser.add_argument("--seed", type=int, default=None, help="the seed of the results (by default, a new one)")
+    parser.add_argument("--batchSize", type=int, default=200, help="the number of participants generated at once")
+    parser.add_argument("--processes", type=int, default=None, help="the number of processes (by default, all cores)")
+    arguments = parser.parse_args()
+
+    expSetUp = readSettings(arguments.settingsFile)
+    experimentID = arguments.experimentID or expSetUp["id"] + "Synthetic"
+    makedirs("results/" + experimentID, exist_ok=True)
+
+    generatorStreams = writeSyntheticResults(fileName="results/" + experimentID + "/allResults.csv",
+                                             experimentSetUp=makeExperimentSetUp(expSetUp),
+                                             nbParticipants=arguments.participants,
+                                             seed=arguments.seed,
+                                             batchSize=arguments.batchSize,
+                                             nbProcesses=arguments.processes)
+    print(f"{arguments.participants} participants written in results/{experimentID}/allResults.csv "
+          f"(seed {generatorStreams.seed})")
+
+########################################################################################################################
@@ -0,0 +1,169 @@
+########################################################################################################################
+# These classes are the simulated participants (agents) that can answer the trials in place of a real participant when
+# the experiment is run headless (see experimentEngine.py and SIMULATE.py).
+# An agent is a responder (see trialEngine.py): it is called with the trial, the current trial type and the objects of
+# the trial, and returns the response side and response time (or None). After the rooms of its response are visited,
+# its learn function is given the rooms and whether they yielded a treasure.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import numpy as np
+from randomStreams import generatorChoice
+from populationAgents import ModelFreeAgent, ModelBasedAgent, RetrospectiveAgent, getObjectRooms
+########################################
+
+
+########################################
+#                 Agent                #
+########################################
+# All agents are built on this class. They get the responses stream of the session's random streams and their
+# parameters (given as keywords, see parseAgentSpec).
+class Agent:
+    parameterNames = []  # the parameters the agent takes
+
+    def __init__(self, generator, **parameters):
+        self.generator = generator
+        self.parameters = parameters
+
+    # Respond to a trial (by default, randomly):
+    def __call__(self, trial, currentTrialType, trialObjects):
+        return generatorChoice(self.generator, ["left", "right"]), self.getResponseTime()
+
+    # Learn from the rooms visited after a response (by default, nothing is learnt):
+    # - responseObjects: the object chosen (or for uncertain trials, the dictionary of the chosen pair of objects)
+    # - roomsToBeShown: the two rooms visited, in the order they were shown
+    # - isTreasures: whether each of these two rooms yielded a treasure
+    def learn(self, trial, currentTrialType, responseObjects, roomsToBeShown, isTreasures):
+        pass
+
+    # Give a response time between 300 ms and 1.5 seconds:
+    def getResponseTime(self):
+        return self.generator.uniform(0.300, 1.500)
+
+########################################
+
+
+########################################
+#              RandomAgent             #
+########################################
+# This agent answers randomly and does not learn (like randomResponder).
+class RandomAgent(Agent):
+    pass
+
+########################################
+
+
+########################################
+#            LearningAgent             #
+########################################
+# This agent answers with one of the reinforcement learning agents of populationAgents.py (as a population of one).
+# The learning agent is created at the first trial, when the rooms of the objects are known.
+class LearningAgent(Agent):
+    populationAgentClass = None
+
+    def __init__(self, generator, **parameters):
+        Agent.__init__(self, generator, **parameters)
+        self.populationAgent = None
+
+    def __call__(self, trial, currentTrialType, trialObjects):
+        stimuliClass = trial.stimuliClass
+        if self.populationAgent is None:
+            self.populationAgent = self.populationAgentClass(objectRooms=getObjectRooms(stimuliClass),
+                                                             generator=self.generator,
+                                                             **self.parameters)
+
+        # The objects of each side (one per side, or two for uncertain trials):
+        sideObjects = {"left": [], "right": []}
+        for position in trialObjects:
+            side = "left" if "left" in position.lower() else "right"
+            sideObjects[side].append(stimuliClass.objectIndices[trialObjects[position]])
+
+        chooseLeft = self.populationAgent.choose(np.array(sideObjects["left"]), np.array(sideObjects["right"]))[0]
+        return ("left" if chooseLeft else "right"), self.getResponseTime()
+
+    def learn(self, trial, currentTrialType, responseObjects, roomsToBeShown, isTreasures):
+        stimuliClass = trial.stimuliClass
+        if isinstance(responseObjects, dict):  # the pair of an uncertain trial
+            responseObjects = list(responseObjects.values())
+        else:
+            responseObjects = [responseObjects]
+        chosenObjects = np.array([[stimuliClass.objectIndices[object] for object in responseObjects]])
+        rooms = np.array([[stimuliClass.roomIndices[room] for room in roomsToBeShown]])
+        treasures = np.array([isTreasures], dtype=float)
+
+        ghostSelected = None
+        ghostRejected = None
+        if currentTrialType == "uncertain":
+            ghostSelected = np.array([stimuliClass.objectIndices[trial.uncertaintyTrialInfo["ghostSelectedObject"]]])
+            ghostRejected = np.array([stimuliClass.objectIndices[trial.uncertaintyTrialInfo["ghostRejectedObject"]]])
+        self.populationAgent.learn(chosenObjects, rooms, treasures, ghostSelected, ghostRejected)
+
+
+class ModelFreeLearningAgent(LearningAgent):
+    populationAgentClass = ModelFreeAgent
+    parameterNames = ModelFreeAgent.parameterNames
+
+
+class ModelBasedLearningAgent(LearningAgent):
+    populationAgentClass = ModelBasedAgent
+    parameterNames = ModelBasedAgent.parameterNames
+
+
+class RetrospectiveLearningAgent(LearningAgent):
+    populationAgentClass = RetrospectiveAgent
+    parameterNames = RetrospectiveAgent.parameterNames
+
+########################################
+
+
+########################################
+#             Agent Types              #
+########################################
+# The agents that can be selected with an agent spec (see parseAgentSpec):
+agentTypes = {"random": RandomAgent,
+              "modelFree": ModelFreeLearningAgent,
+              "modelBased": ModelBasedLearningAgent,
+              "retrospective": RetrospectiveLearningAgent}
+
+
+# An agent spec is the name of the agent type followed by its parameters, e.g. "random" or
+# "modelFree:alpha=0.3,beta=5". This function returns the name and the parameters (as numbers) of the spec.
+# The spec is checked here (before any session is simulated): the agent and its parameters must exist, and each
+# parameter must be given as name=number.
+def parseAgentSpec(agentSpec):
+    if ":" in agentSpec:
+        agentName, parametersText = agentSpec.split(":", 1)
+    else:
+        agentName, parametersText = agentSpec, ""
+
+    if agentName not in agentTypes:
+        raise ValueError(f"Unknown agent '{agentName}', the agents are: {', '.join(agentTypes)}")
+
+    parameterNames = agentTypes[agentName].parameterNames
+    parameters = {}
+    for parameterText in parametersText.split(","):
+        if parameterText:
+            if "=" not in parameterText:
+                raise ValueError(f"The parameter '{parameterText}' of agent '{agentName}' has no value, the parameters "
+                                 f"are given as name=number (e.g. alpha=0.3)")
+            parameterName, value = parameterText.split("=", 1)
+            parameterName = parameterName.strip()
+            if parameterName not in parameterNames:
+                raise ValueError(f"Unknown parameter '{parameterName}' for agent '{agentName}', the parameters are: "
+                                 f"{', '.join(parameterNames) or 'none'}")
+            try:
+                parameters[parameterName] = float(value)
+            except ValueError:
+                raise ValueError(f"The value of the parameter '{parameterName}' of agent '{agentName}' is not a "
+                                 f"number: '{value}'")
+    return agentName, parameters
+
+
+# This function creates the agent of a spec for a session, using the responses stream of its random streams:
+def createAgent(agentSpec, randomStreams):
+    agentName, parameters = parseAgentSpec(agentSpec)
+    return agentTypes[agentName](generator=randomStreams.responses, **parameters)
+
+########################################################################################################################
@@ -0,0 +1,126 @@
+########################################################################################################################
+# These functions compute the credit assignment effects of the task (Moran et al., 2019) for every participant at once.
+# After an uncertain trial, the ghost selects one object of the chosen pair: the first room shown is the room common to
+# the two objects of the pair (room1) and the second room is unique to the ghost-selected object (room2). The post trial
+# that follows tests how the participant assigned the credit of these rewards:
+# - repeat: the ghost-selected object against its horizontal counterpart (staying is choosing the ghost-selected one)
+# - switch: the ghost-rejected object against its horizontal counterpart (staying is choosing the ghost-rejected one)
+# - clash: the ghost-selected object against the ghost-rejected one (staying is choosing the ghost-selected one)
+# The stay probabilities are split by the reward of the common room and of the unique room of the uncertain trial.
+# Each post trial is linked to the uncertain trial just before it, chunk by chunk (see ResultsLoader), with array
+# operations on the whole chunk rather than a loop over the trials.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import numpy as np
+import pandas as pd
+########################################
+
+# The columns needed to link the post trials to their uncertain trials:
+creditAssignmentColumns = ["id", "trialNb", "trialType", "postType", "leftObjects", "rightObjects", "responseSide",
+                           "ghostSelected", "ghostRejected", "isTreasure1", "isTreasure2"]
+
+
+########################################
+#           getChunkColumns            #
+########################################
+# This function gives the columns of a chunk as arrays (text with "" for NA, numbers with NaN for NA), each with the
+# value of the row before: the first row's previous value is the last value of the previous chunk.
+def getChunkColumns(chunk, previousValues):
+    columns = {"experimentID": chunk["experimentID"].to_numpy(dtype=object, na_value="")}
+    for column in creditAssignmentColumns:
+        if isinstance(chunk[column].dtype, pd.CategoricalDtype) or chunk[column].dtype == object:
+            columns[column] = chunk[column].to_numpy(dtype=object, na_value="")
+        else:
+            columns[column] = chunk[column].to_numpy(dtype=float, na_value=np.nan)
+
+    previousColumns = {}
+    for column, values in columns.items():
+        previousColumns[column] = np.concatenate([[previousValues.get(column, np.nan)], values[:-1]])
+    return columns, previousColumns
+
+
+########################################
+#          countChunkStays             #
+########################################
+# This function counts the stays of the post trials of a chunk, by participant, post type, and reward of the common
+# and unique rooms of their uncertain trial.
+def countChunkStays(columns, previousColumns):
+    # The post trials that come right after their uncertain trial, with a response in both:
+    isLinkedPost = (columns["trialType"] == "post") \
+        & (previousColumns["trialType"] == "uncertain") \
+        & (columns["experimentID"] == previousColumns["experimentID"]) \
+        & (columns["id"] == previousColumns["id"]) \
+        & (columns["trialNb"] == previousColumns["trialNb"] + 1) \
+        & (columns["responseSide"] != "") \
+        & (previousColumns["responseSide"] != "")
+
+    # The object chosen in the post trial and the object whose choice is a stay:
+    chosenObject = np.where(columns["responseSide"] == "left", columns["leftObjects"], columns["rightObjects"])
+    stayObject = np.where(columns["postType"] == "switch",
+                          previousColumns["ghostRejected"],
+                          previousColumns["ghostSelected"])
+
+    postTrials = pd.DataFrame({"experimentID": columns["experimentID"][isLinkedPost],
+                               "id": columns["id"][isLinkedPost].astype(int),
+                               "postType": columns["postType"][isLinkedPost],
+                               "commonReward": previousColumns["isTreasure1"][isLinkedPost].astype(int),
+                               "uniqueReward": previousColumns["isTreasure2"][isLinkedPost].astype(int),
+                               "stay": (chosenObject == stayObject)[isLinkedPost].astype(int)})
+    return postTrials.groupby(["experimentID", "id", "postType", "commonReward", "uniqueReward"]) \
+        .agg(nbStays=("stay", "sum"), nbTrials=("stay", "size"))
+
+
+########################################
+#         getStayProbabilities         #
+########################################
+# This function gives the stay probabilities of every participant of the results of a ResultsLoader: one line per
+# participant, post type, and reward (0 or 1) of the common and unique rooms, with the number of trials it comes from.
+# Only the experimental trials are used unless includePractice is True.
+def getStayProbabilities(loader, includePractice=False):
+    filters = {"phaseType": "triplet"}
+    if not includePractice:
+        filters["isPractice"] = 0
+
+    stayCounts = []
+    previousValues = {}
+    for chunk in loader.iterateChunks(creditAssignmentColumns, **filters):
+        if len(chunk) == 0:
+            continue
+        columns, previousColumns = getChunkColumns(chunk, previousValues)
+        stayCounts.append(countChunkStays(columns, previousColumns))
+        previousValues = {column: values[-1] for column, values in columns.items()}
+
+    if not stayCounts:
+        return pd.DataFrame(columns=["experimentID", "id", "postType", "commonReward", "uniqueReward", "nbTrials",
+                                     "stayProbability"])
+
+    # (a participant's trials can be in two chunks, so the counts of the chunks are added up)
+    stayCounts = pd.concat(stayCounts).groupby(level=[0, 1, 2, 3, 4]).sum()
+    stayCounts["stayProbability"] = stayCounts["nbStays"] / stayCounts["nbTrials"]
+    return stayCounts.drop(columns="nbStays").reset_index()
+
+
+########################################
+#           getRewardEffects           #
+########################################
+# This function gives the effect of the reward of each room on the stay probability of each participant and post type:
+# the stay probability when the room was rewarded minus when it was not (averaged over the reward of the other room).
+def getRewardEffects(stayProbabilities):
+    probabilities = stayProbabilities.pivot_table(index=["experimentID", "id", "postType"],
+                                                  columns=["commonReward", "uniqueReward"],
+                                                  values="stayProbability")
+    probabilities = probabilities.reindex(columns=pd.MultiIndex.from_product([[0, 1], [0, 1]]))
+
+    effects = pd.DataFrame(index=probabilities.index)
+    effects["commonEffect"] = (probabilities[(1, 0)] + probabilities[(1, 1)]) / 2 \
+        - (probabilities[(0, 0)] + probabilities[(0, 1)]) / 2
+    effects["uniqueEffect"] = (probabilities[(0, 1)] + probabilities[(1, 1)]) / 2 \
+        - (probabilities[(0, 0)] + probabilities[(1, 0)]) / 2
+    effects["interaction"] = (probabilities[(1, 1)] - probabilities[(1, 0)]) \
+        - (probabilities[(0, 1)] - probabilities[(0, 0)])
+    return effects.reset_index()
+
+########################################################################################################################
@@ -0,0 +1,309 @@
+########################################################################################################################
+# This is where we create the core of the experiment without any window: Creates and runs all the trials.
+# The Experiment class (experiment.py) presents it with PsychoPy, but it can also be run on its own (headless) with a
+# responder answering in place of the participant (see trialEngine.py), e.g. for simulations or regression checks.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+# Other modules
+import numpy as np
+from itertools import combinations
+from math import ceil
+# My modules
+from trialEngine import TripletEngine, StandardEngine, randomResponder
+from popChoice import popChoice
+from randomStreams import RandomStreams, generatorChoice
+from gaussianIncrement import gaussianRandomWalk
+from resultsTable import ResultsTable
+########################################
+
+
+########################################
+#           ExperimentEngine           #
+########################################
+class ExperimentEngine:
+
+    def __init__(self, stimuliClass, experimentalSetUp, responder=randomResponder, randomStreams=None, journal=None):
+        self.stimuliClass = stimuliClass
+        self.experimentalSetUp = experimentalSetUp  # the phases, blocks and amounts of trials
+        self.responder = responder  # what answers the trials when they are run headless
+        self.journal = journal  # where the results are written as the trials go, if any (see resultsJournal.py)
+
+        # The random streams of the session (see randomStreams.py), by default the same as the stimuli's:
+        if randomStreams is None:
+            randomStreams = self.stimuliClass.randomStreams
+        self.randomStreams = randomStreams
+
+        # The classes used to create the trials (the Experiment class uses the PsychoPy ones):
+        self.tripletClass = TripletEngine
+        self.standardClass = StandardEngine
+
+        # having the three types of trials possible:
+        self.trialTypes = ["standard", "uncertain", "post"]
+
+        # Creating all the possible pairs of objects:
+        self.standardStimuliPairs = list(combinations(self.stimuliClass.objectNames, 2))
+        # Getting the number of possible pairs (There will be 6, but I kept flexibility):
+        self.nbStandardPairs = len(self.standardStimuliPairs)
+
+        # Get all the pairs of objects for each room (there should be 4 pairs, because there are 4 rooms):
+        eligibleStimuliPairs = []
+        # For each room (here the key for each of it's two objects)...
+        for room in self.stimuliClass.combiObjectsOfTheRooms:
+            # append the pair of objects related to that room
+            eligibleStimuliPairs.append(self.stimuliClass.combiObjectsOfTheRooms[room])
+
+        # Get the possible comparisons for uncertainty trials
+        # (that should be 2, because we only want to compare pairs of objects that do not have the same common room,
+        # and you cannot compare pairs that have the same object)
+        self.eligibleUncertaintyComparisons = []
+        comparison = []  # make the current comparison empty
+        # for every 2 object pair (hence, 2 iterations)...
+        for i in range(int(len(eligibleStimuliPairs) / 2)):
+            # ...select one pair randomly to be the first pair of the comparison
+            pair1 = generatorChoice(self.randomStreams.schedule, eligibleStimuliPairs)
+
+            # If this first pair was already in the comparison list choose another one;
+            # namely, if this is the second iteration, and the pair randomly chosen was in the previous comparison
+            # (i.e., it was either the previous pair 1 or 2).
+            while pair1 in comparison:
+                pair1 = generatorChoice(self.randomStreams.schedule, eligibleStimuliPairs)
+
+            # Randomly select pair 2, but if there is any object of pair two in pair1, choose again.
+            pair2 = generatorChoice(self.randomStreams.schedule, eligibleStimuliPairs)
+            while (pair2[0] in pair1) or (pair2[1] in pair1):
+                pair2 = generatorChoice(self.randomStreams.schedule, eligibleStimuliPairs)
+
+            # This forms the comparison, append it to the eligible comparisons for uncertainty trials.
+            # If this is the first comparison it will be used to avoid selecting the same comparison as the second one.
+            comparison = [pair1, pair2]
+            self.eligibleUncertaintyComparisons.append(comparison)
+        self.nbUncertaintyComparisons = len(self.eligibleUncertaintyComparisons)  # There will be 2, kept flexibility
+
+        # The post trial types and their number (there will be 3 but I keep this flexibility).
+        self.postTypes = ["repeat", "switch", "clash"]
+        self.nbPostTypes = len(self.postTypes)
+
+        # The possible ghostChoices, the object indexed 0 or indexed 1 of the pair chosen by the participant.
+        # This allows it to be counterbalanced.
+        self.ghostChoices = [0, 1]
+
+        # Getting the starting probabilities of the different rooms:
+        # Create a list of probabilities ranging from .25 to .75 with increments of .5
+        startingProbabilities = np.arange(0.25, 0.75, 0.05).tolist()
+        # for each of these probabilities neatly round them to two decimals (otherwise the numbers are not nicely round)
+        for i in range(len(startingProbabilities)):
+            startingProbabilities[i] = round(startingProbabilities[i], 2)
+        # for each room, randomly select a possible starting probability and take it out so that the other rooms will
+        # have to have a different starting probability
+        startingRewardProbabilities = []
+        for room in self.stimuliClass.roomNames:
+            startingRewardProbabilities.append(popChoice(startingProbabilities, self.randomStreams.walk))
+
+        # The whole random walk of the rooms' probabilities is created at once, with one row per increment (the first
+        # row being the starting probabilities) and one column per room. Each trial is given its own row.
+        self.walk = gaussianRandomWalk(startingProbabilities=startingRewardProbabilities,
+                                       nbIncrements=self.countIncrements(),
+                                       mu=0,
+                                       sigma=0.025,
+                                       generator=self.randomStreams.walk)
+        self.walk.flags.writeable = False  # the rows given to the trials are snapshots
+        # Whether each room yields a treasure is also drawn at once, with the same rows and columns as the walk: a room
+        # yields a treasure when its uniform value is below its reward probability. That way every outcome can be
+        # checked against its probability after the fact.
+        self.treasureOutcomes = self.randomStreams.outcomes.random(self.walk.shape) < self.walk
+        self.treasureOutcomes.flags.writeable = False
+        self.currentIncrement = 0
+        self.rewardProbabilities = self.walk[self.currentIncrement]
+        # Prepare the dictionary that records the random walk of each room's probabilities (for the results):
+        self.randomWalk = {}
+        for room in self.stimuliClass.roomNames:
+            self.randomWalk[room] = self.walk[:, self.stimuliClass.roomIndices[room]]
+
+        # Recording the responses (one row per trial, there is one trial per increment of the random walk):
+        self.results = ResultsTable(capacity=self.countIncrements())
+        self.currentTrialNb = 0
+
+    # This function gives the arguments that every trial needs on top of its own elements (the Experiment class adds
+    # the window to them).
+    def getTrialArguments(self):
+        return {"stimuliClass": self.stimuliClass,
+                "randomStreams": self.randomStreams}
+
+    # This function will use all the bits previously created to create the trials:
+    # It will be called in each different phase of the experiment, the phase indicating what kind of trial to make
+    # and how many of them.
+    # NOTE: the function ceil rounds up no matter the decimals (cannot have half trials)
+    def createTrials(self, phase, isPractice):
+        trials = []
+
+        nbTrials = self.experimentalSetUp[phase]["trials"]
+
+        if "standard" in phase:
+            repetitions = ceil(nbTrials / self.nbStandardPairs)  # every 6 possible pairs, there is a repetition
+            # have each possible stimuli pair for a standard trial as many times as there are repetitions
+            standardTrialElements = self.standardStimuliPairs * repetitions
+            # for a good counterbalancing it is best to have standard trials in multiples of 6
+
+            # for each trial create a standard trial
+            for i in range(nbTrials):
+                # for each trial, increment the reward probabilities of the rooms
+                # this will be the reward probabilities (and treasure outcomes) of the rooms for this standard trial
+                rewardProbabilities, treasureOutcomes = self.incrementProbabilities()
+                rewardProbabilities = {"standard": rewardProbabilities}
+                treasureOutcomes = {"standard": treasureOutcomes}
+
+                standardTrial = self.standardClass(**self.getTrialArguments(),
+                                                   standardType=standardTrialElements[i],
+                                                   isPractice=isPractice,  # tells if practice trial or not
+                                                   rewardProbabilities=rewardProbabilities,
+                                                   treasureOutcomes=treasureOutcomes)
+                trials.append(standardTrial)
+
+        else:  # if triplet
+            repetitions = ceil(nbTrials / (self.nbPostTypes * self.nbUncertaintyComparisons))
+            # every 6 trials means we went through 2 triplets, which means one repetition because there are 2 possible
+            # comparisons with 3 post trials each.
+
+            ghostElements = self.ghostChoices * repetitions * self.nbPostTypes
+            # for each repetition there will be 2*3 = 6 elements, three 0s and three 1s. So that each type of post trial
+            # has a version with 0 being the ghost-selected object and a version with 1 being the ghost-selected object.
+
+            postTypeElements = self.postTypes * repetitions * self.nbUncertaintyComparisons
+            # for each repetition there will be 3*2 = 6 elements, two of each post type.
+
+            standardTrialElements = self.standardStimuliPairs * ceil(repetitions / 2)
+            # for every 2 repetition there will be 6 elements, one per post trial.
+            # For a triple to have one of each instance it is best if the repetition is multiples of 2;
+            # hence, the number of trials should be a multiple of 12.
+
+            # Despite trials in multiple of 12 being the best, this still allows to create triplets
+            # if the trials are multiples of 3 #
+            trials = []
+            # for every three trials
+            for i in range(ceil(nbTrials / self.nbPostTypes)):
+
+                # Create a dictionary that will hold the reward probabilities for each trial type, after having
+                # incremented them every time (i.e., the standard trial comes first, so the probabilities will be
+                # incremented once, then the uncertainty trial comes with the probabilities being incremented a
+                # second time, etc.)
+                # (the same goes for the treasure outcomes)
+                rewardProbabilities = {}
+                treasureOutcomes = {}
+                for trialType in self.trialTypes:
+                    rewardProbabilities[trialType], treasureOutcomes[trialType] = self.incrementProbabilities()
+
+                triplet = self.tripletClass(**self.getTrialArguments(),
+                                            uncertaintyComparison=self.eligibleUncertaintyComparisons[i % 2],
+                                            ghostType=ghostElements[i],
+                                            postType=postTypeElements[i],
+                                            standardType=standardTrialElements[i],
+                                            isPractice=isPractice,  # tells if practice triplet or not
+                                            rewardProbabilities=rewardProbabilities,
+                                            treasureOutcomes=treasureOutcomes)
+                trials.append(triplet)
+                # i % 2 returns 0 if even and 1 if odd. This means that if the iteration is even, the first eligible
+                # comparison (index 0) will be selected, if the iteration is odd, the second eligible comparison will
+                # be selected.
+
+        # shuffle the trials
+        # (shuffle the different standard trials OR)
+        # (the triplets will keep the standard/uncertainty/post order, but which triplet will be when will be shuffled)
+        self.randomStreams.schedule.shuffle(trials)
+        return trials
+
+    # This function counts how many times the probabilities of the rooms will be incremented in the whole experiment
+    # (once per trial, see createTrials):
+    def countIncrements(self):
+        nbIncrements = 0
+        for phase in self.experimentalSetUp:
+            nbTrials = self.experimentalSetUp[phase]["trials"]
+            if "standard" not in phase:  # triplets always have their three trials
+                nbTrials = ceil(nbTrials / self.nbPostTypes) * len(self.trialTypes)
+            nbIncrements += self.experimentalSetUp[phase]["blocks"] * nbTrials
+        return nbIncrements
+
+    # This function increments the probabilities for the rooms by moving on to the next row of the random walk.
+    # It gives the row of probabilities and the row of treasure outcomes:
+    def incrementProbabilities(self):
+        self.currentIncrement += 1
+        self.rewardProbabilities = self.walk[self.currentIncrement]
+        return self.rewardProbabilities, self.treasureOutcomes[self.currentIncrement]
+
+    # This function runs a trial/triplet. Headless, it is the responder that gives the responses.
+    def runTrial(self, trial):
+        trial.runTrials(self.responder)
+
+    # These functions show the messages of the experiment. Headless, there is nothing to show (the Experiment class
+    # shows them in the PsychoPy window).
+    def showPhaseMessages(self, phase, phaseType, isPractice):
+        pass
+
+    def showBlockMessage(self, phase, block):
+        pass
+
+    def showDebriefing(self):
+        pass
+
+    # This is the function that launches the experiment (it will be launched from the quizz)
+    def launchExperiment(self):
+
+        # The phases of an experiment can be experimental/practice and triplet/standard
+        for phase in self.experimentalSetUp:
+
+            if "standard" in phase:
+                phaseType = "standard"
+            else:  # it is triplet
+                phaseType = "triplet"
+
+            if "Practice" in phase:
+                isPractice = True  # will tell the trial creation if it IS a practice
+                resultsIsPractice = 1
+            else:
+                isPractice = False  # will tell the trial creation if it is NOT a practice
+                resultsIsPractice = 0
+
+            # Messages where participants have to press the spacebar to continue:
+            self.showPhaseMessages(phase, phaseType, isPractice)
+
+            # For each block in the phase, create the trials and wait message to announce which block it is:
+            for block in range(self.experimentalSetUp[phase]["blocks"]):
+                trials = self.createTrials(phase, isPractice)
+                self.showBlockMessage(phase, block)
+
+                # For each trial, run that trial/triplet:
+                for trial in trials:
+                    self.runTrial(trial)
+
+                    # And record the results:
+                    self.recordTrialResults(trial, phaseType, resultsIsPractice, block)
+
+                # The journal is synced to the disk at the end of each block:
+                if self.journal is not None:
+                    self.journal.sync()
+
+        # debriefing message before the end:
+        self.showDebriefing()
+
+        if self.journal is not None:
+            self.journal.close()
+
+    # This function adds the results of a trial/triplet to the results of the experiment (a standard trial has one row,
+    # a triplet has the row of each of its trials):
+    # The rows are also added to the journal right away (the trial is over, so it does not delay its presentation).
+    def recordTrialResults(self, trial, phaseType, resultsIsPractice, block):
+        firstRow = len(self.results)
+        for trialResults in trial.trialResults:
+            self.currentTrialNb += 1
+            self.results.addRow(phaseType=phaseType,
+                                isPractice=resultsIsPractice,
+                                blockNb=block + 1,
+                                trialNb=self.currentTrialNb,
+                                **trialResults)
+
+        if self.journal is not None:
+            self.journal.writeRows(self.results, firstRow, len(self.results))
+
+########################################################################################################################
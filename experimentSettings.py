@@ -0,0 +1,51 @@
+########################################################################################################################
+# These functions read the settings of an experiment (experimentFormats/<id>_settings.csv) and turn them into the
+# experiment set up used by the Experiment class. They are used by the GUI and by the simulations (SIMULATE.py).
+########################################################################################################################
+
+
+########################################
+#             readSettings             #
+########################################
+# This function reads a settings file and returns all its settings in a dictionary.
+def readSettings(expFileName):
+    # open and read the file.
+    expFile = open(expFileName, "r")
+    currentExpSettings = expFile.read()
+    expFile.close()
+
+    # The file has a header line and a line with the values. This allows me to get an index for each value.
+    # That way it is flexible if someone changes this code and wants to add settings differently.
+    expInformation = currentExpSettings.split("\n")
+    header = expInformation[0].split(",")
+    values = expInformation[1].split(",")
+
+    # Get all the information for the experiment set up:
+    expSetUp = {"id": values[header.index("id")],
+                "quiz100": values[header.index("quiz100")],
+                "standardPracticeBlocks": int(values[header.index("standardPracticeBlocks")]),
+                "standardPracticeTrials": int(values[header.index("standardPracticeTrials")]),
+                "standardExperimentalBlocks": int(values[header.index("standardExperimentalBlocks")]),
+                "standardExperimentalTrials": int(values[header.index("standardExperimentalTrials")]),
+                "tripletPracticeBlocks": int(values[header.index("tripletPracticeBlocks")]),
+                "tripletPracticeTrials": int(values[header.index("tripletPracticeTrials")]),
+                "tripletExperimentalBlocks": int(values[header.index("tripletExperimentalBlocks")]),
+                "tripletExperimentalTrials": int(values[header.index("tripletExperimentalTrials")])}
+    return expSetUp
+
+########################################
+
+
+########################################
+#          makeExperimentSetUp         #
+########################################
+# This function turns the settings into the experiment set up (the phases, with their blocks and trials), in the same
+# order as the GUI creates it.
+def makeExperimentSetUp(expSetUp):
+    experimentSetUp = {}
+    for phase in ["standardPractice", "standardExperimental", "tripletPractice", "tripletExperimental"]:
+        experimentSetUp[phase] = {"blocks": expSetUp[phase + "Blocks"],
+                                  "trials": expSetUp[phase + "Trials"]}
+    return experimentSetUp
+
+########################################################################################################################
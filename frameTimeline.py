@@ -0,0 +1,162 @@
+########################################################################################################################
+# This class runs the epochs of the trials (e.g., the inter-trial interval, the objects, the rooms) as numbers of
+# frames of the screen instead of wall time: each epoch lasts the number of frames closest to its duration at the
+# refresh rate measured for the window, so a stimulus is always shown for the same number of frames, and the responses
+# are polled at every frame (nothing blocks, not even the beep). Each epoch draws its screen at every frame with its
+# drawFrame function (the stimuli are only changed when the screen changes, see Stimuli.drawObjectImages).
+# The times of the flips give the actual duration of each epoch: from its first flip to the first flip of the next
+# epoch (or one frame after its last flip). Its overshoot is how much longer than its frames it lasted (e.g., a dropped
+# frame makes it one frame longer). The Experiment and the Quiz each have a timeline for all their trials (see
+# report).
+# With recordFrames=True, the time of every flip is also kept, which gives the interval between each frame and the
+# next, the number of frames dropped in each epoch and its longest frame. The timings of the epochs and of the frames
+# of the trials are then written in the participant's directory (see toCSV and ResultsRecorder), with the number of
+# the trial (trialNb in the results) each epoch belongs to: the onsets of the room screens are the onsets of the
+# firstRoom and secondRoom epochs.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from psychopy import core
+########################################
+
+
+########################################
+#         measureFrameDuration         #
+########################################
+# This function measures the duration of a frame of a window (in seconds) from its refresh rate. If the refresh rate
+# cannot be measured (the frames are too irregular), it uses the duration of a frame PsychoPy assumes for the window.
+def measureFrameDuration(window):
+    frameRate = window.getActualFrameRate(nIdentical=20, nMaxFrames=240, nWarmUpFrames=20)
+    if frameRate is None:
+        return window.monitorFramePeriod
+    return 1 / frameRate
+
+
+########################################
+#            FrameTimeline             #
+########################################
+class FrameTimeline:
+    def __init__(self, window, recordFrames=False):
+        self.window = window
+        # The duration of a frame of the window (measured when the window was created, see MAIN.py):
+        self.frameDuration = getattr(window, "frameDuration", None) or window.monitorFramePeriod
+        self.recordFrames = recordFrames  # whether the time of every flip is kept
+
+        self.epochTimings = []  # the timing of each epoch that was run (see closeEpoch)
+        self.currentEpoch = None  # the epoch shown on the screen, until the first flip of the next one
+        self.trialNb = 0  # the number of the trial the epochs belong to (see startTrial)
+
+    # This function starts the next trial (its epochs are recorded with its number):
+    def startTrial(self):
+        self.trialNb += 1
+
+    # This function gives the number of frames of a duration (in seconds), at least one:
+    def getNbFrames(self, duration):
+        return max(1, int(round(duration / self.frameDuration)))
+
+    # This function records the timing of the current epoch once it is over: its number of frames, its duration (from
+    # its first flip to the first flip of the next epoch, or one frame after its last flip), and its overshoot.
+    def closeEpoch(self, nextOnset=None):
+        if self.currentEpoch is None:
+            return
+        if nextOnset is None:
+            nextOnset = self.currentEpoch["lastFlip"] + self.frameDuration
+        duration = nextOnset - self.currentEpoch["onset"]
+        epochTiming = {"trialNb": self.trialNb,
+                       "epoch": self.currentEpoch["epoch"],
+                       "nbFrames": self.currentEpoch["nbFrames"],
+                       "onset": self.currentEpoch["onset"],
+                       "duration": duration,
+                       "overshoot": duration - self.currentEpoch["nbFrames"] * self.frameDuration}
+
+        # With the time of every flip: the interval between each frame and the next (the last one until the next
+        # epoch), and the frames dropped (an interval of two frames is one dropped frame)
+        if self.recordFrames:
+            flipTimes = self.currentEpoch["flipTimes"]
+            frameIntervals = [nextFlip - flip for flip, nextFlip in zip(flipTimes, flipTimes[1:] + [nextOnset])]
+            epochTiming["flipTimes"] = flipTimes
+            epochTiming["frameIntervals"] = frameIntervals
+            epochTiming["droppedFrames"] = sum(max(0, int(round(interval / self.frameDuration)) - 1)
+                                               for interval in frameIntervals)
+            epochTiming["longestFrame"] = max(frameIntervals)
+
+        self.epochTimings.append(epochTiming)
+        self.currentEpoch = None
+
+    # This is the function that users use. It shows an epoch for the number of frames of its duration (or until isOver
+    # gives True, or forever if the duration is None). At each frame, drawFrame draws the screen (nothing for a blank
+    # screen), then the window is flipped, then isOver is checked (e.g., for a response). onStart is called right after
+    # the first flip of the epoch (e.g., to play a sound or reset a clock at the onset of the stimuli). It gives the
+    # number of frames the epoch was shown for.
+    def runEpoch(self, epoch, duration, drawFrame=None, onStart=None, isOver=None):
+        nbFrames = None
+        if duration is not None:
+            nbFrames = self.getNbFrames(duration)
+
+        if onStart is not None:
+            self.window.callOnFlip(onStart)
+        frame = 0
+        while nbFrames is None or frame < nbFrames:
+            if drawFrame is not None:
+                drawFrame()
+            flipTime = self.window.flip()
+            if flipTime is None:  # (a flip gives its time, but not with every window backend)
+                flipTime = core.getTime()
+
+            if frame == 0:
+                self.closeEpoch(nextOnset=flipTime)
+                self.currentEpoch = {"epoch": epoch, "onset": flipTime, "flipTimes": []}
+            if self.recordFrames:
+                self.currentEpoch["flipTimes"].append(flipTime)
+            frame += 1
+            self.currentEpoch["nbFrames"] = frame
+            self.currentEpoch["lastFlip"] = flipTime
+
+            if isOver is not None and isOver():
+                break
+        return frame
+
+    # This function records the last epoch (when nothing else is shown right after it, e.g. at the end of a trial):
+    def finish(self):
+        self.closeEpoch()
+
+    # This function gives, for each epoch (name), the number of times it was run, its mean duration, and its mean and
+    # largest overshoot, and how many times it lasted more than half a frame longer than its frames (and the frames
+    # dropped, if they were recorded), as text:
+    def report(self):
+        lines = [f"frame duration: {self.frameDuration * 1000:.2f} ms"]
+        for epoch in dict.fromkeys(timing["epoch"] for timing in self.epochTimings):
+            timings = [timing for timing in self.epochTimings if timing["epoch"] == epoch]
+            overshoots = [timing["overshoot"] for timing in timings]
+            nbLate = sum(overshoot > self.frameDuration / 2 for overshoot in overshoots)
+            line = (f"{epoch}: {len(timings)} times, "
+                    f"{sum(timing['duration'] for timing in timings) / len(timings) * 1000:.1f} ms on average, "
+                    f"overshoot {sum(overshoots) / len(overshoots) * 1000:.2f} ms on average "
+                    f"(max {max(overshoots) * 1000:.2f} ms), {nbLate} late")
+            if self.recordFrames:
+                line += f", {sum(timing['droppedFrames'] for timing in timings)} frames dropped"
+            lines.append(line)
+        return "\n".join(lines)
+
+    # This function gives the timing of each epoch as the text of a CSV (one line per epoch, the times in seconds):
+    def toCSV(self):
+        columns = ["trialNb", "epoch", "nbFrames", "onset", "duration", "overshoot"]
+        if self.recordFrames:
+            columns += ["droppedFrames", "longestFrame"]
+        lines = [",".join(columns)]
+        for timing in self.epochTimings:
+            lines.append(",".join(str(timing[column]) for column in columns))
+        return "\n".join(lines) + "\n"
+
+    # This function gives the time of each flip (and the interval until the next one) as the text of a CSV (one line
+    # per frame):
+    def framesToCSV(self):
+        lines = ["trialNb,epoch,frame,flipTime,frameInterval"]
+        for timing in self.epochTimings:
+            for frame, (flipTime, frameInterval) in enumerate(zip(timing["flipTimes"], timing["frameIntervals"])):
+                lines.append(f"{timing['trialNb']},{timing['epoch']},{frame},{flipTime},{frameInterval}")
+        return "\n".join(lines) + "\n"
+
+########################################################################################################################
@@ -1,23 +1,79 @@
 ########################################################################################################################
 # This function will randomly sample a value from a gaussian distribution of mu and sigma and increment the room
 # reward probability with this value as long as the value is not above 1 or below 0.
+# Instead of resampling until the value fits (which can spin many times near 0 and 1), the value is sampled directly
+# from the gaussian truncated to the values that keep the probability between 0 and 1 (inverse of the cumulative
+# distribution), which gives exactly the same distribution.
+# gaussianRandomWalk does this for all the rooms (and if needed many sessions) and all the increments in one call.
 ########################################################################################################################
 
 ########################################
 #                Imports               #
 ########################################
-from random import gauss
+import numpy as np
+from scipy.special import ndtr, ndtri
+########################################
+
+
+########################################
+#      truncatedGaussianIncrements     #
+########################################
+# Gives the increments for an array of reward probabilities, from uniform values (between 0 and 1) of the same shape.
+def truncatedGaussianIncrements(roomRewardProbabilities, mu, sigma, uniforms):
+    # The bounds of the increment (so that the probability stays between 0 and 1) as standard normal values:
+    lowerBounds = (0 - roomRewardProbabilities - mu) / sigma
+    upperBounds = (1 - roomRewardProbabilities - mu) / sigma
+
+    # When both bounds are in the upper tail, the cumulative distribution is too close to 1 to be precise: sample from
+    # the mirrored bounds in the lower tail instead and mirror the value back.
+    isMirrored = lowerBounds > 0
+    lowerBounds, upperBounds = np.where(isMirrored, -upperBounds, lowerBounds), \
+        np.where(isMirrored, -lowerBounds, upperBounds)
+
+    # Place the uniform values between the cumulative distribution of the bounds and take them back to normal values:
+    lowerCumulative = ndtr(lowerBounds)
+    upperCumulative = ndtr(upperBounds)
+    standardIncrements = ndtri(lowerCumulative + uniforms * (upperCumulative - lowerCumulative))
+    standardIncrements = np.clip(standardIncrements, lowerBounds, upperBounds)  # rounding errors at the bounds
+    standardIncrements = np.where(isMirrored, -standardIncrements, standardIncrements)
+
+    return mu + sigma * standardIncrements
+
 ########################################
 
 
 ########################################
 #           gaussianIncrement          #
 ########################################
-def gaussianIncrement(roomRewardProbability, mu, sigma):
-    increment = gauss(mu=mu, sigma=sigma)
-    while (roomRewardProbability + increment) < 0 or (roomRewardProbability + increment) > 1:
-        increment = gauss(mu=mu, sigma=sigma)
-    roomRewardProbability += increment
+def gaussianIncrement(roomRewardProbability, mu, sigma, generator=None):
+    if generator is None:
+        generator = np.random.default_rng()
+    increment = truncatedGaussianIncrements(roomRewardProbability, mu, sigma, generator.random())
+    roomRewardProbability = min(max(roomRewardProbability + float(increment), 0), 1)
     return roomRewardProbability
 
+########################################
+
+
+########################################
+#          gaussianRandomWalk          #
+########################################
+# Creates the whole random walk at once. The starting probabilities can be one per room (or have more dimensions, e.g.
+# sessions x rooms). The walk has one row per increment, the first row being the starting probabilities; so its shape
+# is (nbIncrements + 1, *startingProbabilities.shape).
+def gaussianRandomWalk(startingProbabilities, nbIncrements, mu, sigma, generator=None):
+    if generator is None:
+        generator = np.random.default_rng()
+    startingProbabilities = np.asarray(startingProbabilities, dtype=float)
+
+    walk = np.empty((nbIncrements + 1,) + startingProbabilities.shape)
+    walk[0] = startingProbabilities
+    # All the random values are drawn at once, then each increment depends on the previous probabilities:
+    uniforms = generator.random((nbIncrements,) + startingProbabilities.shape)
+    for i in range(nbIncrements):
+        increments = truncatedGaussianIncrements(walk[i], mu, sigma, uniforms[i])
+        walk[i + 1] = np.clip(walk[i] + increments, 0, 1)
+
+    return walk
+
 ########################################################################################################################
@@ -9,9 +9,10 @@
 #           Imports             #
 #################################
 from os import listdir
-from PyQt5 import uic
-from psychopy import core
+from time import monotonic
 from makeIntoCSV import makeIntoCSV
+from experimentSettings import readSettings
+from uiCompiler import loadCompiledUi
 #################################
 
 
@@ -20,13 +21,13 @@ from makeIntoCSV import makeIntoCSV
 #################################
 class experimentGUI:
     def __init__(self, uiFile, screenSizes, app):
-        self.window = uic.loadUi(uiFile)  # create the window
+        self.window = loadCompiledUi(uiFile)  # create the window (from the compiled form, see uiCompiler.py)
         self.window.screen = screenSizes  # get the screenSizes
         self.app = app  # the app that will be launched
 
-        # Create clock (using psychopy).
+        # Start the clock (without psychopy, so that it is only imported once the GUI is done).
         # Time the participants in order to check if they are not just skipping through.
-        self.demographicsClock = core.Clock()
+        self.demographicsStartTime = monotonic()
 
     # The only function the user need to use, this launches the GUI.
     def launchGUI(self):
@@ -200,29 +201,9 @@ class experimentGUI:
     # This function will be called when a previously created experiment is selected in the experiment list combo box.
     # It will fill in the form according to the settings file for this experiment.
     def setPreviousExpSettings(self):
-        # prepare the path to the file, then open and read it.
+        # prepare the path to the file, then read all its settings:
         expFileName = "experimentFormats/" + self.window.listOfExperimentsBox.currentText() + "_settings.csv"
-        expFile = open(expFileName, "r")
-        currentExpSettings = expFile.read()
-        expFile.close()
-
-        # The file has a header line and a line with the values. This allows me to get an index for each value.
-        # That way it is flexible if someone changes this code and wants to add settings differently.
-        expInformation = currentExpSettings.split("\n")
-        header = expInformation[0].split(",")
-        values = expInformation[1].split(",")
-
-        # Get all the information for the experiment set up:
-        expSetUp = {"id": values[header.index("id")],
-                    "quiz100": values[header.index("quiz100")],
-                    "standardPracticeBlocks": int(values[header.index("standardPracticeBlocks")]),
-                    "standardPracticeTrials": int(values[header.index("standardPracticeTrials")]),
-                    "standardExperimentalBlocks": int(values[header.index("standardExperimentalBlocks")]),
-                    "standardExperimentalTrials": int(values[header.index("standardExperimentalTrials")]),
-                    "tripletPracticeBlocks": int(values[header.index("tripletPracticeBlocks")]),
-                    "tripletPracticeTrials": int(values[header.index("tripletPracticeTrials")]),
-                    "tripletExperimentalBlocks": int(values[header.index("tripletExperimentalBlocks")]),
-                    "tripletExperimentalTrials": int(values[header.index("tripletExperimentalTrials")])}
+        expSetUp = readSettings(expFileName)
 
         # Use this information to set every part of the form:
         # id
@@ -428,7 +409,7 @@ class experimentGUI:
             fieldOfStudy = "NA"
 
         # Time to complete #
-        timeToComplete = str(self.demographicsClock.getTime())
+        timeToComplete = str(monotonic() - self.demographicsStartTime)
 
         self.participantDemographics = {"age": age, "gender": gender,
                                         "education": education, "student": studentStatus, "fieldOfStudy": fieldOfStudy,
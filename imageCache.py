@@ -0,0 +1,76 @@
+########################################################################################################################
+# This class keeps the images of the stimuli decoded and resized to the size they are shown at, so that they do not
+# have to be decoded (the rooms and treasure are large JPEGs) and resized again at every launch.
+# Each image is saved as an RGBA array (.npy) in resources/cache/, under a name made of the image's name, its size in
+# pixels and the hash of the image file: a new screen resolution or a changed image gets its own file, and the files
+# of the older versions of the same image and size are deleted. The arrays are read memory-mapped and given to the
+# ImageStims as images, which PsychoPy then uses directly as textures.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from hashlib import sha256
+from os import getpid, listdir, makedirs, path, remove, replace
+from socket import gethostname
+import numpy as np
+from PIL import Image
+########################################
+
+
+########################################
+#              ImageCache              #
+########################################
+class ImageCache:
+    def __init__(self, pathToCache="resources/cache/"):
+        self.pathToCache = pathToCache
+        self.fileHashes = {}  # the hash of each image file already read (an image can be asked for at several sizes)
+
+    # This function gives the hash of an image file (the first 16 characters are enough to tell its versions apart):
+    def getFileHash(self, imageFile):
+        if imageFile not in self.fileHashes:
+            with open(imageFile, "rb") as image:
+                self.fileHashes[imageFile] = sha256(image.read()).hexdigest()[:16]
+        return self.fileHashes[imageFile]
+
+    # This function gives the name of the cache file of an image at a size, e.g. resources/cache/pink_972x972_<hash>.npy
+    def getCacheFile(self, imageFile, size):
+        imageName = path.splitext(path.basename(imageFile))[0]
+        return path.join(self.pathToCache, f"{imageName}_{size[0]}x{size[1]}_{self.getFileHash(imageFile)}.npy")
+
+    # This function saves an array in the cache (through a temporary file, so that a cache file is always whole), then
+    # deletes the cache files of the older versions of the same image and size (the temporary files of other launches
+    # are left alone).
+    def saveCacheFile(self, cacheFile, pixels):
+        makedirs(self.pathToCache, exist_ok=True)
+        # (with the name of the computer and the process, so two launches making the same file never share the temporary
+        # file)
+        temporaryFile = f"{cacheFile[:-len('.npy')]}.{gethostname()}.{getpid()}.tmp.npy"
+        np.save(temporaryFile, pixels)
+        replace(temporaryFile, cacheFile)
+
+        olderVersions = path.basename(cacheFile).rsplit("_", 1)[0] + "_"
+        for fileName in listdir(self.pathToCache):
+            if fileName.startswith(olderVersions) and not fileName.endswith(".tmp.npy") \
+                    and fileName != path.basename(cacheFile):
+                remove(path.join(self.pathToCache, fileName))
+
+    # This function decodes and resizes an image and saves it in the cache:
+    def makeCacheFile(self, imageFile, size, cacheFile):
+        with Image.open(imageFile) as image:
+            pixels = np.asarray(image.convert("RGBA").resize(size, Image.LANCZOS))
+        self.saveCacheFile(cacheFile, pixels)
+
+    # This is the function that users use. It gives an image file at a size (width and height in pixels, or one number
+    # for a square) as an RGBA image that can be given to an ImageStim, from the cache when it is there.
+    def getImage(self, imageFile, size):
+        if np.isscalar(size):
+            size = (size, size)
+        size = (int(round(size[0])), int(round(size[1])))
+
+        cacheFile = self.getCacheFile(imageFile, size)
+        if not path.exists(cacheFile):
+            self.makeCacheFile(imageFile, size, cacheFile)
+        return Image.fromarray(np.load(cacheFile, mmap_mode="r"))
+
+########################################################################################################################
@@ -0,0 +1,287 @@
+########################################################################################################################
+# These functions fit the agents of populationAgents.py to the recorded results of participants by maximum likelihood.
+# The results (an allResults.csv or _experimentResults.csv file) are turned back into each participant's sequence of
+# choices, rooms and treasures, and the agents are replayed through that sequence to get the probability of each
+# choice. The replay is done for many parameter settings at once (a population of agents), first on a grid of settings
+# and then to refine the best setting (with the gradient from a few neighbouring settings).
+# Each fit is cached (in a file named after the participant's results and the model), so fitting the same results
+# again only fits the new participants. The participants are fitted in parallel in FIT.py.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import hashlib
+import json
+from io import StringIO
+from os import getpid, makedirs, path, replace
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+from populationAgents import populationAgentTypes, makeParameterGrid
+from stimuliEngine import StimuliEngine
+########################################
+
+# Change this when the fitting changes, so that the fits that were cached before are done again:
+fittingVersion = "1"
+
+
+########################################
+#           readParticipants           #
+########################################
+# This function reads a results file and returns the results of each participant (as text, with the header line),
+# with the text of their _combinations.csv file (None if it is not there):
+# allResults.csv has an id column, a _experimentResults.csv file is the results of the participant of its name.
+# The experiment ID is the name of the directory of the experiment (results/<experimentID>/).
+def readParticipants(resultsFileName):
+    results = pd.read_csv(resultsFileName, dtype=str, keep_default_na=False)
+    resultsDirectory = path.dirname(path.abspath(resultsFileName))
+
+    # results/<experimentID>/<participantID>/<participantID>_experimentResults.csv
+    if "id" not in results.columns:
+        experimentID = path.basename(path.dirname(resultsDirectory))
+        participantID = path.basename(resultsFileName).split("_")[0]
+        combinationsFileName = path.join(resultsDirectory, participantID + "_combinations.csv")
+        return {(experimentID, participantID): {"results": results.to_csv(index=False),
+                                                "combinations": readCombinations(combinationsFileName)}}
+
+    # results/<experimentID>/allResults.csv
+    experimentID = path.basename(resultsDirectory)
+    participants = {}
+    for participantID, participantResults in results.groupby("id", sort=False):
+        combinationsFileName = path.join(resultsDirectory, participantID, participantID + "_combinations.csv")
+        participants[(experimentID, participantID)] = {"results": participantResults.to_csv(index=False),
+                                                       "combinations": readCombinations(combinationsFileName)}
+    return participants
+
+
+########################################
+#           readCombinations           #
+########################################
+# This function gives the text of a _combinations.csv file, or None if there is no such file.
+def readCombinations(combinationsFileName):
+    if not path.exists(combinationsFileName):
+        return None
+    combinationsFile = open(combinationsFileName, "r")
+    combinations = combinationsFile.read()
+    combinationsFile.close()
+    return combinations
+
+
+########################################
+#      getCombinationsObjectRooms      #
+########################################
+# This function gives the rooms of each object (as a matrix objects x rooms, see populationAgents.getObjectRooms) from
+# the text of a _combinations.csv file: its first table has the two rooms of each object (object,room1,room2).
+def getCombinationsObjectRooms(combinations):
+    stimuli = StimuliEngine()
+    objectRooms = np.zeros((len(stimuli.objectIndices), len(stimuli.roomIndices)))
+    objectsTable = combinations.strip().split("\n\n")[0]
+    for line in objectsTable.splitlines()[1:]:
+        object, room1, room2 = line.strip().split(",")
+        objectRooms[stimuli.objectIndices[object], [stimuli.roomIndices[room1], stimuli.roomIndices[room2]]] = 1
+    return objectRooms
+
+
+########################################
+#             splitObjects             #
+########################################
+# In the results, the objects of a side of an uncertain trial are written one after the other (e.g., "keylight").
+# This function gives the index of each object of a side.
+def splitObjects(objectsText, objectIndices):
+    objects = []
+    while objectsText:
+        for object in objectIndices:
+            if objectsText.startswith(object):
+                objects.append(objectIndices[object])
+                objectsText = objectsText[len(object):]
+                break
+        else:
+            raise ValueError(f"Unknown object in '{objectsText}'")
+    return np.array(objects)
+
+
+########################################
+#          makeChoiceSequence          #
+########################################
+# This function turns the results of a participant into the sequence of their choices (one dictionary per trial they
+# responded to), with the rooms of each object (as a matrix objects x rooms, see getObjectRooms). If the rooms of the
+# objects are not given (e.g., from the participant's _combinations.csv file), they are found from the rooms visited
+# after each object, which is only possible if every object was chosen (otherwise it raises a ValueError).
+def makeChoiceSequence(participantResults, objectRooms=None):
+    stimuli = StimuliEngine()
+    objectIndices = stimuli.objectIndices
+    roomIndices = stimuli.roomIndices
+    visitedRooms = np.zeros((len(objectIndices), len(roomIndices)))
+
+    choiceSequence = []
+    for row in participantResults.itertuples(index=False):
+        # Missed responses have no choice to fit:
+        if row.responseSide == "NA":
+            continue
+
+        leftObjects = splitObjects(row.leftObjects, objectIndices)
+        rightObjects = splitObjects(row.rightObjects, objectIndices)
+        chooseLeft = row.responseSide == "left"
+        rooms = np.array([roomIndices[row.room1], roomIndices[row.room2]])
+        trial = {"leftObjects": leftObjects,
+                 "rightObjects": rightObjects,
+                 "chooseLeft": chooseLeft,
+                 "chosenObjects": leftObjects if chooseLeft else rightObjects,
+                 "rooms": rooms,
+                 "treasures": np.array([float(row.isTreasure1), float(row.isTreasure2)]),
+                 "ghostSelected": None,
+                 "ghostRejected": None}
+
+        # The two rooms visited are the rooms of the chosen object (or of the ghost-selected one):
+        if row.trialType == "uncertain":
+            trial["ghostSelected"] = np.array([objectIndices[row.ghostSelected]])
+            trial["ghostRejected"] = np.array([objectIndices[row.ghostRejected]])
+            visitedRooms[trial["ghostSelected"][0], rooms] = 1
+        else:
+            visitedRooms[trial["chosenObjects"][0], rooms] = 1
+
+        choiceSequence.append(trial)
+
+    if objectRooms is None:
+        if np.any(visitedRooms.sum(axis=1) != 2):
+            raise ValueError("The rooms of every object could not be found in the results")
+        objectRooms = visitedRooms
+    return choiceSequence, objectRooms
+
+
+########################################
+#          getLogLikelihoods           #
+########################################
+# This function replays a population of agents (one per parameter setting) through a choice sequence and returns the
+# log likelihood of the choices for each of them.
+def getLogLikelihoods(agent, choiceSequence):
+    logLikelihoods = np.zeros(agent.nbAgents)
+    nbAgents = agent.nbAgents
+
+    for trial in choiceSequence:
+        leftProbabilities = agent.getLeftProbabilities(trial["leftObjects"], trial["rightObjects"])
+        choiceProbabilities = leftProbabilities if trial["chooseLeft"] else 1 - leftProbabilities
+        logLikelihoods += np.log(np.maximum(choiceProbabilities, 1e-12))
+
+        # Every agent learns from what the participant saw:
+        ghostSelected = trial["ghostSelected"]
+        ghostRejected = trial["ghostRejected"]
+        if ghostSelected is not None:
+            ghostSelected = np.broadcast_to(ghostSelected, (nbAgents,))
+            ghostRejected = np.broadcast_to(ghostRejected, (nbAgents,))
+        agent.learn(np.broadcast_to(trial["chosenObjects"], (nbAgents, trial["chosenObjects"].size)),
+                    np.broadcast_to(trial["rooms"], (nbAgents, 2)),
+                    np.broadcast_to(trial["treasures"], (nbAgents, 2)),
+                    ghostSelected,
+                    ghostRejected)
+
+    return logLikelihoods
+
+
+########################################
+#            fitParticipant            #
+########################################
+# This function fits a model (a name from populationAgentTypes) to a choice sequence. The best setting of a grid of
+# nbGridValues values per parameter is refined with L-BFGS-B; the gradient comes from replaying the setting and its
+# neighbours on each parameter as one population.
+def fitParticipant(choiceSequence, objectRooms, modelName, nbGridValues=5, gradientStep=1e-4):
+    agentClass = populationAgentTypes[modelName]
+    parameterNames = agentClass.parameterNames
+    bounds = np.array([agentClass.parameterBounds[parameterName] for parameterName in parameterNames], dtype=float)
+
+    # This function gives the log likelihoods of parameter settings (settings x parameters):
+    def getSettingsLogLikelihoods(settings):
+        agent = agentClass(objectRooms=objectRooms,
+                           **{parameterName: settings[:, i] for i, parameterName in enumerate(parameterNames)})
+        return getLogLikelihoods(agent, choiceSequence)
+
+    # Grid of settings:
+    grid = makeParameterGrid(**{parameterName: np.linspace(low, high, nbGridValues)
+                                for parameterName, (low, high) in zip(parameterNames, bounds)})
+    gridSettings = np.stack([grid[parameterName] for parameterName in parameterNames], axis=1)
+    gridLogLikelihoods = getSettingsLogLikelihoods(gridSettings)
+    bestSetting = gridSettings[np.argmax(gridLogLikelihoods)]
+    bestLogLikelihood = np.max(gridLogLikelihoods)
+
+    # Refining: the negative log likelihood and its gradient (with central differences, kept inside the bounds)
+    def getNegativeLogLikelihood(setting):
+        settings = [setting]
+        for i in range(len(setting)):
+            upSetting = setting.copy()
+            upSetting[i] = min(setting[i] + gradientStep, bounds[i, 1])
+            downSetting = setting.copy()
+            downSetting[i] = max(setting[i] - gradientStep, bounds[i, 0])
+            settings += [upSetting, downSetting]
+        settings = np.array(settings)
+        logLikelihoods = getSettingsLogLikelihoods(settings)
+
+        steps = np.diagonal(settings[1::2]) - np.diagonal(settings[2::2])
+        gradient = -(logLikelihoods[1::2] - logLikelihoods[2::2]) / steps
+        return -logLikelihoods[0], gradient
+
+    refined = minimize(getNegativeLogLikelihood, bestSetting, jac=True, method="L-BFGS-B", bounds=bounds)
+    if -refined.fun > bestLogLikelihood:
+        bestSetting = refined.x
+        bestLogLikelihood = -refined.fun
+
+    nbChoices = len(choiceSequence)
+    nbParameters = len(parameterNames)
+    fit = {"model": modelName,
+           "logLikelihood": float(bestLogLikelihood),
+           "nbChoices": nbChoices,
+           "AIC": 2 * nbParameters - 2 * float(bestLogLikelihood),
+           "BIC": nbParameters * np.log(nbChoices) - 2 * float(bestLogLikelihood)}
+    for parameterName, value in zip(parameterNames, bestSetting):
+        fit[parameterName] = float(value)
+    return fit
+
+
+########################################
+#              Fit Cache               #
+########################################
+# The cached fit of a participant's results for a model is in a file named after a hash of the results and the model.
+def getCacheFileName(cacheDirectory, participantResults, modelName):
+    key = hashlib.sha256(f"{fittingVersion}\n{modelName}\n{participantResults}".encode()).hexdigest()
+    return path.join(cacheDirectory, key + ".json")
+
+
+# This function gives the cached fit, or None if it was never done:
+def readCachedFit(cacheDirectory, participantResults, modelName):
+    cacheFileName = getCacheFileName(cacheDirectory, participantResults, modelName)
+    if not path.exists(cacheFileName):
+        return None
+    cacheFile = open(cacheFileName, "r")
+    fit = json.load(cacheFile)
+    cacheFile.close()
+    return fit
+
+
+# This function fits a participant's results (as text) with a model and caches the fit. It is what the processes of
+# FIT.py run. The rooms of the objects come from the participant's combinations (the text of their _combinations.csv
+# file) if there are some. The cache file is written under a temporary name and then renamed, so it is never half
+# written.
+# If the participant cannot be fitted (e.g., no combinations and an object they never chose), the fit only has the
+# model and the error (and it is not cached), so that the other participants are still fitted.
+def fitAndCache(participantResults, modelName, cacheDirectory, combinations=None):
+    try:
+        objectRooms = None
+        if combinations is not None:
+            objectRooms = getCombinationsObjectRooms(combinations)
+        choiceSequence, objectRooms = makeChoiceSequence(pd.read_csv(StringIO(participantResults), dtype=str,
+                                                                     keep_default_na=False),
+                                                         objectRooms)
+        fit = fitParticipant(choiceSequence, objectRooms, modelName)
+    except Exception as error:
+        return {"model": modelName, "error": f"{type(error).__name__}: {error}"}
+
+    makedirs(cacheDirectory, exist_ok=True)
+    cacheFileName = getCacheFileName(cacheDirectory, participantResults, modelName)
+    temporaryFileName = f"{cacheFileName}.{getpid()}.tmp"
+    cacheFile = open(temporaryFileName, "w")
+    json.dump(fit, cacheFile)
+    cacheFile.close()
+    replace(temporaryFileName, cacheFileName)
+    return fit
+
+########################################################################################################################
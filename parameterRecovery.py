@@ -0,0 +1,113 @@
+########################################################################################################################
+# These functions run a parameter recovery and model comparison study on an experiment set up: participants are
+# simulated by each model with known parameters (with the trial logic of the experiment, see experimentEngine.py), then
+# each simulated participant is fitted with every model (see modelFitting.py).
+# - The recovery of a model is the correlation between the parameters it was simulated with and the parameters fitted
+#   with the same model.
+# - The confusion matrix gives, for each model that simulated the participants (rows), how often each model (columns)
+#   fitted them best (lowest BIC).
+# The simulations and the fits are run in parallel in RECOVERY.py.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from io import StringIO
+import numpy as np
+import pandas as pd
+from randomStreams import RandomStreams
+from stimuliEngine import StimuliEngine
+from experimentEngine import ExperimentEngine
+from agents import agentTypes
+from populationAgents import populationAgentTypes, getObjectRooms, makeParameterGrid
+from modelFitting import makeChoiceSequence, fitParticipant
+########################################
+
+
+########################################
+#          makeTrueParameters          #
+########################################
+# This function gives the parameter settings a model simulates participants with (one dictionary per setting):
+# either nbGridValues values per parameter across its bounds (every combination), or nbSettings settings drawn
+# uniformly within the bounds.
+def makeTrueParameters(modelName, generator, nbSettings=50, nbGridValues=None):
+    agentClass = populationAgentTypes[modelName]
+    bounds = [agentClass.parameterBounds[parameterName] for parameterName in agentClass.parameterNames]
+
+    if nbGridValues is not None:
+        parameterValues = makeParameterGrid(**{parameterName: np.linspace(low, high, nbGridValues)
+                                               for parameterName, (low, high) in zip(agentClass.parameterNames,
+                                                                                     bounds)})
+    else:
+        parameterValues = {parameterName: generator.uniform(low, high, nbSettings)
+                           for parameterName, (low, high) in zip(agentClass.parameterNames, bounds)}
+
+    nbSettings = len(parameterValues[agentClass.parameterNames[0]])
+    return [{parameterName: float(parameterValues[parameterName][i]) for parameterName in parameterValues}
+            for i in range(nbSettings)]
+
+
+########################################
+#          simulateWithModel           #
+########################################
+# This function simulates one participant with a model and its parameters, and returns the participant's results
+# (as the text of an _experimentResults.csv file) and the rooms of its objects (as a matrix objects x rooms, see
+# getObjectRooms). It is run in the processes of RECOVERY.py.
+def simulateWithModel(experimentSetUp, modelName, parameters, seed, spawnKey):
+    randomStreams = RandomStreams(seed=seed, spawnKey=spawnKey)
+
+    stimuli = StimuliEngine(randomStreams=randomStreams)
+    stimuli.createStimuli()
+
+    experiment = ExperimentEngine(stimuliClass=stimuli,
+                                  experimentalSetUp=experimentSetUp,
+                                  responder=agentTypes[modelName](generator=randomStreams.responses, **parameters),
+                                  randomStreams=randomStreams)
+    experiment.launchExperiment()
+    return experiment.results.toCSV(), getObjectRooms(stimuli)
+
+
+########################################
+#            fitSimulation             #
+########################################
+# This function fits the results of a simulated participant with a model, with the rooms of its objects from the
+# simulation (an agent may never choose some object, so they cannot always be found from its results). It is run in
+# the processes of RECOVERY.py. If the fit fails, it only has the model and the error, so that the study goes on.
+def fitSimulation(experimentResults, objectRooms, modelName):
+    try:
+        choiceSequence, objectRooms = makeChoiceSequence(pd.read_csv(StringIO(experimentResults), dtype=str,
+                                                                     keep_default_na=False),
+                                                         objectRooms)
+        return fitParticipant(choiceSequence, objectRooms, modelName)
+    except Exception as error:
+        return {"model": modelName, "error": f"{type(error).__name__}: {error}"}
+
+
+########################################
+#          getRecoveryResults          #
+########################################
+# This function summarises the fits of the study (a dataframe with one row per simulated participant and fitted model,
+# with the simulating model, the true parameters as true<Parameter> columns, and the fits):
+# - the correlations between the true and fitted parameters of each model (fitted with the model it was simulated with)
+# - the confusion matrix (rows: simulating model, columns: best fitting model, values: proportion of participants)
+# The fits that failed (with an error) are left out.
+def getRecoveryResults(fits, modelNames):
+    if "error" in fits.columns:
+        fits = fits[fits["error"].isna()]
+    correlations = []
+    for modelName in modelNames:
+        sameModelFits = fits[(fits["simulatingModel"] == modelName) & (fits["model"] == modelName)]
+        for parameterName in populationAgentTypes[modelName].parameterNames:
+            trueValues = sameModelFits["true" + parameterName[0].upper() + parameterName[1:]]
+            correlations.append({"model": modelName,
+                                 "parameter": parameterName,
+                                 "correlation": np.corrcoef(trueValues, sameModelFits[parameterName])[0, 1],
+                                 "nbParticipants": len(sameModelFits)})
+
+    bestFits = fits.loc[fits.groupby(["simulatingModel", "participant"])["BIC"].idxmin()]
+    confusionMatrix = pd.crosstab(bestFits["simulatingModel"], bestFits["model"], normalize="index")
+    confusionMatrix = confusionMatrix.reindex(index=modelNames, columns=modelNames, fill_value=0)
+
+    return pd.DataFrame(correlations), confusionMatrix
+
+########################################################################################################################
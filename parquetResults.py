@@ -0,0 +1,64 @@
+########################################################################################################################
+# These functions keep the results in a Parquet dataset, next to the CSV files (it is optional, see ResultsRecorder).
+# The dataset is partitioned by experiment and participant: parquet/experimentID=<experimentID>/participant=<id>/.
+# The columns are typed (see ResultsTable), the rooms, objects and trial types are dictionary encoded, and the files are
+# compressed, so reading a few columns of a whole experiment does not mean parsing every line of allResults.csv.
+# It needs pyarrow, which is only imported when the dataset is used (the experiment runs without it).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import getpid, makedirs, path, replace
+########################################
+
+
+########################################
+#            importPyarrow             #
+########################################
+# This function imports pyarrow (and its parquet module) when it is needed:
+def importPyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("The Parquet results need pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+########################################
+#       writeParticipantResults        #
+########################################
+# This function writes the results of a participant (a dataframe, see readResults) in their partition of the dataset.
+# The file is written under a temporary name and then renamed, so the dataset never has a half written file (the
+# names starting with a dot are not read as part of the dataset).
+def writeParticipantResults(results, experimentID, participantID, pathToDataset="parquet/"):
+    pyarrow, parquet = importPyarrow()
+
+    partitionDirectory = path.join(pathToDataset, "experimentID=" + experimentID, "participant=" + participantID)
+    makedirs(partitionDirectory, exist_ok=True)
+
+    # The categorical columns become dictionary encoded columns:
+    table = pyarrow.Table.from_pandas(results, preserve_index=False)
+
+    temporaryFileName = path.join(partitionDirectory, f".results.parquet.{getpid()}.tmp")
+    parquet.write_table(table, temporaryFileName, compression="zstd", use_dictionary=True)
+    replace(temporaryFileName, path.join(partitionDirectory, "results.parquet"))
+
+
+########################################
+#          readResultsDataset          #
+########################################
+# This function reads the dataset into a dataframe: only the columns given (all of them by default) and only the
+# partitions of the experiments given (all of them by default) are read. The experimentID and participant columns come
+# from the partitions.
+def readResultsDataset(pathToDataset="parquet/", columns=None, experimentIDs=None):
+    pyarrow, parquet = importPyarrow()
+
+    filters = None
+    if experimentIDs is not None:
+        filters = [("experimentID", "in", list(experimentIDs))]
+
+    return parquet.read_table(pathToDataset, columns=columns, filters=filters).to_pandas()
+
+########################################################################################################################
@@ -5,15 +5,16 @@
 ########################################
 #                Imports               #
 ########################################
-from random import choice
+from randomStreams import generatorChoice
 ########################################
 
 
 ########################################
 #               popChoice              #
 ########################################
-def popChoice(listSelectedFrom):
-    chosenValue = choice(listSelectedFrom)
+# The generator is one of the session's random streams (see randomStreams.py)
+def popChoice(listSelectedFrom, generator):
+    chosenValue = generatorChoice(generator, listSelectedFrom)
     listSelectedFrom.pop(listSelectedFrom.index(chosenValue))
     return chosenValue
 
@@ -0,0 +1,300 @@
+########################################################################################################################
+# These classes are reinforcement learning agents for the task, in the style of Moran et al. (2019). Each one holds a
+# whole population of agents (one per parameter setting) and learns and chooses for all of them at once with NumPy
+# arrays, so that thousands of parameter settings can be simulated (or fitted) together:
+# - ModelFreeAgent: learns the value of the objects from the treasures that follow them (TD learning). On uncertain
+#   trials it cannot tell which object the ghost selected, so both objects of the chosen pair get the credit.
+# - ModelBasedAgent: learns the value of the rooms, and values the objects through the rooms they open
+#   (combiRoomsOfTheObjects).
+# - RetrospectiveAgent: mixes both systems (weight for the model-based one). On uncertain trials the model-based
+#   system infers which object the ghost selected from the rooms shown, and the model-free credit goes to that object
+#   (the ghost-rejected object only gets the rejectedCredit part of it).
+# simulatePopulation runs a population through a whole session of the experiment (see experimentEngine.py).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from abc import ABC, abstractmethod
+import numpy as np
+########################################
+
+
+########################################
+#            getObjectRooms            #
+########################################
+# This function gives the rooms of each object as a matrix (objects x rooms) with 1 where the object opens the room,
+# using the indices of the stimuli (see StimuliEngine).
+def getObjectRooms(stimuliClass):
+    objectRooms = np.zeros((len(stimuliClass.objectNames), len(stimuliClass.roomNames)))
+    for object in stimuliClass.combiRoomsOfTheObjects:
+        for room in stimuliClass.combiRoomsOfTheObjects[object]:
+            objectRooms[stimuliClass.objectIndices[object], stimuliClass.roomIndices[room]] = 1
+    return objectRooms
+
+
+########################################
+#           makeParameterGrid          #
+########################################
+# This function creates every combination of the values given for each parameter, as one flat array per parameter
+# (e.g., makeParameterGrid(alpha=[.1, .5], beta=[1, 5, 10]) gives 6 parameter settings).
+def makeParameterGrid(**parameterValues):
+    grids = np.meshgrid(*[np.asarray(values, dtype=float) for values in parameterValues.values()], indexing="ij")
+    return {parameterName: grid.ravel() for parameterName, grid in zip(parameterValues, grids)}
+
+########################################
+
+
+########################################
+#            PopulationAgent           #
+########################################
+# All the agents are built on this class. The parameters are given as keywords (numbers or arrays, one value per agent
+# of the population); parameters that are not given take their default value.
+# Each agent gives its own getObjectValues and learn functions (so this class cannot be created on its own).
+class PopulationAgent(ABC):
+    parameterNames = ["alpha", "beta"]  # learning rate and inverse temperature of the softmax
+    parameterDefaults = {}
+    parameterBounds = {"alpha": (0, 1), "beta": (0, 20)}  # the values the parameters can take (e.g., when fitting)
+
+    def __init__(self, objectRooms, generator=None, **parameters):
+        if generator is None:
+            generator = np.random.default_rng()
+        self.generator = generator
+        self.objectRooms = np.asarray(objectRooms, dtype=float)  # objects x rooms (see getObjectRooms)
+        self.nbObjects, self.nbRooms = self.objectRooms.shape
+
+        # Every parameter becomes an array with one value per agent:
+        for parameterName in parameters:
+            if parameterName not in self.parameterNames:
+                raise ValueError(f"Unknown parameter '{parameterName}' for {type(self).__name__}, the parameters are: "
+                                 f"{', '.join(self.parameterNames)}")
+        parameterValues = [np.asarray(parameters.get(parameterName, self.parameterDefaults.get(parameterName)),
+                                      dtype=float)
+                           for parameterName in self.parameterNames]
+        parameterValues = np.broadcast_arrays(*parameterValues)
+        self.parameters = {}
+        for parameterName, values in zip(self.parameterNames, parameterValues):
+            self.parameters[parameterName] = values.ravel()
+        self.nbAgents = self.parameters[self.parameterNames[0]].size
+        self.agentIndices = np.arange(self.nbAgents)
+
+        self.reset()
+
+    # This function sets the values learnt back to zero (e.g., before a new session):
+    def reset(self):
+        self.objectValues = np.zeros((self.nbAgents, self.nbObjects))  # model-free values of the objects
+        self.roomValues = np.zeros((self.nbAgents, self.nbRooms))  # model-based values of the rooms
+
+    # This function gives the value of each object for each agent (agents x objects), used for the choices:
+    @abstractmethod
+    def getObjectValues(self):
+        pass
+
+    # This function gives the value of a side for each agent: the mean value of its objects (the ghost selects each
+    # object of a pair half of the time). The objects are indices (..., objects of the side).
+    def getSideValues(self, objectValues, objects):
+        objects = np.broadcast_to(objects, (self.nbAgents, np.shape(objects)[-1]))
+        return np.take_along_axis(objectValues, objects, axis=1).mean(axis=1)
+
+    # This function gives the probability of each agent choosing the left side (softmax of the side values):
+    def getLeftProbabilities(self, leftObjects, rightObjects):
+        objectValues = self.getObjectValues()
+        valueDifferences = self.getSideValues(objectValues, leftObjects) \
+            - self.getSideValues(objectValues, rightObjects)
+        return 1 / (1 + np.exp(-self.parameters["beta"] * valueDifferences))
+
+    # This function makes every agent choose a side; it returns True for the agents choosing left:
+    def choose(self, leftObjects, rightObjects):
+        return self.generator.random(self.nbAgents) < self.getLeftProbabilities(leftObjects, rightObjects)
+
+    # This function makes every agent learn from the rooms visited after its choice:
+    # - chosenObjects: the objects of the chosen side (agents x 1 or 2 objects)
+    # - rooms: the two rooms visited (agents x 2)
+    # - treasures: whether each of these rooms yielded a treasure (agents x 2)
+    # - ghostSelected, ghostRejected: on uncertain trials, the objects selected and rejected by the ghost (agents)
+    @abstractmethod
+    def learn(self, chosenObjects, rooms, treasures, ghostSelected=None, ghostRejected=None):
+        pass
+
+    # These two functions are the learning rules that the agents share:
+    # The model-free value of the objects moves towards the number of treasures found.
+    def learnObjectValues(self, objects, treasures, learningRates):
+        rows = self.agentIndices[:, None]
+        rewards = np.sum(treasures, axis=1)[:, None]
+        objects = np.reshape(objects, (self.nbAgents, -1))
+        self.objectValues[rows, objects] += learningRates[:, None] * (rewards - self.objectValues[rows, objects])
+
+    # The model-based value of each room visited moves towards whether it yielded a treasure.
+    def learnRoomValues(self, rooms, treasures):
+        rows = self.agentIndices[:, None]
+        self.roomValues[rows, rooms] += self.parameters["alpha"][:, None] * (treasures - self.roomValues[rows, rooms])
+
+########################################
+
+
+########################################
+#            ModelFreeAgent            #
+########################################
+class ModelFreeAgent(PopulationAgent):
+
+    def getObjectValues(self):
+        return self.objectValues
+
+    # Without inference, all the objects of the chosen side get the credit:
+    def learn(self, chosenObjects, rooms, treasures, ghostSelected=None, ghostRejected=None):
+        self.learnObjectValues(chosenObjects, treasures, self.parameters["alpha"])
+
+########################################
+
+
+########################################
+#            ModelBasedAgent           #
+########################################
+class ModelBasedAgent(PopulationAgent):
+
+    # The value of an object is the sum of the values of its two rooms:
+    def getObjectValues(self):
+        return self.roomValues @ self.objectRooms.T
+
+    def learn(self, chosenObjects, rooms, treasures, ghostSelected=None, ghostRejected=None):
+        self.learnRoomValues(rooms, treasures)
+
+########################################
+
+
+########################################
+#          RetrospectiveAgent          #
+########################################
+class RetrospectiveAgent(PopulationAgent):
+    # weight: weight of the model-based values in the choices (the model-free ones have 1 - weight)
+    # rejectedCredit: part of the model-free credit given to the ghost-rejected object on uncertain trials
+    parameterNames = ["alpha", "beta", "weight", "rejectedCredit"]
+    parameterDefaults = {"weight": 0.5, "rejectedCredit": 0.0}
+    parameterBounds = {"alpha": (0, 1), "beta": (0, 20), "weight": (0, 1), "rejectedCredit": (0, 1)}
+
+    def getObjectValues(self):
+        weights = self.parameters["weight"][:, None]
+        return weights * (self.roomValues @ self.objectRooms.T) + (1 - weights) * self.objectValues
+
+    def learn(self, chosenObjects, rooms, treasures, ghostSelected=None, ghostRejected=None):
+        self.learnRoomValues(rooms, treasures)
+
+        # On standard and post trials, the chosen object gets the credit...
+        if ghostSelected is None:
+            self.learnObjectValues(chosenObjects, treasures, self.parameters["alpha"])
+        # ...on uncertain trials, the object inferred to be the ghost-selected one gets the credit
+        else:
+            self.learnObjectValues(ghostSelected, treasures, self.parameters["alpha"])
+            self.learnObjectValues(ghostRejected, treasures,
+                                   self.parameters["alpha"] * self.parameters["rejectedCredit"])
+
+########################################
+
+
+########################################
+#             Agent Types              #
+########################################
+# The agents by name (e.g., for the fits):
+populationAgentTypes = {"modelFree": ModelFreeAgent,
+                        "modelBased": ModelBasedAgent,
+                        "retrospective": RetrospectiveAgent}
+
+########################################
+
+
+########################################
+#          simulatePopulation          #
+########################################
+# This function runs a whole population of agents through a session of an experiment (an ExperimentEngine that has not
+# been launched). All the agents get the same trials, random walk and treasure outcomes, but each makes its own choices
+# (so on post trials, each gets the objects following from its own uncertain trial).
+# It returns a dictionary of arrays with one row per trial and one column per agent (object indices are -1 when they do
+# not apply), and the type and post type of each trial.
+def simulatePopulation(agent, experiment):
+    stimuliClass = experiment.stimuliClass
+    objectIndices = stimuliClass.objectIndices
+    roomIndices = stimuliClass.roomIndices
+
+    # The rooms of each object (objects x 2) and the room in common of each pair of objects (objects x objects):
+    roomsOfTheObjects = np.array([[roomIndices[room] for room in stimuliClass.combiRoomsOfTheObjects[object]]
+                                  for object in stimuliClass.objectNames])
+    objectRooms = getObjectRooms(stimuliClass).astype(bool)
+    commonRooms = np.argmax(objectRooms[:, None, :] & objectRooms[None, :, :], axis=2)
+    uniqueRooms = np.argmax(objectRooms[:, None, :] & ~objectRooms[None, :, :], axis=2)
+
+    simulation = {"trialType": [], "postType": [], "chooseLeft": [], "chosenObject": [], "ghostSelected": [],
+                  "ghostRejected": [], "rooms": [], "treasures": []}
+
+    # This function records a trial of the simulation:
+    def recordTrial(trialType, postType, chooseLeft, chosenObject, ghostSelected, ghostRejected, rooms, treasures):
+        for key, value in zip(simulation, [trialType, postType, chooseLeft, chosenObject, ghostSelected,
+                                           ghostRejected, rooms, treasures]):
+            simulation[key].append(value)
+
+    noObject = np.full(agent.nbAgents, -1)
+
+    for phase in experiment.experimentalSetUp:
+        isPractice = "Practice" in phase
+        for block in range(experiment.experimentalSetUp[phase]["blocks"]):
+            for trial in experiment.createTrials(phase, isPractice):
+                for currentTrialType in trial.trialTypes:
+                    treasureOutcomes = np.asarray(trial.treasureOutcomes[currentTrialType])
+
+                    if currentTrialType == "uncertain":
+                        trial.getTrialObjects(currentTrialType)
+                        pairs = {side: np.array([objectIndices[object]
+                                                 for object in trial.pairsForGhostSelection[side]])
+                                 for side in ["left", "right"]}
+                        chooseLeft = agent.choose(pairs["left"], pairs["right"])
+
+                        # The ghost selects the object of the chosen pair at the index of the ghost type:
+                        chosenObjects = np.where(chooseLeft[:, None], pairs["left"], pairs["right"])
+                        ghostSelected = chosenObjects[:, trial.ghostType]
+                        ghostRejected = chosenObjects[:, 1 - trial.ghostType]
+                        # The common room is shown first, then the room unique to the ghost-selected object:
+                        rooms = np.stack([commonRooms[ghostSelected, ghostRejected],
+                                          uniqueRooms[ghostSelected, ghostRejected]], axis=1)
+                        treasures = treasureOutcomes[rooms]
+                        agent.learn(chosenObjects, rooms, treasures, ghostSelected, ghostRejected)
+                        recordTrial(currentTrialType, "NA", chooseLeft, noObject, ghostSelected, ghostRejected, rooms,
+                                    treasures)
+
+                        # Horizontal counterpart of each object (the object in the same row on the other side):
+                        trialObjects = trial.uncertaintyTrialInfo["trialObjects"]
+                        counterparts = np.zeros(len(stimuliClass.objectNames), dtype=int)
+                        for row in ["top", "bottom"]:
+                            leftObject = objectIndices[trialObjects[row + "Left"]]
+                            rightObject = objectIndices[trialObjects[row + "Right"]]
+                            counterparts[leftObject] = rightObject
+                            counterparts[rightObject] = leftObject
+                        continue
+
+                    # The objects of the standard trials are the same for everyone, those of the post trials follow
+                    # from each agent's uncertain trial (which side they are on does not matter to the agents):
+                    if currentTrialType == "standard":
+                        trialObjects = trial.getTrialObjects(currentTrialType)
+                        leftObjects = np.full(agent.nbAgents, objectIndices[trialObjects["left"]])
+                        rightObjects = np.full(agent.nbAgents, objectIndices[trialObjects["right"]])
+                    elif trial.postType == "repeat":  # ghost-selected vs. horizontal counterpart
+                        leftObjects, rightObjects = ghostSelected, counterparts[ghostSelected]
+                    elif trial.postType == "switch":  # ghost-rejected vs. horizontal counterpart
+                        leftObjects, rightObjects = ghostRejected, counterparts[ghostRejected]
+                    else:  # CLASH: ghost-selected vs. ghost-rejected
+                        leftObjects, rightObjects = ghostSelected, ghostRejected
+
+                    chooseLeft = agent.choose(leftObjects[:, None], rightObjects[:, None])
+                    chosenObject = np.where(chooseLeft, leftObjects, rightObjects)
+                    rooms = roomsOfTheObjects[chosenObject]
+                    treasures = treasureOutcomes[rooms]
+                    agent.learn(chosenObject[:, None], rooms, treasures)
+
+                    postType = trial.postType if currentTrialType == "post" else "NA"
+                    recordTrial(currentTrialType, postType, chooseLeft, chosenObject, noObject, noObject, rooms,
+                                treasures)
+
+    # Make every recorded list into an array (trials x agents):
+    for key in ["chooseLeft", "chosenObject", "ghostSelected", "ghostRejected", "rooms", "treasures"]:
+        simulation[key] = np.array(simulation[key])
+    return simulation
+
+########################################################################################################################
@@ -5,9 +5,10 @@
 ########################################
 #                Imports               #
 ########################################
-from random import choice, shuffle
 from psychopy import core, event, sound
+from frameTimeline import FrameTimeline
 from popChoice import popChoice
+from randomStreams import generatorChoice
 from waitText import waitText
 ########################################
 
@@ -21,6 +22,8 @@ class Quiz:
     def __init__(self, window, stimuliClass, quiz100, experiment):
         self.window = window
         self.stimuliClass = stimuliClass
+        # The quiz uses the quiz stream of the session's random streams (see randomStreams.py)
+        self.generator = self.stimuliClass.randomStreams.quiz
 
         # If this is set to True, the quiz will end even if the user did not get all the questions correct
         self.quiz100 = quiz100
@@ -28,6 +31,9 @@ class Quiz:
         # The experiment needs to be launched from here
         self.experimentToBeLaunched = experiment
 
+        # All the questions are shown on the same timeline (see frameTimeline.py)
+        self.timeline = FrameTimeline(self.window)
+
         self.quizQuestions = []
         self.correctness = -1
         self.numberOfAttempts = 0
@@ -55,7 +61,9 @@ class Quiz:
             quizQuestion = QuizQuestion(window=self.window,
                                         stimuliClass=self.stimuliClass,
                                         testStimulus=name,
-                                        firstOrSecond=firstOrSecond)
+                                        firstOrSecond=firstOrSecond,
+                                        generator=self.generator,
+                                        timeline=self.timeline)
             # append questions to overall list of questions
             self.quizQuestions.append(quizQuestion)
 
@@ -65,7 +73,7 @@ class Quiz:
         self.correctness = 0
 
         # shuffle the order of the questions
-        shuffle(self.quizQuestions)
+        self.generator.shuffle(self.quizQuestions)
 
         # welcome and instructions message to the quizz (using waitText to wait for participants to press the spacebar)
         waitText(self.window, "WELCOME TO THE QUIZ"
@@ -116,12 +124,6 @@ class Quiz:
         # despite not getting all the questions right)
         if self.correctness == len(self.quizQuestions) or (self.quiz100 and self.correctness != -1):
 
-            # Reset the size and position of all the room images:
-            for key in self.stimuliClass.roomImages:
-                image = self.stimuliClass.roomImages[key]
-                image.size = self.stimuliClass.roomSize
-                image.pos = [0, 0]
-
             # Create a congratulation text,
             # wait for the participant to press the spacebar (using waitText) before launching the experiment:
             waitText(self.window, "Congratulations! You mastered the quiz. Now the trials will begin."
@@ -142,14 +144,19 @@ class Quiz:
 #             QuizQuestion             #
 ########################################
 class QuizQuestion:
-    def __init__(self, window, stimuliClass, testStimulus, firstOrSecond):
+    def __init__(self, window, stimuliClass, testStimulus, firstOrSecond, generator, timeline=None):
         self.window = window
         self.stimuliClass = stimuliClass
+        self.generator = generator  # the random stream of the quiz
+
+        # The timeline the screens of the question are shown on (see frameTimeline.py)
+        if timeline is None:
+            timeline = FrameTimeline(self.window)
+        self.timeline = timeline
 
         # The stimulus that will be at the top of the screen in the quiz question, participants answer a question about
         # this stimulus
         self.testStimulus = {"name": testStimulus,
-                             "image": self.stimuliClass.allImages[testStimulus],
                              "position": "centreTop"}
 
         # If this is the first or second question for this stimulus
@@ -169,9 +176,9 @@ class QuizQuestion:
             # set the target as the first or second (dependent on firstOrSecond) related room to that object
             target = self.stimuliClass.combiRoomsOfTheObjects[self.testStimulus["name"]][self.firstOrSecond]
             # set the distractor as any room that is not part of those related to the testStimulus
-            distractor = choice(self.stimuliClass.roomNames)
+            distractor = generatorChoice(self.generator, self.stimuliClass.roomNames)
             while distractor in self.stimuliClass.combiRoomsOfTheObjects[self.testStimulus["name"]]:
-                distractor = choice(self.stimuliClass.roomNames)
+                distractor = generatorChoice(self.generator, self.stimuliClass.roomNames)
 
             # To know whether I need to draw a position rect behind the stimulus,
             # I need to know if it is an object or not. The target and distractor will be the opposite of that.
@@ -181,25 +188,30 @@ class QuizQuestion:
             # set the target as the first or second (dependent on firstOrSecond) related object to that room
             target = self.stimuliClass.combiObjectsOfTheRooms[self.testStimulus["name"]][self.firstOrSecond]
             # set the distractor as any object that is not part of those related to the testStimulus
-            distractor = choice(self.stimuliClass.objectNames)
+            distractor = generatorChoice(self.generator, self.stimuliClass.objectNames)
             while distractor in self.stimuliClass.combiObjectsOfTheRooms[self.testStimulus["name"]]:
-                distractor = choice(self.stimuliClass.objectNames)
+                distractor = generatorChoice(self.generator, self.stimuliClass.objectNames)
 
             # To know whether I need to draw a position rect behind the stimulus,
             # I need to know if it is an object or not. The target and distractor will be the opposite of that.
             self.testStimulus["isObject"] = False
 
-        # Make the distractor and the target by creating their names, selecting their images,
+        # Make the distractor and the target by creating their names,
         # and randomly choosing one the positions (and taking it out so that the other cannot have the same position).
         self.distractor = {"name": distractor,
-                           "image": self.stimuliClass.allImages[distractor],
-                           "position": popChoice(positions)}
+                           "position": popChoice(positions, self.generator)}
         self.target = {"name": target,
-                       "image": self.stimuliClass.allImages[target],
-                       "position": popChoice(positions)}
+                       "position": popChoice(positions, self.generator)}
 
-    # When called, this function will draw all three stimuli for the question
-    # NOTE: this changes the size of the images from what they were intended, so this will have to be reset.
+    # This function selects the images of the three stimuli of the question and puts them at their positions (once,
+    # before they are shown). The quiz has its own images of the rooms, at the size of the objects (see Stimuli), so the
+    # sizes of the images of the trials are never changed.
+    def arrangeStimuli(self):
+        for stimulus in [self.testStimulus, self.distractor, self.target]:
+            stimulus["image"] = self.stimuliClass.quizImages[stimulus["name"]]
+            stimulus["image"].pos = self.window.screen[stimulus["position"]]
+
+    # When called, this function will draw all three stimuli for the question (at each frame)
     def drawStimuli(self):
         if self.testStimulus["isObject"]:
             self.stimuliClass.positionRect.pos = self.testStimulus["image"].pos
@@ -211,51 +223,51 @@ class QuizQuestion:
             self.stimuliClass.positionRect.pos = self.target["image"].pos
             self.stimuliClass.positionRect.draw()
 
-        self.testStimulus["image"].pos = self.window.screen[self.testStimulus["position"]]
-        self.testStimulus["image"].size = self.window.screen["quarterHeight"]
         self.testStimulus["image"].draw()
-
-        self.distractor["image"].pos = self.window.screen[self.distractor["position"]]
-        self.distractor["image"].size = self.window.screen["quarterHeight"]
         self.distractor["image"].draw()
-
-        self.target["image"].pos = self.window.screen[self.target["position"]]
-        self.target["image"].size = self.window.screen["quarterHeight"]
         self.target["image"].draw()
 
     # This function will launch the quiz question:
     def launch(self):
-        # create the target and distractor:
+        # create the target and distractor, and start reading their images (if they are streamed, see Stimuli):
         self.createResponseStimuli()
+        self.stimuliClass.prefetchQuizImages([self.testStimulus["name"], self.distractor["name"], self.target["name"]])
+        self.timeline.startTrial()
 
-        # Create the clock for the question:
+        # Create the clock for the question (it is reset when the stimuli appear):
         trialClock = core.Clock()
 
-        # Inter-QUESTION-interval (in total 1 second):
-        trialClock.reset()
-        while trialClock.getTime() < 0.700:
-            self.window.flip()
-        self.startSound.play()  # play the beginning sound
-        core.wait(0.300)
+        # Inter-QUESTION-interval (in total 1 second, the beginning sound is played at 700 ms):
+        self.timeline.runEpoch("interval", 0.700, drawFrame=self.stimuliClass.makePrefetchedImages)
+        # (if the images of the question are streamed and not all made yet, the blank screen stays until they are)
+        if not self.stimuliClass.areImagesReady():
+            self.timeline.runEpoch("loading", None, drawFrame=self.stimuliClass.makePrefetchedImages,
+                                   isOver=self.stimuliClass.areImagesReady)
+        self.arrangeStimuli()
+        self.timeline.runEpoch("beep", 0.300, onStart=self.startSound.play)
 
         # Getting the participant's response for the trial:
-        hasResponded = False
         response = []
-        # need to clear the events, otherwise left/right presses prior to this moment can affect the code
-        event.clearEvents()
-        trialClock.reset()
-        while trialClock.getTime() < 3.000 and not hasResponded:
-            # draw all of the stimuli of the question
-            self.drawStimuli()
-            self.window.flip()
-
-            # wait for a response as the left or right arrow key, if a response is given, break the while loop.
-            response = event.getKeys(keyList=["left", "right"], timeStamped=trialClock)
-            if response:
-                hasResponded = True
+
+        # This function is called when the stimuli appear: need to clear the events, otherwise left/right presses
+        # prior to this moment can affect the code
+        def startQuestion():
+            event.clearEvents()
+            trialClock.reset()
+
+        # This function waits for a response as the left or right arrow key (it is checked after each frame), the
+        # epoch ends if a response is given
+        def hasResponded():
+            response.extend(event.getKeys(keyList=["left", "right"], timeStamped=trialClock))
+            return bool(response)
+
+        # The participant has 3 seconds to answer
+        self.timeline.runEpoch("question", 3.000, drawFrame=self.drawStimuli, onStart=startQuestion,
+                               isOver=hasResponded)
+        self.timeline.finish()
 
         # Create the self.correct variable that will be used for checking that the participants are answering correctly:
-        if hasResponded and (response[0][0][1:] in self.target["position"].lower()):  # gave the correct response
+        if response and (response[0][0][1:] in self.target["position"].lower()):  # gave the correct response
             # NOTE: I am making the position lowercase because otherwise the L or the R would be uppercase and will
             # not allow for a correct response
             self.correct = 1
@@ -0,0 +1,68 @@
+########################################################################################################################
+# This class gives all the random number generators of a session, all created from one seed.
+# Each part of the session that needs randomness has its own independent stream (e.g., the combinations of the stimuli,
+# the schedule of the trials, the random walk...), so that changing how many random values one part uses does not
+# change the others, and a session can be replayed exactly from its seed.
+# Sessions can also be spawned from a session (e.g., one per simulated participant): each of them has its own streams,
+# independent from the others, even across processes.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import numpy as np
+########################################
+
+
+########################################
+#             RandomStreams            #
+########################################
+class RandomStreams:
+    # The names of the streams (new streams must be added at the end so that the previous ones do not change):
+    # - combinations: the rooms of the objects (stimuliEngine.py)
+    # - schedule: the uncertainty comparisons and the order of the trials (experimentEngine.py)
+    # - walk: the starting probabilities and the random walk of the rooms (experimentEngine.py, gaussianIncrement.py)
+    # - outcomes: whether the rooms yield a treasure (experimentEngine.py)
+    # - layout: where the objects are on the screen and the order of the rooms (trialEngine.py)
+    # - quiz: the order of the questions and their distractors (quiz.py)
+    # - responses: the responses of the simulated participants (trialEngine.py, agents)
+    # - parameters: the parameters of the simulated participants (parameterRecovery.py)
+    streamNames = ["combinations", "schedule", "walk", "outcomes", "layout", "quiz", "responses", "parameters"]
+
+    def __init__(self, seed=None, spawnKey=()):
+        # With no seed, a new one is taken from the computer's entropy (it is kept so that it can be recorded)
+        self.seedSequence = np.random.SeedSequence(seed, spawn_key=spawnKey)
+        self.seed = self.seedSequence.entropy
+        self.spawnKey = tuple(spawnKey)
+
+        # Create each stream as an attribute (e.g., self.walk), with its own seed sequence from this one.
+        # The streams are under (0, i) and the spawned sessions under (1, i) so that they can never be the same.
+        for i in range(len(self.streamNames)):
+            streamSeedSequence = np.random.SeedSequence(self.seed, spawn_key=self.spawnKey + (0, i))
+            setattr(self, self.streamNames[i], np.random.default_rng(streamSeedSequence))
+
+    # This function creates the random streams of new independent sessions (e.g., one per participant):
+    def spawn(self, nbSessions, firstSession=0):
+        sessions = []
+        for i in range(firstSession, firstSession + nbSessions):
+            sessions.append(RandomStreams(seed=self.seed, spawnKey=self.spawnKey + (1, i)))
+        return sessions
+
+    # This function gives the seed as a line of a CSV, so it can be recorded with the results and replayed with
+    # RandomStreams(seed, spawnKey):
+    def getSeedLine(self):
+        spawnKey = " ".join(str(key) for key in self.spawnKey)
+        return f"seed,spawnKey\n{self.seed},{spawnKey}"
+
+########################################
+
+
+########################################
+#            generatorChoice           #
+########################################
+# Randomly chooses a value from a list with a generator (the generator's own choice would turn lists of lists into
+# arrays).
+def generatorChoice(generator, values):
+    return values[generator.integers(len(values))]
+
+########################################################################################################################
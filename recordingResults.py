@@ -5,11 +5,15 @@
 #########################################
 #                Imports                #
 #########################################
-from os import mkdir, listdir
+from io import BytesIO, StringIO
+from os import fsync, getpid, listdir, makedirs, mkdir, path, remove, rename, replace, rmdir
+from socket import gethostname
+from time import sleep, time
 import pandas as pd
 import numpy as np
 from matplotlib import pyplot as plt
 from makeIntoCSV import makeIntoCSV
+from resultsTable import readResults
 #########################################
 
 
@@ -18,7 +22,8 @@ from makeIntoCSV import makeIntoCSV
 #########################################
 class ResultsRecorder:
     def __init__(self, experimentID, demographics, quizAttempts, randomWalk, experimentResults,
-                 roomsOfTheObjects, objectsOfTheRooms):
+                 roomsOfTheObjects, objectsOfTheRooms, randomStreams, frameTimeline=None, parquet=False, database=False,
+                 normalized=False):
         # Put in all the parts that will make up the results:
         self.experimentID = experimentID
         self.demographics = demographics
@@ -27,9 +32,26 @@ class ResultsRecorder:
         self.experimentResults = experimentResults
         self.roomsOfTheObjects = roomsOfTheObjects
         self.objectsOfTheRooms = objectsOfTheRooms
+        self.randomStreams = randomStreams
+        # The timeline of the trials: the timing of their epochs and frames is written if the frames were recorded
+        # (see frameTimeline.py)
+        self.frameTimeline = frameTimeline
+        self.parquet = parquet  # whether the results are also written in the Parquet dataset (see parquetResults.py)
+        self.database = database  # whether the results are also written in the SQLite database (see resultsDatabase.py)
+        # Whether the results are written without repeating the demographics on every trial: a table of participants
+        # (allParticipants.csv) and a table of trials (allTrials.csv) instead of allResults.csv (see joinResults)
+        self.normalized = normalized
         # Prepare paths and names:
         self.pathToResults = "results/"
         self.totalFileName = "allResults.csv"
+        self.participantsFileName = "allParticipants.csv"
+        self.trialsFileName = "allTrials.csv"
+        self.highWaterMarkFileName = "lastParticipantID.txt"  # the highest participant ID given so far
+        self.highWaterMarkLockName = "lastParticipantID.lock"  # the lock of that file (see lockHighWaterMark)
+        self.databaseFileName = self.pathToResults + "results.sqlite"  # the database of all the experiments
+        # The files of the participant's directory (name: text, or bytes for the figure). They are all written at once
+        # in a staging directory that then becomes the participant's directory (see publishParticipantDirectory).
+        self.stagedFiles = {}
 
     # This is the function the user launches to create all the results files:
     def recordResults(self):
@@ -40,38 +62,134 @@ class ResultsRecorder:
         self.makeExperimentResults()
         self.makeQuizAttempts()
         self.makeRandomWalk()
-        self.updateAllResultsFile()
+        self.makeSeed()
+        self.makeFrameTimings()
+        self.publishParticipantDirectory()
+        if self.normalized:
+            self.updateNormalizedFiles()
+        else:
+            self.updateAllResultsFile()
+        if self.parquet:
+            self.makeParquetResults()
+        if self.database:
+            self.makeDatabaseResults()
 
     # This functions sets the path to the directory of the experiment and creates a new directory if this is the first
     # participant of this experiment (i.e., there was no directory for this experiment).
+    # (another station may create it at the same time, so it is fine if it is already there)
     def getExperimentDirectory(self):
-        self.allFilesInResults = listdir(self.pathToResults)
         self.pathToResults += self.experimentID + "/"  # adding to the path streamlines the process for the next methods
-        # If no directory, create a new one...
-        if self.experimentID not in self.allFilesInResults:
-            mkdir(self.pathToResults)
+        makedirs(self.pathToResults, exist_ok=True)
 
-    # Creates the directory for this participant:
+    # Creates the directory for this participant (it stays empty until the participant's files are published):
+    # The new participant's ID is the first one after the highest ID given so far (kept in the high-water mark file)
+    # whose directory can be made. Making a directory either succeeds or fails at once, so two stations recording at
+    # the same time can never get the same ID: the second one just tries the next ID.
     def makeParticipantDirectory(self):
-        self.allFilesInResults = listdir(self.pathToResults)
-        if self.allFilesInResults:  # if there are folders in there
-
-            # Find the maximum participant ID
-            maximumParticipantID = -1
-            for folderName in self.allFilesInResults:
-                if folderName != self.totalFileName:  # check it isn't the allResults CSV
-                    if int(folderName) > maximumParticipantID:
-                        maximumParticipantID = int(folderName)
-
-            # Set new participant's ID
-            self.participantID = str(maximumParticipantID + 1)
-
-        else:  # if there are no folder in there
-            self.participantID = "1"
-
-        # Make the participant's directory
+        participantID = self.readHighWaterMark() + 1
+        while True:
+            try:
+                mkdir(self.pathToResults + str(participantID))
+                break
+            except FileExistsError:
+                participantID += 1
+
+        self.participantID = str(participantID)
         self.pathToParticipantDirectory = self.pathToResults + self.participantID + "/"
-        mkdir(self.pathToParticipantDirectory)
+        self.writeHighWaterMark(participantID)
+
+    # This function gives the highest participant ID given so far in the experiment. Without a high-water mark file
+    # (the first participant, or an experiment recorded before there were any), it is the highest participant directory
+    # (the other files, like allResults.csv, are ignored).
+    def readHighWaterMark(self):
+        highWaterMark = self.readHighWaterMarkFile()
+        if highWaterMark is None:
+            participantIDs = [int(fileName) for fileName in listdir(self.pathToResults) if fileName.isdigit()]
+            highWaterMark = max(participantIDs, default=0)
+        return highWaterMark
+
+    # This function gives the participant ID of the high-water mark file (None if there is no such file yet):
+    def readHighWaterMarkFile(self):
+        try:
+            highWaterMarkFile = open(self.pathToResults + self.highWaterMarkFileName, "r")
+            highWaterMark = int(highWaterMarkFile.read())
+            highWaterMarkFile.close()
+            return highWaterMark
+        except (FileNotFoundError, ValueError):
+            return None
+
+    # This function updates the high-water mark file with a participant ID, if it is higher than the one already there
+    # (a station that got a lower ID may finish after a station that got a higher one). The mark is read and written
+    # while holding the lock (see lockHighWaterMark), and it is written under a temporary name (with the name of the
+    # computer, as the stations share the drive) and then renamed, so it is never half written.
+    def writeHighWaterMark(self, participantID):
+        lockOwner = self.lockHighWaterMark()
+        try:
+            highWaterMark = self.readHighWaterMarkFile()
+            if highWaterMark is None or participantID > highWaterMark:
+                temporaryFileName = f"{self.pathToResults}{self.highWaterMarkFileName}.{gethostname()}.{getpid()}.tmp"
+                makeIntoCSV(csvName=temporaryFileName,
+                            stringToWrite=str(participantID))
+                replace(temporaryFileName, self.pathToResults + self.highWaterMarkFileName)
+        finally:
+            self.removeHighWaterMarkLock(lockOwner)
+
+    # This function waits until it can take the lock of the high-water mark: a directory, as making a directory either
+    # succeeds or fails at once, even on a shared drive. The station that takes it writes its owner token in it (the
+    # name of the computer, the process and the time), which this function returns.
+    # A lock that has had the same owner (or no owner written) for more than staleLockSeconds, as seen from this
+    # station's clock, was left by a station that stopped while holding it, so it is removed.
+    def lockHighWaterMark(self, staleLockSeconds=10):
+        lockName = self.pathToResults + self.highWaterMarkLockName
+        lockOwner = f"{gethostname()}.{getpid()}.{time()}"
+        seenOwner = None
+        seenSince = None
+        while True:
+            try:
+                mkdir(lockName)
+            except FileExistsError:
+                owner = self.readHighWaterMarkLockOwner()
+                if seenSince is None or owner != seenOwner:
+                    seenOwner = owner
+                    seenSince = time()
+                elif time() - seenSince > staleLockSeconds:
+                    self.removeHighWaterMarkLock(owner)
+                    continue
+                sleep(.05)
+                continue
+
+            try:
+                ownerFile = open(path.join(lockName, "owner"), "w")
+                ownerFile.write(lockOwner)
+                ownerFile.close()
+                return lockOwner
+            except FileNotFoundError:  # (the lock was removed as stale before the owner was written in it)
+                continue
+
+    # This function gives the owner token of the lock of the high-water mark (None if it is not written or there is no
+    # lock):
+    def readHighWaterMarkLockOwner(self):
+        try:
+            ownerFile = open(path.join(self.pathToResults + self.highWaterMarkLockName, "owner"), "r")
+            owner = ownerFile.read()
+            ownerFile.close()
+            return owner or None
+        except FileNotFoundError:
+            return None
+
+    # This function removes the lock of the high-water mark, only if it still has the owner given: a station that held
+    # it for too long may find that another station removed it as stale and took it, and it must not release the lock
+    # of that station.
+    def removeHighWaterMarkLock(self, owner):
+        lockName = self.pathToResults + self.highWaterMarkLockName
+        if self.readHighWaterMarkLockOwner() != owner:
+            return
+        try:
+            if owner is not None:
+                remove(path.join(lockName, "owner"))
+            rmdir(lockName)
+        except OSError:  # (another station has just removed it, or has just taken it)
+            pass
 
     # Create the variable and the CSV with demographics:
     def makeDemographics(self):
@@ -87,8 +205,7 @@ class ResultsRecorder:
                 self.demographicsLine += ","
 
         # Making into a CSV #
-        makeIntoCSV(csvName=self.pathToParticipantDirectory + self.participantID + "_demographics.csv",
-                    stringToWrite=self.demographicsLine)
+        self.stageFile(self.participantID + "_demographics.csv", self.demographicsLine)
 
     # Create a CSV with all the room/object combinations:
     def makeCombinations(self):
@@ -121,50 +238,41 @@ class ResultsRecorder:
         self.totalCombinations = self.roomsOfTheObjectsLine + "\n\n\n" + self.objectsOfTheRoomsLine
 
         # Making into a CSV #
-        makeIntoCSV(csvName=self.pathToParticipantDirectory + self.participantID + "_combinations.csv",
-                    stringToWrite=self.totalCombinations)
+        self.stageFile(self.participantID + "_combinations.csv", self.totalCombinations)
 
     # Create a CSV for the participant's experiment results, and a CSV for their results with the combination of their
     # demographics, quiz attempts, and experiment results:
+    # (the experiment results are a ResultsTable or a ResultsJournal, they are only made into text here)
     def makeExperimentResults(self):
+        self.experimentResultsCSV = self.experimentResults.toCSV()
 
         # Making just the experiment results into a CSV #
-        makeIntoCSV(csvName=self.pathToParticipantDirectory + self.participantID + "_experimentResults.csv",
-                    stringToWrite=self.experimentResults)
+        self.stageFile(self.participantID + "_experimentResults.csv", self.experimentResultsCSV)
 
         # Making the experiment results combined to the demographics into a CSV #
 
-        # Creating a new first line:
-        self.demographicsAndResults = "id,age,gender,education,student,fieldOfStudy,timeToCompleteDemographics," \
-                                      "quizAttempts,phaseType,isPractice,blockNb,trialNb,trialType,postType,leftObjects," \
-                                      "rightObjects,responseSide,responseTime,ghostSelected,ghostRejected,room1," \
-                                      "rewardProbability1,isTreasure1,room2,rewardProbability2,isTreasure2\n"
-
-        # Taking all but the first line of the experiment results
-        experimentResults = self.experimentResults.split("\n")
-        experimentResults = experimentResults[1:]
-
-        # Taking all but the first line of the demographics
-        demographics = self.demographicsLine.split("\n")
-        demographics = demographics[1:]
-
-        # Putting all the parts together
-        for i in range(len(experimentResults) - 1):  # for some reason the last line is empty so we must get rid of that
-            self.demographicsAndResults += self.participantID + "," \
-                                           + demographics[0] + "," \
-                                           + self.quizAttempts + "," \
-                                           + experimentResults[i]
-            if i != (len(experimentResults) - 2):  # if this is not the last line (before empty line) add a line break
-                self.demographicsAndResults += "\n"
-
-        # Making the CSV
-        makeIntoCSV(csvName=self.pathToParticipantDirectory + self.participantID + "_demographicsAndResults.csv",
-                    stringToWrite=self.demographicsAndResults)
+        # The columns of the demographics (the first line of the demographics) and their values (the second line):
+        demographicsColumns = self.demographicsLine.split("\n")[0].split(",")
+        demographicsValues = list(self.demographics.values())
+
+        # Putting all the parts together: the id, demographics and quiz attempts are the same on every line
+        demographicsAndResults = pd.read_csv(StringIO(self.experimentResultsCSV), dtype=str, keep_default_na=False)
+        demographicsAndResults.insert(0, "id", self.participantID)
+        for i in range(len(demographicsColumns)):
+            demographicsAndResults.insert(i + 1, demographicsColumns[i], demographicsValues[i])
+        demographicsAndResults.insert(len(demographicsColumns) + 1, "quizAttempts", self.quizAttempts)
+
+        # (without the line break at the end, see updateAllResultsFile)
+        self.demographicsAndResults = demographicsAndResults.to_csv(index=False, na_rep="NA",
+                                                                    lineterminator="\n")[:-1]
+
+        # Making the CSV (unless the results are normalized: the demographics are not repeated then)
+        if not self.normalized:
+            self.stageFile(self.participantID + "_demographicsAndResults.csv", self.demographicsAndResults)
 
     # Create a CSV for the participant's quiz attempts:
     def makeQuizAttempts(self):
-        makeIntoCSV(csvName=self.pathToParticipantDirectory + self.participantID + "_quizAttempts.csv",
-                    stringToWrite=self.quizAttempts)
+        self.stageFile(self.participantID + "_quizAttempts.csv", self.quizAttempts)
 
     # Create a CSV and a figure of the gaussian random walk of the room's reward probabilities:
     def makeRandomWalk(self):
@@ -181,8 +289,8 @@ class ResultsRecorder:
         randomWalkDataframe.insert(0, "trials", numberOfIncrements, True)
 
         # Making a CSV for the random walk #
-        fileName = self.pathToParticipantDirectory + self.participantID + "_randomWalk.csv"
-        randomWalkDataframe.to_csv(fileName, index=False)  # without the names of the rows
+        self.stageFile(self.participantID + "_randomWalk.csv",
+                       randomWalkDataframe.to_csv(index=False, lineterminator="\n"))  # without the names of the rows
 
         # Making a line plot of the randomWalks #
         randomWalkPlot = randomWalkDataframe.plot(x="trials",
@@ -191,25 +299,120 @@ class ResultsRecorder:
                                                   grid=True,
                                                   color=list(self.randomWalk.keys()))  # same colours as the rooms
         randomWalkPlot.set(xlabel="Trials", ylabel="Reward Probabilities")  # change the axes labels
-        plt.savefig(self.pathToParticipantDirectory + self.participantID + "_randomWalk.png")
+        randomWalkFigure = BytesIO()
+        plt.savefig(randomWalkFigure, format="png")
+        self.stageFile(self.participantID + "_randomWalk.png", randomWalkFigure.getvalue())
+        plt.close()  # otherwise every participant recorded in the same process keeps its figure open
+
+    # Create a CSV with the seed of the session's random streams (so that the session can be replayed):
+    def makeSeed(self):
+        self.stageFile(self.participantID + "_seed.csv", self.randomStreams.getSeedLine())
+
+    # Create the CSVs of the timing of the trials' epochs (e.g., the onset of each room and the frames dropped while it
+    # was shown) and of each of their frames, if the time of every frame was recorded:
+    def makeFrameTimings(self):
+        if self.frameTimeline is not None and self.frameTimeline.recordFrames:
+            self.stageFile(self.participantID + "_frameTimings.csv", self.frameTimeline.toCSV())
+            self.stageFile(self.participantID + "_frameFlips.csv", self.frameTimeline.framesToCSV())
+
+    # This function adds a file to the participant's directory (it is only written when the directory is published):
+    def stageFile(self, fileName, contents):
+        self.stagedFiles[fileName] = contents
+
+    # This function writes all the participant's files in a staging directory, makes sure they are on the disk, and then
+    # renames the staging directory to the participant's directory in one step. If anything fails before, there is no
+    # half written participant directory (only the empty directory that kept the participant's ID).
+    # (the staging directory's name starts with a dot, so it is never taken for a participant)
+    def publishParticipantDirectory(self):
+        stagingDirectory = f"{self.pathToResults}.{self.participantID}.{getpid()}.staging"
+        mkdir(stagingDirectory)
+        for fileName, contents in self.stagedFiles.items():
+            if isinstance(contents, bytes):
+                stagedFile = open(stagingDirectory + "/" + fileName, "wb")
+            else:
+                stagedFile = open(stagingDirectory + "/" + fileName, "w")
+            stagedFile.write(contents)
+            stagedFile.flush()
+            fsync(stagedFile.fileno())
+            stagedFile.close()
+
+        # The staging directory replaces the empty participant's directory:
+        participantDirectory = self.pathToParticipantDirectory.rstrip("/")
+        try:
+            replace(stagingDirectory, participantDirectory)
+        except OSError:  # (on Windows a directory cannot be replaced, so the empty one is removed first)
+            rmdir(participantDirectory)
+            rename(stagingDirectory, participantDirectory)
 
     # This function updates an overall file with all the results:
     def updateAllResultsFile(self):
-        # if the total file already exits...
-        if self.totalFileName in self.allFilesInResults:
-            # ...we want to take the demographics and results of the participant without the column names:
-            demographicsAndResults = self.demographicsAndResults.split("\n")
-            demographicsAndResults = demographicsAndResults[1:]
-            demographicsAndResults = "\n".join(demographicsAndResults)
-            demographicsAndResults = "\n" + demographicsAndResults
-        # Otherwise we do want the column names:
-        else:
-            demographicsAndResults = self.demographicsAndResults
-
-        # Append this participant's data to the total results data file: #
-        # If there is no previous data file, opening with "a" will create a new one
-        makeIntoCSV(csvName=self.pathToResults + self.totalFileName,
-                    stringToWrite=demographicsAndResults,
-                    openingStyle="a")
+        self.appendToTotalFile(self.totalFileName, self.demographicsAndResults)
+
+    # This function updates the overall files of the normalized results: the participant's line (their id,
+    # demographics and quiz attempts) in the participants file, and their trials (with their id) in the trials file.
+    def updateNormalizedFiles(self):
+        demographicsLines = self.demographicsLine.split("\n")
+        participant = "id," + demographicsLines[0] + ",quizAttempts\n" \
+                      + self.participantID + "," + demographicsLines[1] + "," + self.quizAttempts
+        self.appendToTotalFile(self.participantsFileName, participant)
+
+        # (the lines of the results, without the line break at the end, each starting with the id)
+        experimentResults = self.experimentResultsCSV[:-1].split("\n")
+        trials = "\n".join(["id," + experimentResults[0]]
+                           + [self.participantID + "," + line for line in experimentResults[1:]])
+        self.appendToTotalFile(self.trialsFileName, trials)
+
+    # This function adds the participant's lines (a CSV with the column names, without a line break at the end) to an
+    # overall file of the experiment, with a single write. The file is created with the column names only if it is not
+    # there yet (creating it fails if another station has just created it, and then the lines are added to it instead).
+    def appendToTotalFile(self, fileName, participantLines):
+        try:
+            # If there is no previous data file, we do want the column names:
+            totalFile = open(self.pathToResults + fileName, "x")
+        except FileExistsError:
+            # Otherwise we want the lines of the participant without the column names:
+            totalFile = open(self.pathToResults + fileName, "a")
+            participantLines = "\n" + participantLines.split("\n", 1)[1]
+
+        # Append this participant's data to the total data file: #
+        totalFile.write(participantLines)
+        totalFile.flush()
+        fsync(totalFile.fileno())
+        totalFile.close()
+
+    # This function writes the participant's demographics, quiz attempts and typed results in the Parquet dataset (in the
+    # partition of the experiment and participant, see parquetResults.py):
+    def makeParquetResults(self):
+        from parquetResults import writeParticipantResults  # only needed (with pyarrow) for the Parquet results
+
+        demographicsColumns = self.demographicsLine.split("\n")[0].split(",")
+        demographicsValues = list(self.demographics.values())
+
+        results = readResults(StringIO(self.experimentResultsCSV))
+        for i in range(len(demographicsColumns)):
+            results.insert(i, demographicsColumns[i], demographicsValues[i])
+        results.insert(len(demographicsColumns), "quizAttempts", self.quizAttempts)
+
+        writeParticipantResults(results=results,
+                                experimentID=self.experimentID,
+                                participantID=self.participantID)
+
+    # This function writes the participant, the session and its trials and random walk in the SQLite database of all the
+    # experiments (results/results.sqlite), in one transaction:
+    def makeDatabaseResults(self):
+        from resultsDatabase import ResultsDatabase
+
+        demographicsColumns = self.demographicsLine.split("\n")[0].split(",")
+        participant = dict(zip(demographicsColumns, self.demographics.values()))
+        participant["quizAttempts"] = self.quizAttempts
+
+        database = ResultsDatabase(self.databaseFileName)
+        database.recordSession(experimentID=self.experimentID,
+                               participantID=self.participantID,
+                               participant=participant,
+                               randomStreams=self.randomStreams,
+                               results=readResults(StringIO(self.experimentResultsCSV)),
+                               randomWalk=self.randomWalk)
+        database.close()
 
 ########################################################################################################################
@@ -0,0 +1,139 @@
+########################################################################################################################
+# This class keeps the results of every experiment in one SQLite database (results/results.sqlite), next to the CSV
+# files (it is optional, see ResultsRecorder). The tables are:
+# - participants: one row per participant of an experiment (their demographics and quiz attempts)
+# - sessions: one row per session of a participant (the seed of its random streams)
+# - trials: one row per trial of a session (the columns of the results, see ResultsTable)
+# - randomWalk: one row per increment and room of a session (the reward probability of the room)
+# The participants, sessions and trials are indexed by experiment, participant, phase type and trial type, so that
+# questions such as "the clash post trials of the experimental blocks of experiment X" do not go through every trial.
+# Each session is written in one transaction: several stations (or processes) can write in the same database, they
+# wait for each other (the default rollback journal is used rather than WAL, as WAL does not work on shared drives).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import sqlite3
+import pandas as pd
+from resultsTable import ResultsTable
+########################################
+
+
+########################################
+#           ResultsDatabase            #
+########################################
+class ResultsDatabase:
+    # The SQL types of the columns of the results:
+    kindSQLTypes = {"category": "TEXT", "integer": "INTEGER", "float": "REAL"}
+
+    def __init__(self, fileName="results/results.sqlite", timeout=60):
+        # (the timeout is how many seconds to wait for the other writers)
+        self.connection = sqlite3.connect(fileName, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.createTables()
+
+    # This function creates the tables and their indexes (if they are not there already):
+    def createTables(self):
+        trialColumns = ",\n".join(f"{column} {self.kindSQLTypes[kind]}" for column, kind in ResultsTable.columns.items())
+        self.connection.executescript(f"""
+            BEGIN;
+            CREATE TABLE IF NOT EXISTS participants (
+                experimentID TEXT NOT NULL,
+                participantID TEXT NOT NULL,
+                age TEXT,
+                gender TEXT,
+                education TEXT,
+                student TEXT,
+                fieldOfStudy TEXT,
+                timeToCompleteDemographics TEXT,
+                quizAttempts TEXT,
+                PRIMARY KEY (experimentID, participantID));
+            CREATE TABLE IF NOT EXISTS sessions (
+                sessionID INTEGER PRIMARY KEY,
+                experimentID TEXT NOT NULL,
+                participantID TEXT NOT NULL,
+                seed TEXT,
+                spawnKey TEXT,
+                recordedAt TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (experimentID, participantID) REFERENCES participants (experimentID, participantID));
+            CREATE TABLE IF NOT EXISTS trials (
+                sessionID INTEGER NOT NULL REFERENCES sessions (sessionID),
+                {trialColumns},
+                PRIMARY KEY (sessionID, trialNb));
+            CREATE TABLE IF NOT EXISTS randomWalk (
+                sessionID INTEGER NOT NULL REFERENCES sessions (sessionID),
+                increment INTEGER NOT NULL,
+                room TEXT NOT NULL,
+                rewardProbability REAL,
+                PRIMARY KEY (sessionID, increment, room));
+            CREATE INDEX IF NOT EXISTS sessionsParticipant ON sessions (experimentID, participantID);
+            CREATE INDEX IF NOT EXISTS trialsTypes ON trials (trialType, postType, phaseType, isPractice);
+            CREATE INDEX IF NOT EXISTS trialsSessionTypes ON trials (sessionID, trialType, phaseType);
+            COMMIT;""")
+
+    # This function records a session: the participant (a dictionary of the columns of the participants table), the
+    # random streams of the session, its results (a dataframe, see readResults) and its random walk (a dictionary of
+    # the reward probabilities of each room, see ExperimentEngine). It is all written in one transaction, so a session
+    # is either all there or not there at all.
+    def recordSession(self, experimentID, participantID, participant, randomStreams, results, randomWalk):
+        cursor = self.connection.cursor()
+        # BEGIN IMMEDIATE takes the write lock at once (the other writers wait until the commit)
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            participantColumns = ["experimentID", "participantID"] + list(participant)
+            cursor.execute(f"INSERT INTO participants ({', '.join(participantColumns)}) "
+                           f"VALUES ({', '.join('?' * len(participantColumns))})",
+                           [experimentID, participantID] + list(participant.values()))
+
+            cursor.execute("INSERT INTO sessions (experimentID, participantID, seed, spawnKey) VALUES (?, ?, ?, ?)",
+                           [experimentID, participantID, str(randomStreams.seed),
+                            " ".join(str(key) for key in randomStreams.spawnKey)])
+            sessionID = cursor.lastrowid
+
+            # The NA of the results are NULL:
+            trialColumns = list(ResultsTable.columns)
+            trialRows = results[trialColumns].astype(object).where(results[trialColumns].notna(), None)
+            cursor.executemany(f"INSERT INTO trials (sessionID, {', '.join(trialColumns)}) "
+                               f"VALUES (?, {', '.join('?' * len(trialColumns))})",
+                               [[sessionID] + row for row in trialRows.values.tolist()])
+
+            cursor.executemany("INSERT INTO randomWalk (sessionID, increment, room, rewardProbability) "
+                               "VALUES (?, ?, ?, ?)",
+                               [(sessionID, increment, room, float(randomWalk[room][increment]))
+                                for room in randomWalk
+                                for increment in range(len(randomWalk[room]))])
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return sessionID
+
+    # This function gives the trials (with the experiment and participant of their session) that match the values
+    # given, e.g. getTrials(experimentID="X", trialType="post", postType="clash", isPractice=0).
+    def getTrials(self, experimentID=None, participantID=None, **trialValues):
+        conditions = []
+        parameters = []
+        if experimentID is not None:
+            conditions.append("sessions.experimentID = ?")
+            parameters.append(experimentID)
+        if participantID is not None:
+            conditions.append("sessions.participantID = ?")
+            parameters.append(participantID)
+        for column, value in trialValues.items():
+            if column not in ResultsTable.columns:
+                raise ValueError(f"Unknown results column '{column}'")
+            conditions.append(f"trials.{column} = ?")
+            parameters.append(value)
+
+        query = "SELECT sessions.experimentID, sessions.participantID, trials.* " \
+                "FROM trials JOIN sessions ON trials.sessionID = sessions.sessionID"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY trials.sessionID, trials.trialNb"
+        return pd.read_sql_query(query, self.connection, params=parameters)
+
+    def close(self):
+        self.connection.close()
+
+########################################################################################################################
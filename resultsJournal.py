@@ -0,0 +1,62 @@
+########################################################################################################################
+# This class writes the results of the trials to disk as the session goes (a journal), so that a crash or a power cut
+# does not lose the trials that were already done. It is opened when the session starts, and the rows of each
+# trial/triplet are added at its end (between the trials, never during the timed presentation of a trial).
+# The journal is a CSV with the same columns as the _experimentResults.csv file (see ResultsTable). The file is line
+# buffered (each row goes to the operating system right away) and it is synced to the disk every few seconds and at
+# the end of each block. The final results files are made from it (see ResultsRecorder).
+# After a crash, the journal of the session (journals/<experimentID>_<seed>.csv) has every trial that was finished.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import fsync, makedirs
+from time import monotonic
+from resultsTable import ResultsTable
+########################################
+
+
+########################################
+#            ResultsJournal            #
+########################################
+class ResultsJournal:
+    def __init__(self, experimentID, randomStreams, pathToJournals="journals/", syncInterval=5):
+        # The journal is named after the experiment and the seed of the session (so it can be replayed):
+        makedirs(pathToJournals, exist_ok=True)
+        self.fileName = pathToJournals + experimentID + "_" + str(randomStreams.seed) + ".csv"
+        self.syncInterval = syncInterval  # the seconds between two syncs to the disk
+
+        # Opening the journal (line buffered) and writing the header of the results:
+        self.journalFile = open(self.fileName, "w", buffering=1)
+        self.journalFile.write(",".join(ResultsTable.columns) + "\n")
+        self.sync()
+
+    # This function adds rows of the results table to the journal (it is called at the end of each trial/triplet):
+    def writeRows(self, resultsTable, firstRow, lastRow):
+        self.journalFile.write(resultsTable.toCSV(firstRow, lastRow, header=False))
+        if monotonic() - self.lastSync >= self.syncInterval:
+            self.sync()
+
+    # This function makes sure everything written so far is on the disk:
+    def sync(self):
+        self.journalFile.flush()
+        fsync(self.journalFile.fileno())
+        self.lastSync = monotonic()
+
+    # This function closes the journal at the end of the session:
+    def close(self):
+        if not self.journalFile.closed:
+            self.sync()
+            self.journalFile.close()
+
+    # This function gives the results written in the journal (as the text of a CSV):
+    def toCSV(self):
+        if not self.journalFile.closed:
+            self.journalFile.flush()
+        journalFile = open(self.fileName, "r")
+        results = journalFile.read()
+        journalFile.close()
+        return results
+
+########################################################################################################################
@@ -0,0 +1,132 @@
+########################################################################################################################
+# This class loads the results of many experiments for analyses without having them all in memory as text.
+# Nothing is read when it is created: the results are read when they are asked for, experiment by experiment and chunk
+# by chunk, and only the columns asked for are read. The rooms, objects and types are categoricals and the numbers are
+# typed (see readResults), and the trials can be filtered (e.g., phaseType="triplet", isPractice=0, postType="clash")
+# as each chunk is read, so only the trials kept are ever in memory together.
+# The results of an experiment (results/<experimentID>/) are read from allResults.csv and from allTrials.csv and
+# allParticipants.csv (normalized results, see ResultsRecorder), or else from the directories of its participants.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import listdir, path
+import pandas as pd
+from resultsTable import ResultsTable, readResults
+########################################
+
+
+########################################
+#            ResultsLoader             #
+########################################
+class ResultsLoader:
+    def __init__(self, pathToResults="results/", experimentIDs=None, chunkSize=100000):
+        self.pathToResults = pathToResults
+        self.experimentIDs = experimentIDs  # the experiments to read (all the experiments of the results by default)
+        self.chunkSize = chunkSize  # the number of lines read at once
+
+    # This function gives the experiments to read (the directories of the results):
+    def getExperimentIDs(self):
+        if self.experimentIDs is not None:
+            return list(self.experimentIDs)
+        return sorted(fileName for fileName in listdir(self.pathToResults)
+                      if path.isdir(path.join(self.pathToResults, fileName)) and not fileName.startswith("."))
+
+    # This function gives the files to read for an experiment, as a list of (results file, participant ID, participants
+    # file, participant IDs left out): the participant ID is only given when the file has no id column, and the
+    # participants file only for normalized results.
+    # An experiment recorded partly before and partly after its results were normalized has both allResults.csv and
+    # allTrials.csv: both are read, and the participants that are in both are only read from the normalized results.
+    def getSources(self, experimentID):
+        experimentDirectory = path.join(self.pathToResults, experimentID)
+        allResultsFile = path.join(experimentDirectory, "allResults.csv")
+        trialsFile = path.join(experimentDirectory, "allTrials.csv")
+        participantsFile = path.join(experimentDirectory, "allParticipants.csv")
+
+        sources = []
+        normalizedIDs = set()
+        if path.exists(trialsFile):
+            normalizedIDs = set(pd.read_csv(participantsFile, usecols=["id"])["id"])
+            sources.append((trialsFile, None, participantsFile, set()))
+        if path.exists(allResultsFile):
+            sources.insert(0, (allResultsFile, None, None, normalizedIDs))
+        if sources:
+            return sources
+
+        # Otherwise, each participant's directory (with the demographics if they are there):
+        sources = []
+        participantIDs = sorted(int(fileName) for fileName in listdir(experimentDirectory) if fileName.isdigit())
+        for participantID in participantIDs:
+            participantFiles = path.join(experimentDirectory, str(participantID), str(participantID))
+            if path.exists(participantFiles + "_demographicsAndResults.csv"):
+                sources.append((participantFiles + "_demographicsAndResults.csv", None, None, set()))
+            elif path.exists(participantFiles + "_experimentResults.csv"):
+                sources.append((participantFiles + "_experimentResults.csv", participantID, None, set()))
+        return sources
+
+    # This function reads the results chunk by chunk: it gives a dataframe for each chunk, with only the columns asked
+    # for (all of them by default, the experimentID column is always there) and only the trials with the values of the
+    # filters (a value, or a list of values, for any column of the results, e.g. postType=["repeat", "switch"]).
+    def iterateChunks(self, columns=None, **filters):
+        for column in filters:
+            if column != "id" and column not in ResultsTable.columns:
+                raise ValueError(f"Unknown results column '{column}'")
+
+        for experimentID in self.getExperimentIDs():
+            for resultsFile, participantID, participantsFile, leftOutIDs in self.getSources(experimentID):
+
+                # The participants of normalized results (only their columns that were asked for):
+                participants = None
+                if participantsFile is not None:
+                    participants = pd.read_csv(participantsFile, dtype=str, keep_default_na=False)
+                    participants["id"] = participants["id"].astype(int)
+                    if columns is not None:
+                        participants = participants[["id"] + [column for column in columns
+                                                              if column in participants.columns and column != "id"]]
+
+                # Only the columns asked for and the columns of the filters are read (the ones that are not in the file
+                # are ignored):
+                readColumns = None
+                if columns is not None:
+                    readColumns = (set(columns) | set(filters) | {"id"}).__contains__
+
+                for chunk in readResults(resultsFile, columns=readColumns, chunkSize=self.chunkSize):
+                    for column, value in filters.items():
+                        if isinstance(value, (list, tuple, set)):
+                            chunk = chunk[chunk[column].isin(value)]
+                        else:
+                            chunk = chunk[chunk[column] == value]
+                    if leftOutIDs:
+                        chunk = chunk[~chunk["id"].isin(leftOutIDs)]
+
+                    if participantID is not None:
+                        chunk.insert(0, "id", participantID)
+                    if participants is not None:
+                        chunk = participants.merge(chunk, on="id", how="right")
+                    chunk.insert(0, "experimentID", experimentID)
+
+                    if columns is not None:
+                        chunk = chunk[["experimentID"] + [column for column in columns
+                                                          if column in chunk.columns and column != "experimentID"]]
+                    yield chunk.reset_index(drop=True)
+
+    # This function reads the results into one dataframe (see iterateChunks). The categoricals of the chunks are put
+    # together so the columns stay categoricals.
+    def load(self, columns=None, **filters):
+        chunks = list(self.iterateChunks(columns, **filters))
+        if not chunks:
+            return pd.DataFrame(columns=["experimentID"] + list(columns or []))
+
+        categoryColumns = ["experimentID"] + [column for column in chunks[0].columns
+                                              if isinstance(chunks[0][column].dtype, pd.CategoricalDtype)]
+        categoryTypes = {}
+        for column in categoryColumns:
+            categories = {}  # (the categories of all the chunks, in the order they came)
+            for chunk in chunks:
+                categories.update(dict.fromkeys(pd.Categorical(chunk[column]).categories))
+            categoryTypes[column] = pd.CategoricalDtype(list(categories))
+
+        return pd.concat([chunk.astype(categoryTypes) for chunk in chunks], ignore_index=True)
+
+########################################################################################################################
@@ -0,0 +1,146 @@
+########################################################################################################################
+# This class holds the results of the trials of an experiment as columns (one array per column of the results) rather
+# than as text. The arrays are made for the number of trials of the experiment beforehand, so adding a trial's row does
+# not copy the previous ones (if there are more rows than expected, the arrays are doubled).
+# The columns of text (rooms, objects, trial types...) are stored as codes: each column has its categories (its
+# different values, added as they come) and the rows hold the index of their value in them.
+# The text of the results (a CSV) is only made when the results are exported (see toCSV).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import numpy as np
+import pandas as pd
+########################################
+
+
+########################################
+#             ResultsTable             #
+########################################
+class ResultsTable:
+    # The columns of the results (in the order of the CSV) and their kind:
+    # - category: text, stored as the code of its category (-1 when NA)
+    # - integer: whole numbers that are never negative (-1 when NA)
+    # - float: numbers (NaN when NA)
+    columns = {"phaseType": "category",
+               "isPractice": "integer",
+               "blockNb": "integer",
+               "trialNb": "integer",
+               "trialType": "category",
+               "postType": "category",
+               "leftObjects": "category",
+               "rightObjects": "category",
+               "responseSide": "category",
+               "responseTime": "float",
+               "ghostSelected": "category",
+               "ghostRejected": "category",
+               "room1": "category",
+               "rewardProbability1": "float",
+               "isTreasure1": "integer",
+               "room2": "category",
+               "rewardProbability2": "float",
+               "isTreasure2": "integer"}
+    kindTypes = {"category": np.int16, "integer": np.int32, "float": np.float64}
+    kindMissingValues = {"category": -1, "integer": -1, "float": np.nan}
+
+    def __init__(self, capacity=1024):
+        self.nbRows = 0
+        self.capacity = max(1, capacity)
+
+        # The array of each column and the categories of the category columns (as a dictionary of value: code, in the
+        # order they came):
+        self.values = {}
+        self.categories = {}
+        for column, kind in self.columns.items():
+            self.values[column] = np.full(self.capacity, self.kindMissingValues[kind], dtype=self.kindTypes[kind])
+            if kind == "category":
+                self.categories[column] = {}
+
+    def __len__(self):
+        return self.nbRows
+
+    # This function adds a row to the results, the columns that are not given are NA:
+    def addRow(self, **row):
+        if self.nbRows == self.capacity:
+            self.grow()
+
+        for column, value in row.items():
+            if value is None:
+                continue
+            if self.columns[column] == "category":
+                categories = self.categories[column]
+                if value not in categories:
+                    categories[value] = len(categories)
+                value = categories[value]
+            self.values[column][self.nbRows] = value
+
+        self.nbRows += 1
+
+    # This function doubles the size of the arrays (when there are more rows than expected):
+    def grow(self):
+        for column, kind in self.columns.items():
+            moreValues = np.full(self.capacity, self.kindMissingValues[kind], dtype=self.kindTypes[kind])
+            self.values[column] = np.concatenate([self.values[column], moreValues])
+        self.capacity *= 2
+
+    # This function gives the results as a dataframe: the category columns are pandas categoricals and the integer
+    # columns can be NA.
+    def toDataFrame(self, firstRow=0, lastRow=None):
+        if lastRow is None:
+            lastRow = self.nbRows
+
+        data = {}
+        for column, kind in self.columns.items():
+            values = self.values[column][firstRow:lastRow]
+            if kind == "category":
+                data[column] = pd.Categorical.from_codes(values, categories=list(self.categories[column]))
+            elif kind == "integer":
+                data[column] = pd.arrays.IntegerArray(values.copy(), values < 0)
+            else:
+                data[column] = values.copy()
+        return pd.DataFrame(data)
+
+    # This function makes the CSV of the results (with the header line and NA for the missing values):
+    def toCSV(self, firstRow=0, lastRow=None, header=True):
+        return self.toDataFrame(firstRow, lastRow).to_csv(index=False, header=header, na_rep="NA", lineterminator="\n")
+
+########################################
+
+
+########################################
+#              readResults             #
+########################################
+# This function reads results written as a CSV (an _experimentResults.csv file, an allResults.csv file, a journal...)
+# with the types of the columns of a ResultsTable (categoricals, integers that can be NA and floats), instead of text.
+# Only the columns given are read (all of them by default). With a chunk size, it gives an iterator of dataframes of
+# that many lines (so big files never have to be in memory all at once).
+def readResults(csvFile, columns=None, chunkSize=None):
+    dataTypes = {"category": "category", "integer": "Int32", "float": "float64"}
+    return pd.read_csv(csvFile,
+                       usecols=columns,
+                       chunksize=chunkSize,
+                       dtype={column: dataTypes[kind] for column, kind in ResultsTable.columns.items()},
+                       na_values=["NA"],
+                       keep_default_na=False,
+                       float_precision="round_trip")  # (the probabilities are read back exactly as they were written)
+
+
+########################################
+#             joinResults              #
+########################################
+# This function rebuilds the results of all the participants of a normalized experiment (see ResultsRecorder): each
+# trial of the trials file (allTrials.csv) gets the demographics and quiz attempts of its participant from the
+# participants file (allParticipants.csv). The columns are in the same order as in allResults.csv.
+def joinResults(participantsFile, trialsFile, columns=None):
+    participants = pd.read_csv(participantsFile, dtype=str, keep_default_na=False)
+    participants["id"] = participants["id"].astype(int)
+    if columns is not None:
+        participants = participants[["id"] + [column for column in columns
+                                              if column in participants.columns and column != "id"]]
+        columns = ["id"] + [column for column in columns if column not in participants.columns and column != "id"]
+
+    trials = readResults(trialsFile, columns)
+    return participants.merge(trials, on="id", how="right")
+
+########################################################################################################################
@@ -0,0 +1,38 @@
+########################################################################################################################
+# This class measures the wall time of each phase of the start of the experiment (e.g., importing PsychoPy, opening the
+# window, creating the stimuli), to see where the time goes between two participants (see MAIN.py and STARTUP.py).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from time import perf_counter
+########################################
+
+
+########################################
+#             StartupTimer             #
+########################################
+class StartupTimer:
+    def __init__(self):
+        self.phaseTimes = {}  # the seconds of each phase, in the order they were done
+        self.phaseStart = perf_counter()
+
+    # This function ends a phase (it started at the end of the previous one):
+    def mark(self, phase):
+        phaseEnd = perf_counter()
+        self.phaseTimes[phase] = phaseEnd - self.phaseStart
+        self.phaseStart = phaseEnd
+
+    # This function starts the next phase now (the time since the last phase is not measured, e.g. the time the
+    # experimenter and the participant spend on the forms):
+    def restart(self):
+        self.phaseStart = perf_counter()
+
+    # This function gives the time of each phase and their total, as text:
+    def report(self):
+        lines = [f"{phase}: {seconds:.3f} s" for phase, seconds in self.phaseTimes.items()]
+        lines.append(f"total: {sum(self.phaseTimes.values()):.3f} s")
+        return "\n".join(lines)
+
+########################################################################################################################
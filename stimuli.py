@@ -5,37 +5,53 @@
 ########################################
 #                Imports               #
 ########################################
+from collections import ChainMap
+import numpy as np
 from psychopy import visual
-from random import choice, shuffle
-from popChoice import popChoice
+from imageCache import ImageCache
+from stimuliEngine import StimuliEngine
+from textureAtlas import makeStimuliAtlases
+from textureManager import StreamedImages, TextureManager
 ########################################
 
 
 ########################################
 #                Stimuli               #
 ########################################
-class Stimuli:
-    def __init__(self, window):
+# The names of the objects and rooms and their combinations, the sizes of the stimuli and the colour of the position
+# rectangles come from StimuliEngine
+# In atlas mode (useAtlas=True), the trials draw the objects and the rooms from texture atlases (see textureAtlas.py):
+# all the objects of a screen in one draw, with their position rectangles in the atlas, and the rooms from one texture.
+# With streamImages=True (for large stimulus sets), the images of the objects and rooms are only made when they are
+# used, the images of each trial being prefetched during its inter-trial interval, and only the most recently used
+# ones are kept, except the ones of the trial or quiz question being shown (see textureManager.py).
+# The quiz has its own images of the rooms (at the size of the objects), so it never changes the size of the images of
+# the trials.
+class Stimuli(StimuliEngine):
+    def __init__(self, window, randomStreams=None, useAtlas=False, streamImages=False):
+        StimuliEngine.__init__(self, randomStreams=randomStreams)
         self.window = window  # The psychopy window we are using
+        self.useAtlas = useAtlas
+        self.streamImages = streamImages
 
         self.pathToImages = "resources/"  # where we put the images
+        # The images are decoded and resized once, then read from the cache at each launch (see imageCache.py)
+        self.imageCache = ImageCache(pathToCache=self.pathToImages + "cache/")
+        if self.streamImages:
+            self.textureManager = TextureManager(window=self.window, imageCache=self.imageCache)
 
-        # the different objects (needs the be the same names as the images)
-        self.objectNames = ["key", "light", "phone", "stove"]
         self.objectImages = {}  # preparing to create the images
-        self.objectSize = self.window.screen["quarterHeight"]  # square of the quarter of the size
-        self.positionRectColour = [.5, .5, .5]  # a light grey
-
-        # the different rooms (needs the be the same names as the images)
-        self.roomNames = ["pink", "blue", "green", "brown"]
         self.roomImages = {}  # preparing to create the images
-        self.roomSize = self.window.screen["height"] * .90  # Squares taking up most of the screen
+        self.objectSize, self.roomSize = self.getStimuliSizes(self.window.screen["height"])
 
         self.allImages = {}  # preparing to create the images
+        self.quizRoomImages = {}  # the rooms at the size of the objects, for the quiz
+        self.quizImages = {}  # the images of the quiz (the objects and these rooms)
+        self.prefetchedImages = []  # the images of the trial or question being shown (see prefetchStreamedImages)
 
-        # Preparing to record all the different combinations
-        self.combiRoomsOfTheObjects = {}  # each object will be a key for a list with its two rooms
-        self.combiObjectsOfTheRooms = {}  # each room will be a key for a list with its two objects
+        # What the atlases show (the stimuli are only changed when the screen changes, see drawObjectImages)
+        self.shownObjects = None
+        self.shownRoom = None
 
         # Creating a position rectangle for the objects (so that they are all in the same colour square when presented)
         self.positionRect = visual.Rect(
@@ -59,7 +75,7 @@ class Stimuli:
         # Creating the image for the treasure (the whole of the screen size)
         self.treasureImage = visual.ImageStim(
                 win=self.window,
-                image=self.pathToImages + "treasure.jpg",
+                image=self.imageCache.getImage(self.pathToImages + "treasure.jpg", self.window.size),
                 units="pix",
                 size=self.window.size)
 
@@ -67,15 +83,26 @@ class Stimuli:
     def createStimuli(self):
         self.createObjects()
         self.createRooms()
+        if self.streamImages:
+            self.allImages = ChainMap(self.objectImages, self.roomImages)
+        self.quizImages = ChainMap(self.objectImages, self.quizRoomImages)
+        if self.useAtlas:
+            self.createAtlases()
         self.createCombinations()
 
     # Creating all objects and storing them in appropriate dictionaries
     # The use of their names as keys makes them easy to retrieve
     def createObjects(self):
+        if self.streamImages:  # (the images are made when they are used)
+            self.objectImages = StreamedImages(self.textureManager,
+                                               {name: (self.pathToImages + name + ".png", self.objectSize)
+                                                for name in self.objectNames})
+            return
+
         for name in self.objectNames:
             image = visual.ImageStim(
                 win=self.window,
-                image=self.pathToImages + name + ".png",
+                image=self.imageCache.getImage(self.pathToImages + name + ".png", self.objectSize),
                 units="pix",
                 size=self.objectSize)
 
@@ -85,44 +112,136 @@ class Stimuli:
     # Creating all rooms and storing them in appropriate dictionaries
     # The use of their names as keys makes them easy to retrieve
     def createRooms(self):
+        if self.streamImages:  # (the images are made when they are used)
+            self.roomImages = StreamedImages(self.textureManager,
+                                             {name: (self.pathToImages + name + ".jpg", self.roomSize)
+                                              for name in self.roomNames})
+            self.quizRoomImages = StreamedImages(self.textureManager,
+                                                 {name: (self.pathToImages + name + ".jpg", self.objectSize)
+                                                  for name in self.roomNames})
+            return
+
         for name in self.roomNames:
             image = visual.ImageStim(
                 win=self.window,
-                image=self.pathToImages + name + ".jpg",
+                image=self.imageCache.getImage(self.pathToImages + name + ".jpg", self.roomSize),
                 units="pix",
                 size=self.roomSize)
 
             self.roomImages[name] = image
             self.allImages[name] = image
 
-    # Randomly creates the combinations for each object and its associated rooms
-    def createCombinations(self):
-        roomNamesSelect = self.roomNames.copy()  # copy to avoid messing up
-        roomNamesSelect = roomNamesSelect * 2  # need twice the rooms because each room has two objects
-
-        objectsNamesSelect = self.objectNames.copy()  # copy to avoid messing up
-        shuffle(objectsNamesSelect)
-
-        # For each room create a key for which there is an empty list
-        for room in self.roomNames:
-            self.combiObjectsOfTheRooms[room] = []
-
-        # For each object...
-        for object in objectsNamesSelect:
-            # ...randomly select a first room (and take that room out of the list) and...
-            room1 = popChoice(roomNamesSelect)
-            # ...randomly select a second room that cannot be the same as the first room.
-            room2 = choice(roomNamesSelect)
-            while room2 == room1:
-                room2 = choice(roomNamesSelect)
-            # take out the second room from the list
-            roomNamesSelect.pop(roomNamesSelect.index(room2))
-
-            # create the key of that object and put its two rooms in its list
-            self.combiRoomsOfTheObjects[object] = [room1, room2]
-            # append the object to each appropriate key of the object
-            self.combiObjectsOfTheRooms[room1].append(object)
-            self.combiObjectsOfTheRooms[room2].append(object)
+            self.quizRoomImages[name] = visual.ImageStim(
+                win=self.window,
+                image=self.imageCache.getImage(self.pathToImages + name + ".jpg", self.objectSize),
+                units="pix",
+                size=self.objectSize)
+
+    # Creating the atlases of the objects and rooms and the stimuli that draw them (the quiz still uses the images)
+    def createAtlases(self):
+        # (the position rectangles are in the atlas of the objects, as its background)
+        self.objectAtlas, self.roomAtlas = makeStimuliAtlases(objectNames=self.objectNames,
+                                                              roomNames=self.roomNames,
+                                                              objectSize=self.objectSize,
+                                                              roomSize=self.roomSize,
+                                                              objectBackground=self.positionRectColour,
+                                                              pathToImages=self.pathToImages,
+                                                              imageCache=self.imageCache)
+
+        # One element per object, the ones that are not shown on a screen are transparent
+        self.objectElements = visual.ElementArrayStim(
+            win=self.window,
+            units="pix",
+            fieldShape="sqr",
+            nElements=len(self.objectNames),
+            sizes=self.objectAtlas.cellSize,
+            xys=np.zeros((len(self.objectNames), 2)),
+            sfs=self.objectAtlas.cycles,  # (for the elements, the part of the texture they show)
+            elementTex=self.objectAtlas.getTexture(),
+            elementMask=None)
+
+        self.roomGrating = visual.GratingStim(
+            win=self.window,
+            units="pix",
+            size=self.roomAtlas.cellSize,
+            sf=1 / self.roomAtlas.atlasSize,  # (for a grating, the part of the texture it shows for each pixel)
+            tex=self.roomAtlas.getTexture(),
+            mask=None)
+
+    # This function starts reading the images of a trial in the background when they are streamed: the images of its
+    # objects and of the rooms these objects can lead to.
+    def prefetchImages(self, objects):
+        images = []
+        for object in objects:
+            images.append((self.objectImages, object))
+            images += [(self.roomImages, room) for room in self.combiRoomsOfTheObjects[object]]
+        self.prefetchStreamedImages(images)
+
+    # This function starts reading the images of a quiz question (names of objects and rooms) in the background when
+    # they are streamed.
+    def prefetchQuizImages(self, names):
+        self.prefetchStreamedImages([(self.objectImages if name in self.objectNames else self.quizRoomImages, name)
+                                     for name in names])
+
+    # This function starts reading images (pairs of a dictionary of images and a name) in the background when they are
+    # streamed, and pins them: they are not deleted until the images of the next trial or question are prefetched.
+    def prefetchStreamedImages(self, images):
+        if self.streamImages:
+            self.textureManager.unpinAll()  # (the previous trial or question is over)
+            for streamedImages, name in images:
+                streamedImages.prefetch(name)
+                streamedImages.pin(name)
+            self.prefetchedImages = images
+
+    # This function makes the textures of the images prefetched (it is called between the frames of the inter-trial
+    # interval, so that making them never delays a frame that shows a stimulus)
+    def makePrefetchedImages(self):
+        if self.streamImages:
+            self.textureManager.makePrefetchedTextures()
+
+    # This function gives whether the textures of the images prefetched are all made, so that the trial or question
+    # can be shown without waiting for the thread of the texture manager:
+    def areImagesReady(self):
+        return all(streamedImages.isReady(name) for streamedImages, name in self.prefetchedImages)
+
+    # This function draws objects (names) at positions (names of the positions of the screen), each on its position
+    # rectangle. It is called at every frame, so the stimuli are only changed when the objects or their positions are
+    # not the ones of the previous frame (changing them makes PsychoPy compute their vertices again).
+    def drawObjectImages(self, objects, positions):
+        if self.useAtlas:
+            if self.shownObjects != (list(objects), list(positions)):
+                self.shownObjects = (list(objects), list(positions))
+                xys = np.zeros((len(self.objectNames), 2))
+                phases = np.zeros((len(self.objectNames), 2))
+                opacities = np.zeros(len(self.objectNames))
+                for i, (object, position) in enumerate(zip(objects, positions)):
+                    xys[i] = self.window.screen[position]
+                    phases[i] = self.objectAtlas.phases[object]
+                    opacities[i] = 1
+                self.objectElements.xys = xys
+                self.objectElements.phases = phases
+                self.objectElements.opacities = opacities
+            self.objectElements.draw()
+        else:
+            for object, position in zip(objects, positions):
+                # select the image of the object, set its position, and set the positionRect to the same position
+                objectImage = self.objectImages[object]
+                if not np.array_equal(objectImage.pos, self.window.screen[position]):
+                    objectImage.pos = self.window.screen[position]
+                self.positionRect.pos = objectImage.pos
+                # draw the object and the positionRect
+                self.positionRect.draw()
+                objectImage.draw()
+
+    # This function draws a room (its name) in the centre of the screen
+    def drawRoom(self, room):
+        if self.useAtlas:
+            if self.shownRoom != room:
+                self.shownRoom = room
+                self.roomGrating.phase = self.roomAtlas.phases[room]
+            self.roomGrating.draw()
+        else:
+            self.roomImages[room].draw()
 
     # This function can be used to draw a container on both sides of the screen
     def drawContainers(self):
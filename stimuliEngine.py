@@ -0,0 +1,95 @@
+########################################################################################################################
+# This is the class that creates the names of the objects and rooms and their combinations, without any window or
+# images. The Stimuli class (stimuli.py) builds the images on top of it, but it can also be used on its own to run the
+# trials headless (see trialEngine.py and experimentEngine.py).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from popChoice import popChoice
+from randomStreams import RandomStreams, generatorChoice
+########################################
+
+
+########################################
+#             StimuliEngine            #
+########################################
+class StimuliEngine:
+    positionRectColour = [.5, .5, .5]  # a light grey (the colour behind the objects)
+
+    def __init__(self, randomStreams=None):
+        # The random streams of the session (see randomStreams.py), the combinations use their own stream
+        if randomStreams is None:
+            randomStreams = RandomStreams()
+        self.randomStreams = randomStreams
+
+        # the different objects (needs the be the same names as the images)
+        self.objectNames = ["key", "light", "phone", "stove"]
+        # the index of each object (e.g., in the object values of the agents)
+        self.objectIndices = {object: i for i, object in enumerate(self.objectNames)}
+
+        # the different rooms (needs the be the same names as the images)
+        self.roomNames = ["pink", "blue", "green", "brown"]
+        # the index of each room (e.g., in the rows of the random walk of the rooms' reward probabilities)
+        self.roomIndices = {room: i for i, room in enumerate(self.roomNames)}
+
+        # Preparing to record all the different combinations
+        self.combiRoomsOfTheObjects = {}  # each object will be a key for a list with its two rooms
+        self.combiObjectsOfTheRooms = {}  # each room will be a key for a list with its two objects
+
+    # This function gives the sizes of the objects and of the rooms (the sides of their squares, in pixels) for the
+    # height of the screen (ATLAS.py uses it too, to build the atlases at the sizes they are shown at)
+    @staticmethod
+    def getStimuliSizes(screenHeight):
+        objectSize = screenHeight * .25  # square of the quarter of the height
+        roomSize = screenHeight * .90  # Squares taking up most of the screen
+        return objectSize, roomSize
+
+    # This is the function that users use. Without images, there are only the combinations to create
+    def createStimuli(self):
+        self.createCombinations()
+
+    # Randomly creates the combinations for each object and its associated rooms
+    def createCombinations(self):
+        roomNamesSelect = self.roomNames.copy()  # copy to avoid messing up
+        roomNamesSelect = roomNamesSelect * 2  # need twice the rooms because each room has two objects
+
+        objectsNamesSelect = self.objectNames.copy()  # copy to avoid messing up
+        self.randomStreams.combinations.shuffle(objectsNamesSelect)
+
+        # For each room create a key for which there is an empty list
+        self.combiRoomsOfTheObjects = {}
+        for room in self.roomNames:
+            self.combiObjectsOfTheRooms[room] = []
+
+        # For each object...
+        for object in objectsNamesSelect:
+            # ...randomly select a first room (and take that room out of the list) and...
+            room1 = popChoice(roomNamesSelect, self.randomStreams.combinations)
+            # (if the only rooms left are this same room, the second room cannot be selected: start again)
+            if roomNamesSelect.count(room1) == len(roomNamesSelect):
+                self.createCombinations()
+                return
+            # ...randomly select a second room that cannot be the same as the first room.
+            room2 = generatorChoice(self.randomStreams.combinations, roomNamesSelect)
+            while room2 == room1:
+                room2 = generatorChoice(self.randomStreams.combinations, roomNamesSelect)
+            # take out the second room from the list
+            roomNamesSelect.pop(roomNamesSelect.index(room2))
+
+            # create the key of that object and put its two rooms in its list
+            self.combiRoomsOfTheObjects[object] = [room1, room2]
+            # append the object to each appropriate key of the object
+            self.combiObjectsOfTheRooms[room1].append(object)
+            self.combiObjectsOfTheRooms[room2].append(object)
+
+        # No object can have the same two rooms as another object (and so no room can have the same two objects as
+        # another room), otherwise the uncertainty comparisons cannot be made: start again.
+        roomPairs = [sorted(rooms) for rooms in self.combiRoomsOfTheObjects.values()]
+        for i in range(len(roomPairs)):
+            if roomPairs[i] in roomPairs[i + 1:]:
+                self.createCombinations()
+                return
+
+########################################################################################################################
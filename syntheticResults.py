@@ -0,0 +1,274 @@
+########################################################################################################################
+# These functions generate synthetic results, in the layout of allResults.csv, for many participants at once and
+# without running any session (e.g., to test how the storage and the analyses cope with much more data).
+# The trials have the structure of the real ones (see ExperimentEngine and TripletEngine): the phases, blocks and
+# shuffled trials of the experiment set up, the standard pairs, the two uncertainty comparisons (pairs sharing a room,
+# with the top and bottom objects sharing a room across sides), the ghost selection and its rooms (the common room then
+# the room unique to the ghost-selected object), the post trials of each type, the random walk of each participant and
+# the treasures drawn from it. The responses are random, with response times drawn from an ex-Gaussian; in the
+# experimental trials the responses slower than 2 seconds are missed (NA), as they are in the experiment.
+# Everything is computed with arrays of participants x trials (there is only a loop over the blocks).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from math import ceil
+import numpy as np
+import pandas as pd
+from gaussianIncrement import gaussianRandomWalk
+from randomStreams import RandomStreams
+from resultsTable import ResultsTable
+from stimuliEngine import StimuliEngine
+########################################
+
+# The objects and rooms are numbered 0 to 3 so that object i is in rooms i and i + 1 (modulo 4), and room i has the
+# objects i - 1 and i. Each participant has their own names for these numbers (a random permutation).
+standardPairs = np.array(list(combinations(range(4), 2)))
+postTypes = ["repeat", "switch", "clash"]
+
+# The demographics of the synthetic participants (see experimentGUI.generateDemographics):
+demographicsColumns = ["age", "gender", "education", "student", "fieldOfStudy", "timeToCompleteDemographics"]
+genders = ["female", "male", "other"]
+fieldsOfStudy = ["psychology", "neuroscience", "medicine", "economics", "computer science"]
+
+
+########################################
+#             counterpart              #
+########################################
+# In an uncertainty comparison, the horizontal counterpart of an object is the object of the other pair it shares a
+# room with (its neighbour that is not the other object of its pair):
+def counterpart(objects, pairMates):
+    return np.where(pairMates == (objects - 1) % 4, (objects + 1) % 4, (objects - 1) % 4)
+
+
+########################################
+#         makeTrialStructure           #
+########################################
+# This function gives the rows of the participants (the same number for each of them) in the order they are run: the
+# phase and block of each row, its position in its triplet (-1 for the standard trials), the index of its trial (or
+# triplet) in the order it was created (which sets the standard pair, comparison and post type, as in createTrials),
+# and the increment of the random walk it uses.
+def makeTrialStructure(experimentSetUp, nbParticipants, generator):
+    structure = {"phaseType": [], "isPractice": [], "blockNb": [], "position": [], "element": [], "increment": []}
+    nbIncrements = 0
+    for phase in experimentSetUp:
+        nbTrials = experimentSetUp[phase]["trials"]
+        for block in range(experimentSetUp[phase]["blocks"]):
+            if "standard" in phase:
+                order = np.argsort(generator.random((nbParticipants, nbTrials)), axis=1)  # the shuffled trials
+                position = np.full(nbTrials, -1)
+                increment = nbIncrements + order + 1
+                nbIncrements += nbTrials
+            else:  # triplets keep the order of their three trials
+                nbTriplets = ceil(nbTrials / len(postTypes))
+                order = np.repeat(np.argsort(generator.random((nbParticipants, nbTriplets)), axis=1), 3, axis=1)
+                position = np.tile([0, 1, 2], nbTriplets)
+                increment = nbIncrements + order * 3 + position + 1
+                nbIncrements += nbTriplets * 3
+
+            structure["phaseType"].append(np.full(len(position), int("standard" not in phase)))
+            structure["isPractice"].append(np.full(len(position), int("Practice" in phase)))
+            structure["blockNb"].append(np.full(len(position), block + 1))
+            structure["position"].append(position)
+            structure["element"].append(order)
+            structure["increment"].append(increment)
+
+    for key in ["phaseType", "isPractice", "blockNb", "position"]:
+        structure[key] = np.concatenate(structure[key])
+    for key in ["element", "increment"]:
+        structure[key] = np.concatenate(structure[key], axis=1)
+    structure["nbIncrements"] = nbIncrements
+    return structure
+
+
+########################################
+#       generateSyntheticResults       #
+########################################
+# This function generates the results of nbParticipants participants (with the IDs from firstID) as a dataframe with
+# the columns of allResults.csv. All the random values come from the streams of randomStreams.
+def generateSyntheticResults(experimentSetUp, nbParticipants, randomStreams, firstID=1):
+    stimuli = StimuliEngine()
+    nbParticipantsRange = np.arange(nbParticipants)[:, None]
+    structure = makeTrialStructure(experimentSetUp, nbParticipants, randomStreams.schedule)
+    element = structure["element"]
+    shape = element.shape
+    nbRows = shape[1]
+    isPractice = structure["isPractice"].astype(bool)
+    isUncertain = structure["position"] == 1
+    isPost = structure["position"] == 2
+
+    # The names of the objects and rooms of each participant:
+    objectNames = np.argsort(randomStreams.combinations.random((nbParticipants, 4)), axis=1)
+    roomNames = np.argsort(randomStreams.combinations.random((nbParticipants, 4)), axis=1)
+
+    # Standard trials (and the standard trials of the triplets): the pair, randomly left or right
+    layout = randomStreams.layout
+    swapSides = layout.random(shape) < 0.5
+    pairs = standardPairs[element % len(standardPairs)]
+    standardLeft = np.where(swapSides, pairs[..., 1], pairs[..., 0])
+    standardRight = np.where(swapSides, pairs[..., 0], pairs[..., 1])
+
+    # Uncertain trials: the comparison is between the pairs of rooms 1 and 3 or of rooms 2 and 0 (every other triplet)
+    comparison = element % 2
+    leftIsFirst = layout.random(shape) < 0.5
+    leftRoom = np.where(leftIsFirst, 1 + comparison, (3 + comparison) % 4)
+    rightRoom = np.where(leftIsFirst, (3 + comparison) % 4, 1 + comparison)
+    topIsFirst = layout.random(shape) < 0.5
+    topLeft = np.where(topIsFirst, (leftRoom - 1) % 4, leftRoom)
+    bottomLeft = np.where(topIsFirst, leftRoom, (leftRoom - 1) % 4)
+    topRight = counterpart(topLeft, bottomLeft)
+    bottomRight = counterpart(bottomLeft, topLeft)
+
+    # The responses: random sides, ex-Gaussian response times, missed when too slow (only in the experimental trials)
+    responses = randomStreams.responses
+    respondsLeft = responses.random(shape) < 0.5
+    responseTimes = np.maximum(responses.normal(0.55, 0.10, shape) + responses.exponential(0.25, shape), 0.15)
+    isMissed = ~isPractice & (responseTimes >= 2.000)
+
+    # The ghost selection of the uncertain trials and their rooms (the common room, then the one unique to the
+    # ghost-selected object):
+    chosenRoom = np.where(respondsLeft, leftRoom, rightRoom)
+    ghostIsFirst = layout.random(shape) < 0.5
+    ghostSelected = np.where(ghostIsFirst, (chosenRoom - 1) % 4, chosenRoom)
+    ghostRejected = np.where(ghostIsFirst, chosenRoom, (chosenRoom - 1) % 4)
+    uniqueRoom = np.where(ghostSelected == chosenRoom, (chosenRoom + 1) % 4, ghostSelected)
+
+    # Post trials: their objects come from the uncertain trial just before them (the row before)
+    def previous(values):
+        return np.concatenate([values[:, :1], values[:, :-1]], axis=1)
+    postType = element % len(postTypes)
+    previousSelected = previous(ghostSelected)
+    previousRejected = previous(ghostRejected)
+    isSkipped = isPost & previous(isMissed)  # the uncertain trial was missed, so the post trial was not run
+    postFirst = np.where(postType == 1, previousRejected, previousSelected)
+    postSecond = np.where(postType == 0, counterpart(previousSelected, previousRejected),
+                          np.where(postType == 1, counterpart(previousRejected, previousSelected), previousRejected))
+    leftObject = np.where(isPost, np.where(swapSides, postSecond, postFirst), standardLeft)
+    rightObject = np.where(isPost, np.where(swapSides, postFirst, postSecond), standardRight)
+
+    # The rooms of the standard and post trials are the two rooms of the chosen object, in a random order
+    chosenObject = np.where(respondsLeft, leftObject, rightObject)
+    roomsSwap = layout.random(shape) < 0.5
+    room1 = np.where(isUncertain, chosenRoom, np.where(roomsSwap, (chosenObject + 1) % 4, chosenObject))
+    room2 = np.where(isUncertain, uniqueRoom, np.where(roomsSwap, chosenObject, (chosenObject + 1) % 4))
+
+    # The random walk of each participant (starting from different probabilities for each room) and the treasures
+    startingProbabilities = np.round(np.arange(0.25, 0.75, 0.05), 2)[
+        np.argsort(randomStreams.walk.random((nbParticipants, 10)), axis=1)[:, :4]]
+    walk = gaussianRandomWalk(startingProbabilities, structure["nbIncrements"], mu=0, sigma=0.025,
+                              generator=randomStreams.walk)
+    rewardProbability1 = walk[structure["increment"], nbParticipantsRange, room1]
+    rewardProbability2 = walk[structure["increment"], nbParticipantsRange, room2]
+    isTreasure1 = randomStreams.outcomes.random(shape) < rewardProbability1
+    isTreasure2 = randomStreams.outcomes.random(shape) < rewardProbability2
+
+    ###########################
+    # Making the results' rows #
+    ###########################
+    # The names (codes of categoricals) of each participant's objects and rooms, and the codes of the NA:
+    def names(canonical, participantNames):
+        return np.take_along_axis(participantNames, canonical, axis=1)
+    hasNoResponse = isMissed | isSkipped
+    objectCategories = stimuli.objectNames + [first + second for first in stimuli.objectNames
+                                              for second in stimuli.objectNames]
+    uncertainLeft = 4 + names(topLeft, objectNames) * 4 + names(bottomLeft, objectNames)
+    uncertainRight = 4 + names(topRight, objectNames) * 4 + names(bottomRight, objectNames)
+    leftCodes = np.where(isSkipped, -1, np.where(isUncertain, uncertainLeft, names(leftObject, objectNames)))
+    rightCodes = np.where(isSkipped, -1, np.where(isUncertain, uncertainRight, names(rightObject, objectNames)))
+
+    def flat(values):
+        return values.reshape(-1)
+
+    def categorical(codes, categories):
+        return pd.Categorical.from_codes(flat(codes), categories=categories)
+
+    def tiled(values):
+        return np.tile(values, nbParticipants)
+
+    results = {"id": np.repeat(np.arange(firstID, firstID + nbParticipants), nbRows)}
+
+    # Demographics and quiz attempts (the same on each row of a participant):
+    demographicsGenerator = randomStreams.quiz
+    isStudent = demographicsGenerator.random(nbParticipants) < 0.6
+    demographics = {
+        "age": (18 + np.minimum(demographicsGenerator.gamma(2, 4, nbParticipants), 50)).astype(int).astype(str),
+        "gender": np.array(genders)[demographicsGenerator.choice(3, nbParticipants, p=[0.55, 0.43, 0.02])],
+        "education": demographicsGenerator.integers(1, 6, nbParticipants).astype(str),
+        "student": np.where(isStudent, "yes", "no"),
+        "fieldOfStudy": np.where(isStudent,
+                                 np.array(fieldsOfStudy)[demographicsGenerator.integers(0, len(fieldsOfStudy),
+                                                                                       nbParticipants)],
+                                 "NA"),
+        "timeToCompleteDemographics": demographicsGenerator.lognormal(np.log(45), 0.4, nbParticipants).astype(str),
+        "quizAttempts": demographicsGenerator.geometric(0.6, nbParticipants).astype(str)}
+    for column, values in demographics.items():
+        results[column] = np.repeat(values, nbRows)
+
+    trialTypes = np.where(isUncertain, 1, np.where(isPost, 2, 0))
+    results.update({
+        "phaseType": pd.Categorical.from_codes(tiled(structure["phaseType"]), categories=["standard", "triplet"]),
+        "isPractice": tiled(structure["isPractice"]),
+        "blockNb": tiled(structure["blockNb"]),
+        "trialNb": tiled(np.arange(1, nbRows + 1)),
+        "trialType": pd.Categorical.from_codes(tiled(trialTypes), categories=["standard", "uncertain", "post"]),
+        "postType": categorical(np.where(isPost, postType, -1), postTypes),
+        "leftObjects": categorical(leftCodes, objectCategories),
+        "rightObjects": categorical(rightCodes, objectCategories),
+        "responseSide": categorical(np.where(hasNoResponse, -1, np.where(respondsLeft, 0, 1)), ["left", "right"]),
+        "responseTime": flat(np.where(hasNoResponse, np.nan, responseTimes)),
+        "ghostSelected": categorical(np.where(isUncertain & ~hasNoResponse, names(ghostSelected, objectNames), -1),
+                                     stimuli.objectNames),
+        "ghostRejected": categorical(np.where(isUncertain & ~hasNoResponse, names(ghostRejected, objectNames), -1),
+                                     stimuli.objectNames)})
+    for roomNb, room, rewardProbability, isTreasure in [("1", room1, rewardProbability1, isTreasure1),
+                                                        ("2", room2, rewardProbability2, isTreasure2)]:
+        results["room" + roomNb] = categorical(np.where(hasNoResponse, -1, names(room, roomNames)), stimuli.roomNames)
+        results["rewardProbability" + roomNb] = flat(np.where(hasNoResponse, np.nan, rewardProbability))
+        results["isTreasure" + roomNb] = pd.arrays.IntegerArray(flat(isTreasure).astype(np.int32),
+                                                                flat(hasNoResponse))
+
+    return pd.DataFrame(results, columns=["id"] + demographicsColumns + ["quizAttempts"] + list(ResultsTable.columns))
+
+
+########################################
+#          makeSyntheticBatch          #
+########################################
+# This function gives the synthetic results of a batch of participants as CSV text (it is run in the processes of the
+# pool). It is given the seed and spawn key of the batch's random streams, so a batch always gives the same results.
+def makeSyntheticBatch(experimentSetUp, nbParticipants, seed, spawnKey, firstID, header):
+    results = generateSyntheticResults(experimentSetUp, nbParticipants, RandomStreams(seed=seed, spawnKey=spawnKey),
+                                       firstID=firstID)
+    return results.to_csv(index=False, header=header, na_rep="NA", lineterminator="\n")
+
+
+########################################
+#        writeSyntheticResults         #
+########################################
+# This function writes the synthetic results of nbParticipants participants in a CSV with the layout of allResults.csv
+# (without a line break at the end, as ResultsRecorder writes it). The participants are generated in batches of
+# batchSize, in parallel, and each batch has its own random streams (spawned from the seed), so the results of a seed
+# are the same whatever the number of processes. Writing the CSV text takes most of the time, so it is also done in the
+# processes; the batches are written in order as they come.
+def writeSyntheticResults(fileName, experimentSetUp, nbParticipants, seed=None, batchSize=200, nbProcesses=None):
+    generatorStreams = RandomStreams(seed=seed)
+    nbBatches = ceil(nbParticipants / batchSize)
+    batchesStreams = generatorStreams.spawn(nbBatches)
+
+    with ProcessPoolExecutor(max_workers=nbProcesses) as executor, open(fileName, "w") as resultsFile:
+        batches = executor.map(makeSyntheticBatch,
+                               [experimentSetUp] * nbBatches,
+                               [min(batchSize, nbParticipants - batch * batchSize) for batch in range(nbBatches)],
+                               [streams.seed for streams in batchesStreams],
+                               [streams.spawnKey for streams in batchesStreams],
+                               [batch * batchSize + 1 for batch in range(nbBatches)],
+                               [batch == 0 for batch in range(nbBatches)])
+        for batch, resultsText in enumerate(batches):
+            if batch > 0:
+                resultsFile.write("\n")
+            resultsFile.write(resultsText[:-1])
+    return generatorStreams
+
+########################################################################################################################
@@ -0,0 +1,48 @@
+########################################################################################################################
+# These are the tests of the simulation of cohorts (SIMULATE.py): the participants are simulated on the processes of a
+# pool, each with its own random streams, and recorded like real participants.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import listdir, path
+from SIMULATE import simulateCohort
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 1, "trials": 6}}
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The same seed gives the same cohort (whatever the number of processes), and each participant has their own session:
+def testCohortIsReplayed():
+    cohort = simulateCohort(experimentSetUp, "random", 4, "test", seed=1, nbProcesses=2, recordResults=False)
+    sameCohort = simulateCohort(experimentSetUp, "random", 4, "test", seed=1, nbProcesses=1, recordResults=False)
+    results = [participant["experimentResults"].toCSV() for participant in cohort]
+    assert results == [participant["experimentResults"].toCSV() for participant in sameCohort]
+    assert len(set(results)) == 4
+
+
+# Each simulated participant gets a directory of results, one after the other (run in a temporary directory, as the
+# results are written in results/):
+def testCohortIsRecorded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simulateCohort(experimentSetUp, "random", 3, "test", seed=2, nbProcesses=2)
+    experimentDirectory = path.join("results", "test")
+    assert sorted(fileName for fileName in listdir(experimentDirectory) if fileName.isdigit()) == ["1", "2", "3"]
+    assert path.exists(path.join(experimentDirectory, "2", "2_experimentResults.csv"))
+    assert path.exists(path.join(experimentDirectory, "2", "2_seed.csv"))
+    allResultsFile = open(path.join(experimentDirectory, "allResults.csv"))
+    assert len(allResultsFile.read().strip().split("\n")) == 1 + 3 * (6 + 6)
+    allResultsFile.close()
+
+########################################################################################################################
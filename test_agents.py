@@ -0,0 +1,114 @@
+########################################################################################################################
+# These are the tests of the agents (agents.py): the agent specs, and the agents answering (and learning from) the
+# trials of a headless session.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from randomStreams import RandomStreams
+from stimuliEngine import StimuliEngine
+from experimentEngine import ExperimentEngine
+from agents import Agent, RandomAgent, ModelFreeLearningAgent, parseAgentSpec, createAgent
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 1, "trials": 12}}
+
+
+# This agent answers like the random agent and keeps what it is given to learn from:
+class RecordingAgent(Agent):
+    def __init__(self, generator, **parameters):
+        Agent.__init__(self, generator, **parameters)
+        self.learnt = []
+
+    def learn(self, trial, currentTrialType, responseObjects, roomsToBeShown, isTreasures):
+        self.learnt.append((currentTrialType, responseObjects, list(roomsToBeShown), isTreasures))
+
+
+# This function runs a headless session answered by an agent and gives the session's experiment:
+def runSession(agent, randomStreams):
+    stimuli = StimuliEngine(randomStreams=randomStreams)
+    stimuli.createStimuli()
+    experiment = ExperimentEngine(stimuliClass=stimuli, experimentalSetUp=experimentSetUp, responder=agent,
+                                  randomStreams=randomStreams)
+    experiment.launchExperiment()
+    return experiment
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# An agent spec gives the name of the agent and its parameters as numbers:
+def testParseAgentSpec():
+    assert parseAgentSpec("random") == ("random", {})
+    assert parseAgentSpec("random:") == ("random", {})
+    assert parseAgentSpec("modelFree:alpha=0.3, beta=5") == ("modelFree", {"alpha": .3, "beta": 5})
+    assert parseAgentSpec("retrospective:weight=1") == ("retrospective", {"weight": 1})
+
+
+# The spec is checked before anything is simulated: the agent, its parameters, and their values must exist:
+@pytest.mark.parametrize("agentSpec, message", [("randm", "Unknown agent 'randm'"),
+                                                ("random:alpha=0.3", "Unknown parameter 'alpha'"),
+                                                ("random:alpha", "has no value"),
+                                                ("random:alpha=", "Unknown parameter 'alpha'"),
+                                                ("modelFree:alpah=0.3", "the parameters are: alpha, beta"),
+                                                ("modelFree:alpha=0.3,beta", "'beta' of agent 'modelFree' has no"),
+                                                ("modelBased:beta=high", "is not a number: 'high'")])
+def testParseAgentSpecErrors(agentSpec, message):
+    with pytest.raises(ValueError, match=message):
+        parseAgentSpec(agentSpec)
+
+
+# The agent of a spec answers with the responses stream of the session, so the same seed gives the same responses:
+def testCreateAgent():
+    agent = createAgent("random", RandomStreams(seed=1))
+    sameAgent = createAgent("random", RandomStreams(seed=1))
+    assert isinstance(agent, RandomAgent)
+    responses = [agent(None, "standard", {"left": "key", "right": "phone"}) for _ in range(20)]
+    assert responses == [sameAgent(None, "standard", {"left": "key", "right": "phone"}) for _ in range(20)]
+    assert {side for side, responseTime in responses} == {"left", "right"}
+    assert all(0.300 <= responseTime <= 1.500 for side, responseTime in responses)
+
+
+# An agent answers every trial of a session and learns from the two rooms visited after each of its responses:
+def testAgentLearnsFromEveryTrial():
+    randomStreams = RandomStreams(seed=2)
+    agent = RecordingAgent(generator=randomStreams.responses)
+    experiment = runSession(agent, randomStreams)
+    assert len(agent.learnt) == 6 + 12
+    for currentTrialType, responseObjects, roomsToBeShown, isTreasures in agent.learnt:
+        assert len(roomsToBeShown) == 2 and len(isTreasures) == 2
+        if currentTrialType == "uncertain":
+            assert len(responseObjects) == 2  # the pair chosen
+        else:
+            assert sorted(roomsToBeShown) == sorted(experiment.stimuliClass.combiRoomsOfTheObjects[responseObjects])
+
+
+# A learning agent answers with its population agent (made at the first trial), which learns from every trial: with a
+# high temperature, a model-free agent ends up choosing the object that has yielded the most treasures.
+def testLearningAgent():
+    randomStreams = RandomStreams(seed=3)
+    agent = createAgent("modelFree:alpha=0.5,beta=20", randomStreams)
+    assert isinstance(agent, ModelFreeLearningAgent)
+    experiment = runSession(agent, randomStreams)
+    assert agent.populationAgent.nbAgents == 1
+    assert agent.populationAgent.objectValues.any()
+
+    objectValues = agent.populationAgent.objectValues[0]
+    objects = experiment.stimuliClass.objectNames
+    bestObject, worstObject = objects[np.argmax(objectValues)], objects[np.argmin(objectValues)]
+    trial = SimpleNamespace(stimuliClass=experiment.stimuliClass)
+    trialObjects = {"left": worstObject, "right": bestObject}
+    assert [agent(trial, "standard", trialObjects)[0] for _ in range(10)].count("right") >= 9
+
+########################################################################################################################
@@ -0,0 +1,84 @@
+########################################################################################################################
+# These are the tests of the credit assignment effects (creditAssignment.py): the stay probabilities of the post trials
+# are computed on whole chunks, and must be the same as going through the trials one by one, wherever the chunks end.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import path
+import numpy as np
+import pandas as pd
+from SIMULATE import simulateCohort
+from resultsLoader import ResultsLoader
+from creditAssignment import getStayProbabilities, getRewardEffects
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 2, "trials": 24}}
+
+
+# This function counts the stays of the post trials of allResults.csv one trial after the other (by participant, post
+# type, and reward of the common and unique rooms of the uncertain trial before them):
+def countStaysOneByOne(allResultsFileName):
+    results = pd.read_csv(allResultsFileName, dtype=str, keep_default_na=False)
+    stayCounts = {}
+    previousTrial = None
+    for trial in results.itertuples():
+        if trial.trialType == "post" and trial.isPractice == "0" and previousTrial is not None \
+                and previousTrial.trialType == "uncertain" and previousTrial.id == trial.id \
+                and trial.responseSide != "NA" and previousTrial.responseSide != "NA":
+            chosenObject = trial.leftObjects if trial.responseSide == "left" else trial.rightObjects
+            stayObject = previousTrial.ghostRejected if trial.postType == "switch" else previousTrial.ghostSelected
+            key = (int(trial.id), trial.postType, int(previousTrial.isTreasure1), int(previousTrial.isTreasure2))
+            nbStays, nbTrials = stayCounts.get(key, (0, 0))
+            stayCounts[key] = (nbStays + (chosenObject == stayObject), nbTrials + 1)
+        previousTrial = trial
+    return stayCounts
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The stay probabilities are the ones counted trial by trial, also when the chunks end between an uncertain trial and
+# its post trial:
+def testStayProbabilities(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simulateCohort(experimentSetUp, "retrospective:alpha=0.5,beta=5", 4, "test", seed=1, nbProcesses=1)
+    stayCounts = countStaysOneByOne(path.join("results", "test", "allResults.csv"))
+    assert len(stayCounts) > 4
+
+    for chunkSize in [100000, 7]:
+        stayProbabilities = getStayProbabilities(ResultsLoader(chunkSize=chunkSize))
+        assert len(stayProbabilities) == len(stayCounts)
+        for row in stayProbabilities.itertuples():
+            nbStays, nbTrials = stayCounts[(row.id, row.postType, row.commonReward, row.uniqueReward)]
+            assert row.experimentID == "test"
+            assert row.nbTrials == nbTrials and row.stayProbability == nbStays / nbTrials
+
+
+# The effect of the reward of a room is the stay probability when it was rewarded minus when it was not:
+def testRewardEffects():
+    stayProbabilities = pd.DataFrame({"experimentID": "test", "id": 1, "postType": "clash",
+                                      "commonReward": [0, 0, 1, 1], "uniqueReward": [0, 1, 0, 1],
+                                      "nbTrials": 10, "stayProbability": [.2, .6, .4, .9]})
+    effects = getRewardEffects(stayProbabilities)
+    assert len(effects) == 1
+    assert np.isclose(effects["commonEffect"].iloc[0], (.4 + .9) / 2 - (.2 + .6) / 2)
+    assert np.isclose(effects["uniqueEffect"].iloc[0], (.6 + .9) / 2 - (.2 + .4) / 2)
+    assert np.isclose(effects["interaction"].iloc[0], (.9 - .4) - (.6 - .2))
+
+
+# Without any triplet, there are no stay probabilities:
+def testNoPostTrials(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simulateCohort({"standardPractice": {"blocks": 1, "trials": 6}}, "random", 2, "test", seed=2, nbProcesses=1)
+    assert len(getStayProbabilities(ResultsLoader())) == 0
+
+########################################################################################################################
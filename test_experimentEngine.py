@@ -0,0 +1,145 @@
+########################################################################################################################
+# These are the tests of the headless experiment (experimentEngine.py, trialEngine.py and stimuliEngine.py): the trials
+# are run without any window, answered by a responder, and their results are checked against the rules of the task.
+# Run them with: python -m pytest
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from io import StringIO
+import numpy as np
+import pandas as pd
+from randomStreams import RandomStreams
+from stimuliEngine import StimuliEngine
+from experimentEngine import ExperimentEngine
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+# A small experiment: a practice block of standard trials and two blocks of triplets
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 2, "trials": 6}}
+
+
+# This function runs a whole headless session with a responder and gives its stimuli and its results as a dataframe:
+def runSession(responder=None):
+    stimuli, experiment, results = runExperiment(responder)
+    return stimuli, results
+
+
+# This function runs a whole headless session and gives its stimuli, its experiment and its results as a dataframe:
+def runExperiment(responder=None, seed=None):
+    stimuli = StimuliEngine(randomStreams=RandomStreams(seed=seed))
+    stimuli.createStimuli()
+    if responder is None:
+        experiment = ExperimentEngine(stimuliClass=stimuli, experimentalSetUp=experimentSetUp)
+    else:
+        experiment = ExperimentEngine(stimuliClass=stimuli, experimentalSetUp=experimentSetUp, responder=responder)
+    experiment.launchExperiment()
+    return stimuli, experiment, pd.read_csv(StringIO(experiment.results.toCSV()), keep_default_na=False,
+                                            float_precision="round_trip")
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# Each object opens two different rooms, each room is opened by two objects, and no two objects open the same rooms:
+def testCombinations():
+    for _ in range(50):
+        stimuli = StimuliEngine()
+        stimuli.createStimuli()
+        roomPairs = [tuple(sorted(rooms)) for rooms in stimuli.combiRoomsOfTheObjects.values()]
+        assert sorted(stimuli.combiRoomsOfTheObjects) == sorted(stimuli.objectNames)
+        assert all(room1 != room2 for room1, room2 in roomPairs)
+        assert len(set(roomPairs)) == len(roomPairs)
+        for room, objects in stimuli.combiObjectsOfTheRooms.items():
+            assert len(objects) == 2
+            assert all(room in stimuli.combiRoomsOfTheObjects[object] for object in objects)
+
+
+# A session has one line per trial, numbered in order, with the triplets in their standard/uncertain/post order:
+def testSessionTrials():
+    stimuli, results = runSession()
+    assert len(results) == 6 + 2 * 6
+    assert list(results["trialNb"]) == list(range(1, len(results) + 1))
+    assert list(results["phaseType"]) == ["standard"] * 6 + ["triplet"] * 12
+    assert list(results["trialType"][6:]) == ["standard", "uncertain", "post"] * 4
+    assert list(results["isPractice"]) == [1] * 6 + [0] * 12
+    assert set(results.loc[results["trialType"] == "post", "postType"]) <= {"repeat", "switch", "clash"}
+    assert set(results.loc[results["trialType"] != "post", "postType"]) == {"NA"}
+
+
+# After a standard or post trial, the rooms shown are the two rooms of the object chosen; after an uncertain trial,
+# the first room is the room common to the chosen pair and the second one is the room of the ghost-selected object:
+def testRoomsOfTheResponses():
+    stimuli, results = runSession()
+    for trial in results.itertuples():
+        if trial.trialType == "uncertain":
+            chosenPair = trial.leftObjects if trial.responseSide == "left" else trial.rightObjects
+            assert trial.ghostSelected in chosenPair and trial.ghostRejected in chosenPair
+            assert trial.room1 in stimuli.combiRoomsOfTheObjects[trial.ghostSelected]
+            assert trial.room1 in stimuli.combiRoomsOfTheObjects[trial.ghostRejected]
+            assert trial.room2 in stimuli.combiRoomsOfTheObjects[trial.ghostSelected]
+            assert trial.room2 not in stimuli.combiRoomsOfTheObjects[trial.ghostRejected]
+        else:
+            chosenObject = trial.leftObjects if trial.responseSide == "left" else trial.rightObjects
+            assert sorted([trial.room1, trial.room2]) == sorted(stimuli.combiRoomsOfTheObjects[chosenObject])
+        assert trial.isTreasure1 in (0, 1) and trial.isTreasure2 in (0, 1)
+        assert 0 <= float(trial.rewardProbability1) <= 1 and 0 <= float(trial.rewardProbability2) <= 1
+
+
+# Without responses, the trials are recorded with NA, and a triplet stops at its uncertain trial (its post trial is
+# recorded, as it cannot be made):
+def testMissedResponses():
+    stimuli, results = runSession(responder=lambda trial, currentTrialType, trialObjects: None)
+    assert len(results) == 6 + 2 * 6
+    assert set(results["responseSide"]) == {"NA"}
+    assert set(results["room1"]) == {"NA"}
+
+
+# The treasure outcomes are drawn up front, with one row per increment of the random walk: each room visited yields a
+# treasure as drawn in the row of the probability it was visited with.
+def testTreasureOutcomes():
+    stimuli, experiment, results = runExperiment(seed=4)
+    assert experiment.treasureOutcomes.shape == experiment.walk.shape
+    for trial in results.itertuples():
+        for room, probability, isTreasure in [(trial.room1, trial.rewardProbability1, trial.isTreasure1),
+                                              (trial.room2, trial.rewardProbability2, trial.isTreasure2)]:
+            roomIndex = stimuli.roomIndices[room]
+            row = np.flatnonzero(experiment.walk[:, roomIndex] == float(probability))[0]
+            assert isTreasure == int(experiment.treasureOutcomes[row, roomIndex])
+
+
+# Over many sessions, the rooms yield a treasure as often as their reward probabilities say:
+def testTreasureRate():
+    stimuli = StimuliEngine()
+    stimuli.createStimuli()
+    walks = []
+    outcomes = []
+    for seed in range(20):
+        experiment = ExperimentEngine(stimuliClass=stimuli, experimentalSetUp=experimentSetUp,
+                                      randomStreams=RandomStreams(seed=seed))
+        walks.append(experiment.walk[1:])
+        outcomes.append(experiment.treasureOutcomes[1:])
+    walks = np.concatenate(walks)
+    outcomes = np.concatenate(outcomes)
+    assert abs(outcomes.mean() - walks.mean()) < 3 * np.sqrt(walks.mean() * (1 - walks.mean()) / walks.size)
+
+
+# A session is replayed exactly from its seed (the combinations, the trials, the walk, the treasures and the random
+# responses), and another seed gives another session:
+def testReplaySession():
+    stimuli, experiment, results = runExperiment(seed=5)
+    sameStimuli, sameExperiment, sameResults = runExperiment(seed=5)
+    otherStimuli, otherExperiment, otherResults = runExperiment(seed=6)
+    assert sameStimuli.combiRoomsOfTheObjects == stimuli.combiRoomsOfTheObjects
+    assert np.array_equal(sameExperiment.walk, experiment.walk)
+    assert sameResults.equals(results)
+    assert not otherResults.equals(results)
+
+########################################################################################################################
@@ -0,0 +1,141 @@
+########################################################################################################################
+# These are the tests of the timeline of the trials (frameTimeline.py): each epoch is shown for the number of frames
+# closest to its duration, its actual duration and overshoot come from the times of the flips, and with recordFrames
+# the time of every frame is kept and written with the results.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import listdir, path
+import pandas as pd
+import pytest
+pytest.importorskip("psychopy")
+from frameTimeline import FrameTimeline
+from SIMULATE import simulateParticipant
+from randomStreams import RandomStreams
+from recordingResults import ResultsRecorder
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+# A window whose frames last 10 ms, except the frames after the flips of droppedFlips (the numbers of the flips, from
+# 0), which last two frames (a dropped frame). It records what was drawn before each flip.
+class RecordedWindow:
+    def __init__(self, droppedFlips=()):
+        self.frameDuration = .010
+        self.monitorFramePeriod = 1 / 60
+        self.droppedFlips = droppedFlips
+        self.time = 0
+        self.nbFlips = 0
+        self.drawnFrames = []
+        self.onFlip = []
+
+    def draw(self, name):
+        self.drawnFrames.append(name)
+
+    def callOnFlip(self, function):
+        self.onFlip.append(function)
+
+    def flip(self):
+        flipTime = self.time
+        self.time += self.frameDuration * (2 if self.nbFlips in self.droppedFlips else 1)
+        self.nbFlips += 1
+        for function in self.onFlip:
+            function()
+        self.onFlip = []
+        return flipTime
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# Each epoch is shown for the number of frames closest to its duration (at least one), drawn at every frame, and onStart
+# is called at its first flip:
+def testNbFrames():
+    window = RecordedWindow()
+    timeline = FrameTimeline(window)
+    startedAt = []
+    assert timeline.runEpoch("interval", .7049, drawFrame=lambda: window.draw("blank")) == 70
+    assert timeline.runEpoch("beep", .001, onStart=lambda: startedAt.append(window.nbFlips)) == 1
+    assert window.drawnFrames == ["blank"] * 70 and startedAt == [71]
+    assert timeline.getNbFrames(.3) == 30 and FrameTimeline(RecordedWindow()).frameDuration == .010
+
+
+# An epoch ends early when isOver gives True (checked after each flip), and goes on until then without a duration:
+def testIsOver():
+    window = RecordedWindow()
+    timeline = FrameTimeline(window)
+    assert timeline.runEpoch("choice", 2.000, isOver=lambda: window.nbFlips == 5) == 5
+    assert timeline.runEpoch("loading", None, isOver=lambda: window.nbFlips == 300) == 295
+
+
+# The duration of an epoch goes from its first flip to the first flip of the next one (or one frame after its last
+# flip), so a dropped frame makes it one frame longer, and the report gives the mean duration and overshoot of each
+# epoch:
+def testOvershoot():
+    window = RecordedWindow(droppedFlips=[17])
+    timeline = FrameTimeline(window)
+    for _ in range(2):
+        timeline.runEpoch("objects", .100)
+        timeline.runEpoch("firstRoom", .050)
+    timeline.finish()
+
+    assert [timing["epoch"] for timing in timeline.epochTimings] == ["objects", "firstRoom"] * 2
+    assert [timing["nbFrames"] for timing in timeline.epochTimings] == [10, 5] * 2
+    assert [round(timing["overshoot"], 6) for timing in timeline.epochTimings] == [0, 0, 0.010, 0]
+    assert [round(timing["onset"], 6) for timing in timeline.epochTimings] == [0, .100, .150, .260]
+    assert timeline.report().split("\n") == [
+        "frame duration: 10.00 ms",
+        "objects: 2 times, 105.0 ms on average, overshoot 5.00 ms on average (max 10.00 ms), 1 late",
+        "firstRoom: 2 times, 50.0 ms on average, overshoot 0.00 ms on average (max 0.00 ms), 0 late"]
+
+
+# With recordFrames, each epoch also has the trialNb of its trial, the frames dropped and its longest frame, and the
+# CSVs have a line per epoch and a line per frame:
+def testRecordedFrames():
+    timeline = FrameTimeline(RecordedWindow(droppedFlips=[1, 2]), recordFrames=True)
+    for _ in range(2):
+        timeline.startTrial()
+        timeline.runEpoch("objects", .040)
+        timeline.finish()
+
+    assert [timing["trialNb"] for timing in timeline.epochTimings] == [1, 2]
+    assert [timing["droppedFrames"] for timing in timeline.epochTimings] == [2, 0]
+    assert [round(timing["longestFrame"], 6) for timing in timeline.epochTimings] == [.020, .010]
+    assert timeline.report().endswith("1 late, 2 frames dropped")
+    epochLines = timeline.toCSV().split("\n")
+    assert epochLines[0] == "trialNb,epoch,nbFrames,onset,duration,overshoot,droppedFrames,longestFrame"
+    assert len(epochLines) == 1 + 2 + 1  # (the CSV ends with a new line)
+    frameLines = timeline.framesToCSV().split("\n")
+    assert frameLines[0] == "trialNb,epoch,frame,flipTime,frameInterval" and len(frameLines) == 1 + 2 * 4 + 1
+    assert frameLines[1].startswith("1,objects,0,") and frameLines[-2].startswith("2,objects,3,")
+
+
+# The timing of the epochs and of the frames is written in the participant's directory, only if the frames were
+# recorded:
+def testFrameTimingFiles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    demographics = {"age": "NA", "gender": "NA", "education": "NA", "student": "NA", "fieldOfStudy": "NA",
+                    "timeToComplete": "NA"}
+    for recordFrames in [False, True]:
+        timeline = FrameTimeline(RecordedWindow(), recordFrames=recordFrames)
+        timeline.startTrial()
+        timeline.runEpoch("objects", .030)
+        timeline.finish()
+        streams = RandomStreams(seed=1)
+        participant = simulateParticipant({"standardPractice": {"blocks": 1, "trials": 6}}, "random", streams.seed,
+                                          streams.spawnKey)
+        ResultsRecorder(experimentID="test", demographics=demographics, quizAttempts="NA", frameTimeline=timeline,
+                        **participant).recordResults()
+
+    assert not any("frame" in fileName for fileName in listdir(path.join("results", "test", "1")))
+    frameTimings = pd.read_csv(path.join("results", "test", "2", "2_frameTimings.csv"))
+    frameFlips = pd.read_csv(path.join("results", "test", "2", "2_frameFlips.csv"))
+    assert list(frameTimings["nbFrames"]) == [3] and list(frameFlips["frame"]) == [0, 1, 2]
+
+########################################################################################################################
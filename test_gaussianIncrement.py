@@ -0,0 +1,54 @@
+########################################################################################################################
+# These are the tests of the truncated gaussian increments and of the random walk of the rooms (gaussianIncrement.py):
+# the increments must follow the gaussian truncated to the values that keep the probabilities between 0 and 1 (the
+# same distribution as resampling until the value fits).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import numpy as np
+from scipy.stats import truncnorm
+from gaussianIncrement import truncatedGaussianIncrements, gaussianIncrement, gaussianRandomWalk
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# Near the bounds, the increments have the mean and the spread of the truncated gaussian and never leave the bounds
+# (including when both bounds are far in the tail of the gaussian, where the values are mirrored):
+def testIncrementsAreTruncatedGaussians():
+    generator = np.random.default_rng(1)
+    for probability, mu, sigma in [(.5, 0, .025), (.99, 0, .025), (.005, 0, .025), (.02, -.1, .025), (.98, .1, .025)]:
+        increments = truncatedGaussianIncrements(np.full(200000, probability), mu, sigma, generator.random(200000))
+        expected = truncnorm((0 - probability - mu) / sigma, (1 - probability - mu) / sigma, loc=mu, scale=sigma)
+        assert np.all(probability + increments >= 0) and np.all(probability + increments <= 1)
+        assert abs(increments.mean() - expected.mean()) < 3 * expected.std() / np.sqrt(200000) + 1e-9
+        assert abs(increments.std() - expected.std()) < .02 * expected.std()
+
+
+# One increment gives a probability between 0 and 1, and the same generator gives the same increment:
+def testGaussianIncrement():
+    for probability in [0, .001, .5, .999, 1]:
+        newProbability = gaussianIncrement(probability, 0, .025, np.random.default_rng(2))
+        assert 0 <= newProbability <= 1
+        assert newProbability == gaussianIncrement(probability, 0, .025, np.random.default_rng(2))
+
+
+# The walk starts with the starting probabilities, has one row per increment, stays between 0 and 1, and is the same
+# for the same seed, also with more dimensions (sessions x rooms):
+def testRandomWalk():
+    startingProbabilities = [.25, .4, .55, .7]
+    walk = gaussianRandomWalk(startingProbabilities, 500, 0, .025, np.random.default_rng(3))
+    assert walk.shape == (501, 4)
+    assert np.array_equal(walk[0], startingProbabilities)
+    assert np.all((walk >= 0) & (walk <= 1))
+    assert np.array_equal(walk, gaussianRandomWalk(startingProbabilities, 500, 0, .025, np.random.default_rng(3)))
+    assert np.all(np.abs(np.diff(walk, axis=0)) < .025 * 8)
+
+    sessionsWalk = gaussianRandomWalk(np.tile(startingProbabilities, (10, 1)), 50, 0, .025, np.random.default_rng(3))
+    assert sessionsWalk.shape == (51, 10, 4)
+    assert np.all((sessionsWalk >= 0) & (sessionsWalk <= 1))
+
+########################################################################################################################
@@ -0,0 +1,75 @@
+########################################################################################################################
+# These are the tests of the cache of the images (imageCache.py): the images are decoded and resized once, then read
+# from the cache, and a changed image or a new size gets its own cache file.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import listdir
+import numpy as np
+import pytest
+from PIL import Image
+from imageCache import ImageCache
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+# This function writes an image of one colour:
+def writeImage(imageFile, colour, size=(64, 48)):
+    Image.new("RGB", size, colour).save(imageFile)
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The image is given at the size asked for (one number for a square) as RGBA, and it is kept in the cache under its
+# name, size and version:
+def testImageIsCached(tmp_path):
+    imageFile = str(tmp_path / "pink.png")
+    writeImage(imageFile, (255, 0, 128))
+    imageCache = ImageCache(pathToCache=str(tmp_path / "cache"))
+
+    image = imageCache.getImage(imageFile, (32, 24))
+    assert image.size == (32, 24) and image.mode == "RGBA"
+    assert np.array_equal(np.asarray(image)[0, 0], [255, 0, 128, 255])
+    assert imageCache.getImage(imageFile, 20.4).size == (20, 20)
+    assert sorted(fileName.rsplit("_", 1)[0] for fileName in listdir(tmp_path / "cache")) == ["pink_20x20",
+                                                                                              "pink_32x24"]
+
+
+# The next launches read the cache without decoding the image again:
+def testNextLaunchReadsTheCache(tmp_path, monkeypatch):
+    imageFile = str(tmp_path / "pink.png")
+    writeImage(imageFile, (255, 0, 128))
+    ImageCache(pathToCache=str(tmp_path / "cache")).getImage(imageFile, 16)
+
+    # (decoding an image is not possible any more)
+    def openImage(*arguments, **keywords):
+        raise AssertionError("The image was decoded again")
+    monkeypatch.setattr(Image, "open", openImage)
+    assert ImageCache(pathToCache=str(tmp_path / "cache")).getImage(imageFile, 16).size == (16, 16)
+    with pytest.raises(AssertionError):
+        ImageCache(pathToCache=str(tmp_path / "cache")).getImage(imageFile, 17)
+
+
+# A changed image gets a new cache file and the file of its older version at the same size is deleted, but the
+# temporary files of other launches are left alone:
+def testChangedImage(tmp_path):
+    imageFile = str(tmp_path / "pink.png")
+    writeImage(imageFile, (255, 0, 128))
+    ImageCache(pathToCache=str(tmp_path / "cache")).getImage(imageFile, 16)
+    (tmp_path / "cache" / "pink_16x16_0123456789abcdef.otherStation.1234.tmp.npy").write_bytes(b"")
+
+    writeImage(imageFile, (0, 255, 0))
+    image = ImageCache(pathToCache=str(tmp_path / "cache")).getImage(imageFile, 16)
+    assert np.array_equal(np.asarray(image)[0, 0], [0, 255, 0, 255])
+    cacheFiles = listdir(tmp_path / "cache")
+    assert len(cacheFiles) == 2
+    assert "pink_16x16_0123456789abcdef.otherStation.1234.tmp.npy" in cacheFiles
+
+########################################################################################################################
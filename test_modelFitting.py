@@ -0,0 +1,111 @@
+########################################################################################################################
+# These are the tests of the maximum likelihood fitting of the agents (modelFitting.py): the results of simulated
+# participants are read back into choice sequences and fitted, and the fits are cached.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from io import StringIO
+from os import listdir, path
+import numpy as np
+import pandas as pd
+import pytest
+from SIMULATE import simulateCohort
+from modelFitting import (readParticipants, getCombinationsObjectRooms, makeChoiceSequence, fitParticipant,
+                          readCachedFit, fitAndCache)
+from stimuliEngine import StimuliEngine
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 12},
+                   "tripletExperimental": {"blocks": 2, "trials": 24}}
+
+
+# This function records a simulated cohort in results/test/ and gives the participants of its allResults.csv (run it
+# in a temporary directory):
+def recordCohort(agentSpec, nbParticipants, seed):
+    simulateCohort(experimentSetUp, agentSpec, nbParticipants, "test", seed=seed, nbProcesses=1)
+    return readParticipants(path.join("results", "test", "allResults.csv"))
+
+
+# This function gives the results of a participant (as text) as a dataframe:
+def readResults(participantResults):
+    return pd.read_csv(StringIO(participantResults), dtype=str, keep_default_na=False)
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# Each participant of allResults.csv is read with their combinations, and the rooms of the objects read from the
+# combinations are the rooms of the session:
+def testReadParticipants(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    participants = recordCohort("random", 2, seed=1)
+    assert sorted(participants) == [("test", "1"), ("test", "2")]
+    for participant in participants.values():
+        assert len(readResults(participant["results"])) == 12 + 2 * 24
+        objectRooms = getCombinationsObjectRooms(participant["combinations"])
+        assert np.all(objectRooms.sum(axis=1) == 2) and np.all(objectRooms.sum(axis=0) == 2)
+
+    # (a _experimentResults.csv file is the results of the participant of its name)
+    participant = readParticipants(path.join("results", "test", "1", "1_experimentResults.csv"))
+    assert list(participant) == [("test", "1")]
+    assert participant[("test", "1")]["combinations"] == participants[("test", "1")]["combinations"]
+
+
+# The choice sequence has one trial per response, and the rooms of the objects found from the rooms visited are the
+# rooms of the session:
+def testChoiceSequence(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    participant = recordCohort("random", 1, seed=2)[("test", "1")]
+    results = readResults(participant["results"])
+    choiceSequence, objectRooms = makeChoiceSequence(results)
+    assert len(choiceSequence) == (results["responseSide"] != "NA").sum()
+    assert np.array_equal(objectRooms, getCombinationsObjectRooms(participant["combinations"]))
+
+    # (without the combinations, the rooms of an object that was never chosen cannot be found)
+    stimuli = StimuliEngine()
+    object = stimuli.objectNames[0]
+    notChosen = results[(results["trialType"] != "uncertain") &
+                        (np.where(results["responseSide"] == "left", results["leftObjects"],
+                                  results["rightObjects"]) != object) &
+                        (results["ghostSelected"] != object)]
+    with pytest.raises(ValueError):
+        makeChoiceSequence(notChosen)
+
+
+# A participant who chooses by the values of a model-based agent is fitted better than chance by the model-based
+# model, with parameters inside their bounds:
+def testFitParticipant(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    participant = recordCohort("modelBased:alpha=0.5,beta=10", 1, seed=3)[("test", "1")]
+    choiceSequence, objectRooms = makeChoiceSequence(readResults(participant["results"]),
+                                                     getCombinationsObjectRooms(participant["combinations"]))
+    fit = fitParticipant(choiceSequence, objectRooms, "modelBased", nbGridValues=3)
+    assert fit["nbChoices"] == len(choiceSequence)
+    assert fit["logLikelihood"] > len(choiceSequence) * np.log(.5)
+    assert 0 <= fit["alpha"] <= 1 and 0 <= fit["beta"] <= 20
+    assert fit["AIC"] == pytest.approx(2 * 2 - 2 * fit["logLikelihood"])
+
+
+# A fit is cached and read back, and a participant who cannot be fitted gets the error instead (and is not cached):
+def testFitAndCache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    participant = recordCohort("random", 1, seed=4)[("test", "1")]
+    cacheDirectory = path.join(str(tmp_path), "cache")
+    assert readCachedFit(cacheDirectory, participant["results"], "modelFree") is None
+    fit = fitAndCache(participant["results"], "modelFree", cacheDirectory, participant["combinations"])
+    assert readCachedFit(cacheDirectory, participant["results"], "modelFree") == fit
+    assert len(listdir(cacheDirectory)) == 1
+
+    error = fitAndCache("responseSide,leftObjects\nleft,unknown\n", "modelFree", cacheDirectory)
+    assert set(error) == {"model", "error"}
+    assert len(listdir(cacheDirectory)) == 1
+
+########################################################################################################################
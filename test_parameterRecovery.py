@@ -0,0 +1,88 @@
+########################################################################################################################
+# These are the tests of the parameter recovery and model comparison study (parameterRecovery.py and RECOVERY.py): the
+# participants are simulated with known parameters and fitted with every model, and the study is summarised.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import numpy as np
+import pandas as pd
+from randomStreams import RandomStreams
+from populationAgents import populationAgentTypes
+from parameterRecovery import makeTrueParameters, simulateWithModel, fitSimulation, getRecoveryResults
+from RECOVERY import runRecoveryStudy
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 1, "trials": 12}}
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The true parameters are drawn within the bounds of the model, or are every combination of a grid across them:
+def testTrueParameters():
+    settings = makeTrueParameters("retrospective", np.random.default_rng(1), nbSettings=20)
+    assert len(settings) == 20
+    for setting in settings:
+        assert list(setting) == populationAgentTypes["retrospective"].parameterNames
+        for parameterName, value in setting.items():
+            low, high = populationAgentTypes["retrospective"].parameterBounds[parameterName]
+            assert low <= value <= high
+
+    gridSettings = makeTrueParameters("modelFree", np.random.default_rng(1), nbGridValues=3)
+    assert len(gridSettings) == 3 * 3
+    assert sorted({setting["beta"] for setting in gridSettings}) == [0, 10, 20]
+
+
+# A simulated participant is fitted with the rooms of its objects from the simulation, also when its agent never
+# chose some object (with a beta of 20, the results do not always give the rooms of every object):
+def testFitSimulation():
+    streams = RandomStreams(seed=2)
+    experimentResults, objectRooms = simulateWithModel(experimentSetUp, "modelBased", {"alpha": .5, "beta": 20},
+                                                       streams.seed, streams.spawnKey)
+    assert np.all(objectRooms.sum(axis=1) == 2) and np.all(objectRooms.sum(axis=0) == 2)
+    fit = fitSimulation(experimentResults, objectRooms, "modelFree")
+    assert fit["model"] == "modelFree" and "error" not in fit
+
+    # (a fit that fails only gives its error, so that the study goes on)
+    error = fitSimulation("responseSide,leftObjects\nleft,unknown\n", objectRooms, "modelFree")
+    assert set(error) == {"model", "error"}
+
+
+# The correlations are computed on the fits with the simulating model, the confusion matrix gives the proportion of
+# participants best fitted by each model, and the failed fits are left out:
+def testRecoveryResults():
+    fits = pd.DataFrame([{"participant": participant, "simulatingModel": simulatingModel, "trueAlpha": trueAlpha,
+                          "trueBeta": 20 * trueAlpha, "model": model, "alpha": trueAlpha + .01,
+                          "beta": 20 * trueAlpha - 1, "BIC": 10 if model == simulatingModel else 20}
+                         for simulatingModel in ["modelFree", "modelBased"]
+                         for participant, trueAlpha in enumerate([.1, .4, .8], start=1)
+                         for model in ["modelFree", "modelBased"]])
+    fits = pd.concat([fits, pd.DataFrame([{"participant": 4, "simulatingModel": "modelFree", "trueAlpha": .5,
+                                           "trueBeta": 5, "model": "modelFree", "error": "ValueError: no choices"}])])
+    correlations, confusionMatrix = getRecoveryResults(fits, ["modelFree", "modelBased"])
+    assert len(correlations) == 2 * 2
+    assert np.allclose(correlations["correlation"], 1)
+    assert set(correlations["nbParticipants"]) == {3}
+    assert np.array_equal(confusionMatrix.to_numpy(), np.eye(2))
+
+
+# The study has one row per simulated participant and fitted model, with the true parameters, and is the same for the
+# same seed:
+def testRecoveryStudy():
+    fits = runRecoveryStudy(experimentSetUp, ["modelFree", "modelBased"], nbSettings=2, seed=3, nbProcesses=2)
+    assert len(fits) == 2 * 2 * 2
+    assert sorted(set(fits["participant"])) == [1, 2, 3, 4]
+    assert {"trueAlpha", "trueBeta", "logLikelihood", "BIC"} <= set(fits.columns)
+    sameFits = runRecoveryStudy(experimentSetUp, ["modelFree", "modelBased"], nbSettings=2, seed=3, nbProcesses=1)
+    assert sameFits.equals(fits)
+
+########################################################################################################################
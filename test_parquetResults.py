@@ -0,0 +1,56 @@
+########################################################################################################################
+# These are the tests of the Parquet dataset of the results (parquetResults.py): the results of each participant are
+# written in their partition with typed columns, and only the columns and experiments asked for are read back.
+# The tests of the dataset need pyarrow (they are skipped without it).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import sys
+from os import listdir, path
+import pytest
+from SIMULATE import simulateCohort
+from parquetResults import importPyarrow, readResultsDataset
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 1, "trials": 6}}
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# Without pyarrow, using the dataset says what is missing:
+def testWithoutPyarrow(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="pip install pyarrow"):
+        importPyarrow()
+
+
+# Each simulated participant has their partition, and the dataset has the same trials as allResults.csv, with the
+# experiment and the participant from the partitions:
+def testDatasetOfACohort(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    simulateCohort(experimentSetUp, "random", 3, "test", seed=1, nbProcesses=1, parquet=True)
+    simulateCohort(experimentSetUp, "random", 2, "other", seed=2, nbProcesses=1, parquet=True)
+    assert sorted(listdir(path.join("parquet", "experimentID=test"))) == ["participant=1", "participant=2",
+                                                                         "participant=3"]
+    assert listdir(path.join("parquet", "experimentID=test", "participant=2")) == ["results.parquet"]
+
+    dataset = readResultsDataset()
+    assert len(dataset) == (3 + 2) * (6 + 6)
+    testDataset = readResultsDataset(columns=["trialNb", "room1", "participant"], experimentIDs=["test"])
+    assert list(testDataset.columns) == ["trialNb", "room1", "participant"]
+    assert len(testDataset) == 3 * (6 + 6)
+    assert sorted(set(testDataset["participant"].astype(str))) == ["1", "2", "3"]
+    assert str(testDataset["trialNb"].dtype) == "Int32"
+
+########################################################################################################################
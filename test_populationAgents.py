@@ -0,0 +1,132 @@
+########################################################################################################################
+# These are the tests of the population agents (populationAgents.py): their parameters, their learning rules and their
+# choices, for whole populations at once, and the simulation of a population through a session.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import numpy as np
+import pytest
+from randomStreams import RandomStreams
+from stimuliEngine import StimuliEngine
+from experimentEngine import ExperimentEngine
+from populationAgents import (PopulationAgent, ModelFreeAgent, ModelBasedAgent, RetrospectiveAgent, getObjectRooms,
+                              makeParameterGrid, simulatePopulation)
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+# The rooms of the 4 objects (objects x rooms): each object opens two rooms and each room is opened by two objects
+objectRooms = np.array([[1, 1, 0, 0],
+                        [0, 1, 1, 0],
+                        [0, 0, 1, 1],
+                        [1, 0, 0, 1]])
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The base class only gives what the agents share, it cannot be an agent itself:
+def testPopulationAgentIsAbstract():
+    with pytest.raises(TypeError):
+        PopulationAgent(objectRooms)
+
+
+# The parameters become one value per agent (the ones not given take their default value), and unknown parameters are
+# refused:
+def testParameters():
+    agent = RetrospectiveAgent(objectRooms, alpha=[.1, .2, .3], beta=5)
+    assert agent.nbAgents == 3
+    assert np.array_equal(agent.parameters["beta"], [5, 5, 5])
+    assert np.array_equal(agent.parameters["weight"], [.5, .5, .5])
+    with pytest.raises(ValueError, match="Unknown parameter 'weight'"):
+        ModelFreeAgent(objectRooms, alpha=.1, beta=1, weight=.5)
+
+
+# The grid has every combination of the values of the parameters:
+def testMakeParameterGrid():
+    grid = makeParameterGrid(alpha=[.1, .5], beta=[1, 5, 10])
+    assert len(grid["alpha"]) == len(grid["beta"]) == 6
+    assert set(zip(grid["alpha"], grid["beta"])) == {(alpha, beta) for alpha in [.1, .5] for beta in [1, 5, 10]}
+
+
+# The matrix of the rooms of the objects has a 1 for each of the two rooms of each object:
+def testGetObjectRooms():
+    stimuli = StimuliEngine(randomStreams=RandomStreams(seed=1))
+    stimuli.createStimuli()
+    matrix = getObjectRooms(stimuli)
+    assert np.array_equal(matrix.sum(axis=0), [2, 2, 2, 2]) and np.array_equal(matrix.sum(axis=1), [2, 2, 2, 2])
+    for object, rooms in stimuli.combiRoomsOfTheObjects.items():
+        for room in rooms:
+            assert matrix[stimuli.objectIndices[object], stimuli.roomIndices[room]] == 1
+
+
+# The model-free value of the chosen object moves towards the number of treasures, at the learning rate of each agent:
+def testModelFreeLearning():
+    agent = ModelFreeAgent(objectRooms, alpha=[.5, 1], beta=1)
+    agent.learn(np.array([[0], [2]]), np.array([[0, 1], [2, 3]]), np.array([[1., 1.], [1., 0.]]))
+    assert np.allclose(agent.getObjectValues(), [[1, 0, 0, 0], [0, 0, 1, 0]])
+
+
+# The model-based value of an object is the sum of the values of its rooms, which move towards their treasures:
+def testModelBasedLearning():
+    agent = ModelBasedAgent(objectRooms, alpha=.5, beta=1)
+    agent.learn(np.array([[0]]), np.array([[0, 1]]), np.array([[1., 0.]]))
+    assert np.allclose(agent.roomValues, [[.5, 0, 0, 0]])
+    assert np.allclose(agent.getObjectValues(), [[.5, 0, 0, .5]])
+
+
+# The retrospective agent mixes both systems by its weight, and on uncertain trials gives the model-free credit to the
+# ghost-selected object (the ghost-rejected object only gets its rejectedCredit part):
+def testRetrospectiveLearning():
+    agent = RetrospectiveAgent(objectRooms, alpha=1, beta=1, weight=[0, 1], rejectedCredit=.5)
+    agent.learn(np.array([[0, 1], [0, 1]]), np.array([[1, 0], [1, 0]]), np.array([[1., 1.], [1., 1.]]),
+                ghostSelected=np.array([0, 0]), ghostRejected=np.array([1, 1]))
+    assert np.allclose(agent.getObjectValues()[0], [2, 1, 0, 0])  # model-free only
+    assert np.allclose(agent.getObjectValues()[1], [2, 1, 0, 1])  # model-based only
+
+
+# Without a temperature the agents choose at random, and with a high one they choose the side of higher value:
+def testChoices():
+    agent = ModelFreeAgent(objectRooms, alpha=1, beta=[0, 50], generator=np.random.default_rng(2))
+    agent.objectValues[:, 0] = 1
+    assert np.allclose(agent.getLeftProbabilities(np.array([0]), np.array([1])), [.5, 1])
+    choices = np.array([agent.choose(np.array([1]), np.array([0])) for _ in range(1000)])
+    assert 400 < choices[:, 0].sum() < 600
+    assert not choices[:, 1].any()
+
+
+# A simulated population has one column per agent for each trial of the session, and each agent visits the rooms of
+# its own choices:
+def testSimulatePopulation():
+    randomStreams = RandomStreams(seed=3)
+    stimuli = StimuliEngine(randomStreams=randomStreams)
+    stimuli.createStimuli()
+    experiment = ExperimentEngine(stimuliClass=stimuli,
+                                  experimentalSetUp={"standardPractice": {"blocks": 1, "trials": 6},
+                                                     "tripletExperimental": {"blocks": 1, "trials": 12}},
+                                  randomStreams=randomStreams)
+    agent = RetrospectiveAgent(getObjectRooms(stimuli), generator=randomStreams.responses,
+                               **makeParameterGrid(alpha=[.2, .8], beta=[1, 10], weight=[0, 1]))
+    simulation = simulatePopulation(agent, experiment)
+
+    assert simulation["chooseLeft"].shape == (6 + 12, 8)
+    assert simulation["rooms"].shape == (6 + 12, 8, 2)
+    assert simulation["trialType"] == ["standard"] * 6 + ["standard", "uncertain", "post"] * 4
+    objectRoomMatrix = getObjectRooms(stimuli)
+    for trial in range(6 + 12):
+        for agentIndex in range(8):
+            rooms = simulation["rooms"][trial, agentIndex]
+            if simulation["trialType"][trial] == "uncertain":
+                ghostSelected = simulation["ghostSelected"][trial, agentIndex]
+                assert objectRoomMatrix[ghostSelected, rooms].all()
+            else:
+                chosenObject = simulation["chosenObject"][trial, agentIndex]
+                assert objectRoomMatrix[chosenObject, rooms].all()
+
+########################################################################################################################
@@ -0,0 +1,69 @@
+########################################################################################################################
+# These are the tests of the random streams of a session (randomStreams.py): the same seed gives the same streams, the
+# streams are independent from each other, and the spawned sessions are independent from each other and can be
+# replayed from their seed and spawn key.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import numpy as np
+from randomStreams import RandomStreams, generatorChoice
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The same seed gives the same values in every stream, and each stream gives different values:
+def testSameSeedSameStreams():
+    streams = RandomStreams(seed=7)
+    sameStreams = RandomStreams(seed=7)
+    values = {streamName: getattr(streams, streamName).random(5) for streamName in RandomStreams.streamNames}
+    for streamName in RandomStreams.streamNames:
+        assert np.array_equal(getattr(sameStreams, streamName).random(5), values[streamName])
+    assert len({tuple(streamValues) for streamValues in values.values()}) == len(RandomStreams.streamNames)
+
+
+# Using more values of one stream does not change the values of the others:
+def testStreamsAreIndependent():
+    streams = RandomStreams(seed=8)
+    otherStreams = RandomStreams(seed=8)
+    otherStreams.walk.random(1000)
+    assert np.array_equal(streams.outcomes.random(5), otherStreams.outcomes.random(5))
+
+
+# Without a seed, one is taken (and kept so that the session can be recorded and replayed):
+def testSeedIsKept():
+    streams = RandomStreams()
+    replayedStreams = RandomStreams(seed=streams.seed)
+    assert streams.seed is not None
+    assert np.array_equal(streams.layout.random(5), replayedStreams.layout.random(5))
+
+
+# The spawned sessions are different from each other and from their parent, and each can be replayed from its seed and
+# spawn key (also as recorded in the seed line of the results), and spawning more sessions later gives new ones:
+def testSpawnedSessions():
+    streams = RandomStreams(seed=9)
+    sessions = streams.spawn(3)
+    moreSessions = streams.spawn(2, firstSession=3)
+    allSessions = [streams] + sessions + moreSessions
+    assert len({tuple(session.walk.random(3)) for session in allSessions}) == len(allSessions)
+
+    replayedSession = RandomStreams(seed=sessions[1].seed, spawnKey=sessions[1].spawnKey)
+    assert np.array_equal(replayedSession.walk.random(3), RandomStreams(seed=9).spawn(3)[1].walk.random(3))
+
+    seed, spawnKey = sessions[2].getSeedLine().split("\n")[1].split(",")
+    replayedSession = RandomStreams(seed=int(seed), spawnKey=[int(key) for key in spawnKey.split()])
+    assert np.array_equal(replayedSession.layout.random(3), RandomStreams(seed=9).spawn(3)[2].layout.random(3))
+
+
+# generatorChoice gives the values themselves (not arrays made from them), each of them:
+def testGeneratorChoice():
+    generator = np.random.default_rng(10)
+    pairs = [["key", "light"], ["phone", "stove"]]
+    choices = [generatorChoice(generator, pairs) for _ in range(100)]
+    assert all(isinstance(choice, list) for choice in choices)
+    assert {tuple(choice) for choice in choices} == {("key", "light"), ("phone", "stove")}
+
+########################################################################################################################
@@ -0,0 +1,156 @@
+########################################################################################################################
+# These are the tests of the recording of the results (recordingResults.py): each participant gets the first free ID
+# after the high-water mark, the mark only goes up, its lock is only released by the station that holds it, and the
+# files of a participant are published all at once.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from concurrent.futures import ProcessPoolExecutor
+from os import listdir, makedirs, mkdir, path
+from time import time
+import pytest
+from SIMULATE import simulateParticipant
+from randomStreams import RandomStreams
+from recordingResults import ResultsRecorder
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+# This function gives a recorder of the experiment "test" that only makes participant directories (its experiment
+# directory is made):
+def makeRecorder():
+    recorder = ResultsRecorder(experimentID="test", demographics={}, quizAttempts="NA", randomWalk=None,
+                               experimentResults=None, roomsOfTheObjects=None, objectsOfTheRooms=None,
+                               randomStreams=None)
+    recorder.getExperimentDirectory()
+    return recorder
+
+
+# This function makes the directory of a new participant and gives their ID (it is run in the processes of a pool):
+def makeParticipant(_=None):
+    recorder = makeRecorder()
+    recorder.makeParticipantDirectory()
+    return int(recorder.participantID)
+
+
+# This function gives a recorder of the results of a simulated participant of the experiment "test":
+def makeParticipantRecorder(seed):
+    streams = RandomStreams(seed=seed)
+    participant = simulateParticipant({"standardPractice": {"blocks": 1, "trials": 6}}, "random", streams.seed,
+                                      streams.spawnKey)
+    demographics = {"age": "NA", "gender": "NA", "education": "NA", "student": "NA", "fieldOfStudy": "NA",
+                    "timeToComplete": "NA"}
+    return ResultsRecorder(experimentID="test", demographics=demographics, quizAttempts="NA", **participant)
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The participants get the IDs after the high-water mark one after the other, also when a directory was made by another
+# station (or by hand) after it; without the mark, the IDs start after the highest participant directory:
+def testParticipantIDs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert [makeParticipant() for _ in range(3)] == [1, 2, 3]
+    mkdir(path.join("results", "test", "4"))
+    assert makeParticipant() == 5
+    assert makeRecorder().readHighWaterMarkFile() == 5
+
+    makedirs(path.join("results", "old", "7"))
+    recorder = makeRecorder()
+    recorder.pathToResults = path.join("results", "old") + "/"
+    assert recorder.readHighWaterMarkFile() is None and recorder.readHighWaterMark() == 7
+
+
+# The high-water mark only goes up (a station that got a lower ID may finish last), and the lock is released:
+def testHighWaterMarkOnlyGoesUp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    recorder = makeRecorder()
+    recorder.writeHighWaterMark(5)
+    recorder.writeHighWaterMark(3)
+    assert recorder.readHighWaterMarkFile() == 5
+    assert listdir(path.join("results", "test")) == ["lastParticipantID.txt"]
+
+
+# A lock left by a station that stopped while holding it is taken once it has had the same owner for too long:
+def testStaleLock(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    recorder = makeRecorder()
+    lockName = path.join("results", "test", "lastParticipantID.lock")
+    mkdir(lockName)
+    ownerFile = open(path.join(lockName, "owner"), "w")
+    ownerFile.write("otherStation.1234.0")
+    ownerFile.close()
+
+    start = time()
+    lockOwner = recorder.lockHighWaterMark(staleLockSeconds=.2)
+    assert time() - start >= .2
+    assert lockOwner != "otherStation.1234.0" and recorder.readHighWaterMarkLockOwner() == lockOwner
+    recorder.removeHighWaterMarkLock(lockOwner)
+    assert not path.exists(lockName)
+
+
+# A station that finds its lock was taken by another station (after it was removed as stale) leaves it in place:
+def testOtherStationsLockIsKept(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    recorder = makeRecorder()
+    lockOwner = recorder.lockHighWaterMark()
+    ownerFile = open(path.join("results", "test", "lastParticipantID.lock", "owner"), "w")
+    ownerFile.write("otherStation.1234.0")
+    ownerFile.close()
+
+    recorder.removeHighWaterMarkLock(lockOwner)
+    assert recorder.readHighWaterMarkLockOwner() == "otherStation.1234.0"
+    recorder.removeHighWaterMarkLock("otherStation.1234.0")
+    assert recorder.readHighWaterMarkLockOwner() is None
+
+
+# Participants recorded at the same time by several processes all get different IDs, and the mark is the highest one:
+def testConcurrentParticipants(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        participantIDs = list(executor.map(makeParticipant, range(40)))
+    assert sorted(participantIDs) == list(range(1, 41))
+    assert makeRecorder().readHighWaterMarkFile() == 40
+    assert not path.exists(path.join("results", "test", "lastParticipantID.lock"))
+
+
+# The participant's directory has all their files once they are recorded (and no staging directory is left), and
+# allResults.csv has the column names once and the lines of every participant:
+def testPublishedParticipant(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for seed in range(2):
+        makeParticipantRecorder(seed).recordResults()
+    experimentDirectory = path.join("results", "test")
+    assert sorted(listdir(experimentDirectory)) == ["1", "2", "allResults.csv", "lastParticipantID.txt"]
+    assert sorted(listdir(path.join(experimentDirectory, "2"))) == sorted(
+        "2_" + fileName for fileName in ["combinations.csv", "demographics.csv", "demographicsAndResults.csv",
+                                         "experimentResults.csv", "quizAttempts.csv", "randomWalk.csv",
+                                         "randomWalk.png", "seed.csv"])
+    allResultsFile = open(path.join(experimentDirectory, "allResults.csv"))
+    allResults = allResultsFile.read().split("\n")
+    allResultsFile.close()
+    assert len(allResults) == 1 + 2 * 6 and allResults[0].startswith("id,")
+
+
+# If the recording stops before the files are published, the participant's directory stays empty (it only keeps their
+# ID) and allResults.csv is not changed:
+def testStoppedRecording(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    recorder = makeParticipantRecorder(seed=1)
+
+    # (the recording stops while the seed is made)
+    def stop():
+        raise RuntimeError("The computer crashed")
+    monkeypatch.setattr(recorder, "makeSeed", stop)
+    with pytest.raises(RuntimeError):
+        recorder.recordResults()
+    assert listdir(path.join("results", "test", "1")) == []
+    assert not path.exists(path.join("results", "test", "allResults.csv"))
+
+########################################################################################################################
@@ -0,0 +1,67 @@
+########################################################################################################################
+# These are the tests of the SQLite database of the results (resultsDatabase.py): each session is written in one
+# transaction, and the trials are selected by experiment, participant or any results column.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from io import StringIO
+from os import path
+import pandas as pd
+import pytest
+from randomStreams import RandomStreams
+from SIMULATE import simulateCohort
+from resultsDatabase import ResultsDatabase
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 1, "trials": 12}}
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The database of simulated cohorts has every participant, session, trial and increment of the random walks, and the
+# trials of a participant are the trials of their _experimentResults.csv file:
+def testDatabaseOfACohort(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simulateCohort(experimentSetUp, "random", 3, "test", seed=1, nbProcesses=1, database=True)
+    simulateCohort(experimentSetUp, "random", 2, "other", seed=2, nbProcesses=1, database=True)
+    database = ResultsDatabase(path.join("results", "results.sqlite"))
+    connection = database.connection
+    assert connection.execute("SELECT COUNT(*) FROM participants").fetchone()[0] == 5
+    assert connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 5
+    assert len(database.getTrials()) == 5 * (6 + 12)
+    assert connection.execute("SELECT COUNT(DISTINCT room) FROM randomWalk").fetchone()[0] == 4
+
+    trials = database.getTrials(experimentID="test", participantID="2")
+    experimentResults = pd.read_csv(path.join("results", "test", "2", "2_experimentResults.csv"))
+    assert list(trials["trialNb"]) == list(experimentResults["trialNb"])
+    assert list(trials["room1"].fillna("NA")) == list(experimentResults["room1"].fillna("NA"))
+
+    postTrials = database.getTrials(experimentID="test", trialType="post", isPractice=0)
+    assert len(postTrials) == 3 * 12 / 3
+    assert set(postTrials["trialType"]) == {"post"} and set(postTrials["experimentID"]) == {"test"}
+    database.close()
+
+
+# A session that cannot be written leaves nothing in the database (the participant is not there either), and an
+# unknown column cannot be used to select the trials:
+def testSessionIsOneTransaction(tmp_path):
+    database = ResultsDatabase(str(tmp_path / "results.sqlite"))
+    results = pd.read_csv(StringIO("trialNb,room1\n1,kitchen\n"))
+    with pytest.raises(KeyError):
+        database.recordSession("test", "1", {"age": "20"}, RandomStreams(seed=1), results, {})
+    assert database.connection.execute("SELECT COUNT(*) FROM participants").fetchone()[0] == 0
+    with pytest.raises(ValueError):
+        database.getTrials(room="kitchen")
+    database.close()
+
+########################################################################################################################
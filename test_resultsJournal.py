@@ -0,0 +1,73 @@
+########################################################################################################################
+# These are the tests of the journal of the results (resultsJournal.py): the trials are written to disk as the session
+# goes, so the trials that were done are still there if the session stops.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import path
+import pytest
+from randomStreams import RandomStreams
+from stimuliEngine import StimuliEngine
+from trialEngine import randomResponder
+from experimentEngine import ExperimentEngine
+from resultsJournal import ResultsJournal
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 2, "trials": 6}}
+
+
+# This function gives a headless experiment of a session that writes its results in a journal (in journals/):
+def makeExperiment(seed, responder=randomResponder):
+    randomStreams = RandomStreams(seed=seed)
+    stimuli = StimuliEngine(randomStreams=randomStreams)
+    stimuli.createStimuli()
+    journal = ResultsJournal("test", randomStreams)
+    return ExperimentEngine(stimuliClass=stimuli, experimentalSetUp=experimentSetUp, responder=responder,
+                            randomStreams=randomStreams, journal=journal)
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The journal of a whole session is named after the experiment and the seed, and it is the CSV of its results:
+def testJournalIsTheResults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    experiment = makeExperiment(seed=1)
+    experiment.launchExperiment()
+    assert experiment.journal.fileName == "journals/test_1.csv"
+    assert experiment.journal.journalFile.closed
+    assert experiment.journal.toCSV() == experiment.results.toCSV()
+
+
+# If the session stops in the middle, the journal on the disk already has every trial that was finished:
+def testJournalAfterACrash(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    nbResponses = 0
+
+    # (a responder that stops the session at the ninth trial)
+    def crashingResponder(trial, currentTrialType, trialObjects):
+        nonlocal nbResponses
+        nbResponses += 1
+        if nbResponses == 9:
+            raise RuntimeError("The computer crashed")
+        return randomResponder(trial, currentTrialType, trialObjects)
+
+    experiment = makeExperiment(seed=2, responder=crashingResponder)
+    with pytest.raises(RuntimeError):
+        experiment.launchExperiment()
+    journalFile = open(path.join("journals", "test_2.csv"))
+    journal = journalFile.read()
+    journalFile.close()
+    assert journal == experiment.results.toCSV()
+    assert len(journal.strip().split("\n")) == 1 + len(experiment.results) and len(experiment.results) >= 6
+
+########################################################################################################################
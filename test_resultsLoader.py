@@ -0,0 +1,90 @@
+########################################################################################################################
+# These are the tests of the loader of the results (resultsLoader.py): the results of every layout (allResults.csv,
+# normalized results, or the participants' directories) are read chunk by chunk, with only the columns and the trials
+# asked for, and each participant only once.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import path, remove
+from shutil import copyfile
+import pandas as pd
+import pytest
+from SIMULATE import simulateCohort
+from resultsLoader import ResultsLoader
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 1, "trials": 12}}
+nbTrials = 6 + 12
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The experiments of every layout are read with all their trials, in the order of the participants:
+def testLayouts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simulateCohort(experimentSetUp, "random", 2, "wide", seed=1, nbProcesses=1)
+    simulateCohort(experimentSetUp, "random", 3, "normalized", seed=2, nbProcesses=1, normalized=True)
+    simulateCohort(experimentSetUp, "random", 2, "directories", seed=3, nbProcesses=1)
+    remove(path.join("results", "directories", "allResults.csv"))
+
+    results = ResultsLoader().load()
+    assert list(results["experimentID"].cat.categories) == ["directories", "normalized", "wide"]
+    assert results.groupby("experimentID", observed=True).size().to_dict() == {
+        "directories": 2 * nbTrials, "normalized": 3 * nbTrials, "wide": 2 * nbTrials}
+    wide = results[results["experimentID"] == "wide"]
+    assert list(wide["id"]) == [1] * nbTrials + [2] * nbTrials
+    assert list(wide["trialNb"]) == list(range(1, nbTrials + 1)) * 2
+    assert set(results.loc[results["experimentID"] == "normalized", "age"].astype(str)) == {"NA"}
+
+
+# Only the columns asked for are given (with the experimentID), only the trials of the filters are kept, the rooms are
+# categoricals, and the chunks have at most chunkSize lines:
+def testColumnsAndFilters(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simulateCohort(experimentSetUp, "random", 3, "wide", seed=1, nbProcesses=1)
+    simulateCohort(experimentSetUp, "random", 2, "normalized", seed=2, nbProcesses=1, normalized=True)
+
+    loader = ResultsLoader(chunkSize=5)
+    postTrials = loader.load(columns=["id", "room1", "postType"], trialType="post", isPractice=0,
+                             postType=["repeat", "switch"])
+    assert list(postTrials.columns) == ["experimentID", "id", "room1", "postType"]
+    assert set(postTrials["postType"]) <= {"repeat", "switch"}
+    assert isinstance(postTrials["room1"].dtype, pd.CategoricalDtype)
+    assert all(len(chunk) <= 5 for chunk in loader.iterateChunks(columns=["id"]))
+
+    wide = ResultsLoader(experimentIDs=["wide"]).load(columns=["id", "age"])
+    assert list(wide.columns) == ["experimentID", "id", "age"] and len(wide) == 3 * nbTrials
+    assert len(ResultsLoader().load(columns=["id"], phaseType="nothing")) == 0
+    with pytest.raises(ValueError):
+        ResultsLoader().load(room="kitchen")
+
+
+# An experiment recorded partly before and partly after its results were normalized is read from both allResults.csv
+# and the normalized results, and a participant that is in both is only read once (from the normalized results):
+def testMixedExperiment(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simulateCohort(experimentSetUp, "random", 2, "mixed", seed=1, nbProcesses=1)
+    simulateCohort(experimentSetUp, "random", 2, "mixed", seed=2, nbProcesses=1, normalized=True)
+    results = ResultsLoader().load(columns=["id", "trialNb"])
+    assert results.groupby("id").size().to_dict() == {1: nbTrials, 2: nbTrials, 3: nbTrials, 4: nbTrials}
+
+    # (the same participants in allResults.csv and in the normalized results)
+    simulateCohort(experimentSetUp, "random", 2, "both", seed=3, nbProcesses=1, normalized=True)
+    simulateCohort(experimentSetUp, "random", 2, "wide", seed=4, nbProcesses=1)
+    copyfile(path.join("results", "wide", "allResults.csv"), path.join("results", "both", "allResults.csv"))
+    both = ResultsLoader(experimentIDs=["both"]).load(columns=["id", "room1"])
+    normalizedTrials = pd.read_csv(path.join("results", "both", "allTrials.csv"), keep_default_na=False)
+    assert both.groupby("id").size().to_dict() == {1: nbTrials, 2: nbTrials}
+    assert list(both["room1"].astype(str)) == list(normalizedTrials["room1"])
+
+########################################################################################################################
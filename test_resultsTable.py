@@ -0,0 +1,112 @@
+########################################################################################################################
+# These are the tests of the columnar results of the trials (resultsTable.py): the rows are stored as typed columns
+# (codes for the text columns) and exported to the same CSV as before, and normalized results are joined back.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from io import StringIO
+from os import path
+import numpy as np
+import pandas as pd
+from SIMULATE import simulateCohort
+from resultsTable import ResultsTable, readResults, joinResults
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+# A standard trial that was answered and an uncertain trial that was missed:
+answeredTrial = {"phaseType": "triplet", "isPractice": 0, "blockNb": 1, "trialNb": 1, "trialType": "standard",
+                 "leftObjects": "key", "rightObjects": "light", "responseSide": "left", "responseTime": .512,
+                 "room1": "kitchen", "rewardProbability1": .25, "isTreasure1": 1,
+                 "room2": "garden", "rewardProbability2": .6, "isTreasure2": 0}
+missedTrial = {"phaseType": "triplet", "isPractice": 0, "blockNb": 1, "trialNb": 2, "trialType": "uncertain",
+               "leftObjects": "keylight", "rightObjects": "bookshoe"}
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The CSV has every column in order, the values of the rows and NA for what was not given:
+def testCSV():
+    results = ResultsTable()
+    results.addRow(**answeredTrial)
+    results.addRow(**missedTrial)
+    csv = pd.read_csv(StringIO(results.toCSV()), keep_default_na=False, dtype=str)
+    assert list(csv.columns) == list(ResultsTable.columns)
+    assert csv.iloc[0]["responseTime"] == "0.512" and csv.iloc[0]["room2"] == "garden"
+    assert csv.iloc[0]["postType"] == "NA"
+    assert list(csv.iloc[1][["responseSide", "responseTime", "room1", "isTreasure1"]]) == ["NA"] * 4
+    assert csv.iloc[1]["leftObjects"] == "keylight"
+
+
+# The text columns are codes of their categories, and the dataframe has categoricals and integers that can be NA:
+def testColumns():
+    results = ResultsTable()
+    for trialNb in range(1, 5):
+        results.addRow(**{**answeredTrial, "trialNb": trialNb, "room1": ["kitchen", "attic"][trialNb % 2]})
+    results.addRow(**missedTrial)
+    assert results.values["room1"].dtype == np.int16
+    assert list(results.categories["room1"]) == ["attic", "kitchen"]
+    dataFrame = results.toDataFrame()
+    assert isinstance(dataFrame["room1"].dtype, pd.CategoricalDtype)
+    assert dataFrame["room1"].isna().tolist() == [False] * 4 + [True]
+    assert dataFrame["isTreasure1"].isna().tolist() == [False] * 4 + [True]
+    assert dataFrame["trialNb"].tolist()[:4] == [1, 2, 3, 4]
+
+
+# The arrays grow when there are more rows than expected, without changing the rows already there, and a range of rows
+# can be exported on its own (without the header line):
+def testGrowAndRange():
+    results = ResultsTable(capacity=2)
+    for trialNb in range(1, 8):
+        results.addRow(**{**answeredTrial, "trialNb": trialNb})
+    assert len(results) == 7 and results.capacity == 8
+    assert list(results.toDataFrame()["trialNb"]) == list(range(1, 8))
+    lines = results.toCSV(firstRow=2, lastRow=4, header=False).splitlines()
+    assert [line.split(",")[3] for line in lines] == ["3", "4"]
+
+
+# The results read back from their CSV have the types of the table (and only the columns asked for):
+def testReadResults():
+    results = ResultsTable()
+    results.addRow(**answeredTrial)
+    results.addRow(**missedTrial)
+    readBack = readResults(StringIO(results.toCSV()))
+    assert list(readBack.columns) == list(ResultsTable.columns)
+    assert isinstance(readBack["room1"].dtype, pd.CategoricalDtype)
+    assert str(readBack["isTreasure1"].dtype) == "Int32"
+    assert readBack["isTreasure1"].isna().tolist() == [False, True]
+    assert readBack["responseTime"].iloc[0] == .512
+    assert list(readResults(StringIO(results.toCSV()), columns=["trialNb", "room1"]).columns) == ["trialNb", "room1"]
+
+
+# The normalized results of a cohort joined back are allResults.csv of the same cohort, and only the columns asked for
+# are joined (the id only once, also when it is asked for):
+def testJoinResults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                       "tripletExperimental": {"blocks": 1, "trials": 6}}
+    simulateCohort(experimentSetUp, "random", 3, "wide", seed=1, nbProcesses=1)
+    simulateCohort(experimentSetUp, "random", 3, "normalized", seed=1, nbProcesses=1, normalized=True)
+    assert not path.exists(path.join("results", "normalized", "allResults.csv"))
+    participantsFile = path.join("results", "normalized", "allParticipants.csv")
+    trialsFile = path.join("results", "normalized", "allTrials.csv")
+
+    joined = joinResults(participantsFile, trialsFile)
+    allResultsFile = open(path.join("results", "wide", "allResults.csv"))
+    allResults = allResultsFile.read()
+    allResultsFile.close()
+    assert joined.to_csv(index=False, na_rep="NA", lineterminator="\n")[:-1] == allResults
+
+    for columns in [["age", "room1"], ["id", "age", "room1"]]:
+        joinedColumns = joinResults(participantsFile, trialsFile, columns=columns)
+        assert list(joinedColumns.columns) == ["id", "age", "room1"]
+        assert len(joinedColumns) == 3 * (6 + 6)
+
+########################################################################################################################
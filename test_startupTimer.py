@@ -0,0 +1,32 @@
+########################################################################################################################
+# These are the tests of the timer of the start of the experiment (startupTimer.py): each phase lasts from the end of
+# the previous one, and the time before a restart is not measured.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+import startupTimer
+from startupTimer import StartupTimer
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# Each phase lasts from the end of the previous one (or from a restart), and the report has the phases in order and
+# their total:
+def testPhases(monkeypatch):
+    times = iter([10, 10.5, 12, 40, 40.25])
+    monkeypatch.setattr(startupTimer, "perf_counter", lambda: next(times))
+    timer = StartupTimer()
+    timer.mark("importing the GUI")
+    timer.mark("loading the GUI form")
+    timer.restart()  # (the forms)
+    timer.mark("opening the window")
+
+    assert timer.phaseTimes == {"importing the GUI": .5, "loading the GUI form": 1.5, "opening the window": .25}
+    assert timer.report() == "importing the GUI: 0.500 s\nloading the GUI form: 1.500 s\nopening the window: 0.250 s" \
+                             "\ntotal: 2.250 s"
+
+########################################################################################################################
@@ -0,0 +1,100 @@
+########################################################################################################################
+# These are the tests of the synthetic results (syntheticResults.py and SYNTHESISE.py): the results of many participants
+# are generated with arrays, and they must have the layout of allResults.csv and the rules of the task.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import makedirs, path
+import pandas as pd
+from randomStreams import RandomStreams
+from SIMULATE import simulateCohort
+from syntheticResults import generateSyntheticResults, writeSyntheticResults
+from resultsLoader import ResultsLoader
+from creditAssignment import getStayProbabilities
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+experimentSetUp = {"standardPractice": {"blocks": 1, "trials": 6},
+                   "tripletPractice": {"blocks": 1, "trials": 6},
+                   "tripletExperimental": {"blocks": 2, "trials": 24}}
+nbTrials = 6 + 6 + 2 * 24
+
+
+# This function reads a CSV of results as text:
+def readText(fileName):
+    return pd.read_csv(fileName, dtype=str, keep_default_na=False)
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The synthetic results have the columns of allResults.csv, the same number of trials for every participant, the
+# phases and blocks in order, and the triplets in their standard/uncertain/post order:
+def testLayout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simulateCohort(experimentSetUp, "random", 1, "test", seed=1, nbProcesses=1)
+    allResults = readText(path.join("results", "test", "allResults.csv"))
+
+    results = generateSyntheticResults(experimentSetUp, 5, RandomStreams(seed=1), firstID=11)
+    assert list(results.columns) == list(allResults.columns)
+    assert results.groupby("id").size().to_dict() == {participantID: nbTrials for participantID in range(11, 16)}
+    for participantID, trials in results.groupby("id"):
+        assert list(trials["trialNb"]) == list(range(1, nbTrials + 1))
+        assert list(trials["phaseType"]) == ["standard"] * 6 + ["triplet"] * (6 + 2 * 24)
+        assert list(trials["isPractice"]) == [1] * 12 + [0] * 48
+        assert list(trials["trialType"][6:]) == ["standard", "uncertain", "post"] * (2 + 2 * 8)
+
+
+# The rooms visited are the rooms of the objects: each object of a participant always opens the same two rooms (each
+# room opened by two objects), and after an uncertain trial the first room is common to the chosen pair and the second
+# one belongs to the ghost-selected object only:
+def testRoomsOfTheObjects():
+    results = generateSyntheticResults(experimentSetUp, 10, RandomStreams(seed=2))
+    answered = results[results["responseSide"].notna()]
+    assert len(answered) > 0
+    for participantID, trials in answered.groupby("id"):
+        roomsOfTheObjects = {}
+        for trial in trials[trials["trialType"] != "uncertain"].itertuples():
+            chosenObject = trial.leftObjects if trial.responseSide == "left" else trial.rightObjects
+            rooms = sorted([trial.room1, trial.room2])
+            assert roomsOfTheObjects.setdefault(chosenObject, rooms) == rooms
+        assert len(roomsOfTheObjects) == 4
+        assert list(pd.Series(sum(roomsOfTheObjects.values(), [])).value_counts()) == [2] * 4
+
+        for trial in trials[trials["trialType"] == "uncertain"].itertuples():
+            chosenPair = trial.leftObjects if trial.responseSide == "left" else trial.rightObjects
+            assert trial.ghostSelected in chosenPair and trial.ghostRejected in chosenPair
+            assert trial.room1 in roomsOfTheObjects[trial.ghostSelected]
+            assert trial.room1 in roomsOfTheObjects[trial.ghostRejected]
+            assert trial.room2 in roomsOfTheObjects[trial.ghostSelected]
+            assert trial.room2 not in roomsOfTheObjects[trial.ghostRejected]
+
+
+# The file of a seed is the same whatever the number of processes, it can be read by the loader and analysed, and a
+# response is missed only in the experimental trials:
+def testWriteSyntheticResults(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fileName = path.join("results", "synthetic", "allResults.csv")
+    makedirs(path.dirname(fileName))
+    writeSyntheticResults(fileName, experimentSetUp, 25, seed=3, batchSize=10, nbProcesses=1)
+    resultsFile = open(fileName)
+    results = resultsFile.read()
+    resultsFile.close()
+    writeSyntheticResults(fileName, experimentSetUp, 25, seed=3, batchSize=10, nbProcesses=3)
+    resultsFile = open(fileName)
+    assert resultsFile.read() == results and not results.endswith("\n")
+    resultsFile.close()
+
+    loaded = ResultsLoader().load(columns=["id", "isPractice", "responseSide"])
+    assert len(loaded) == 25 * nbTrials and list(loaded["id"].unique()) == list(range(1, 26))
+    assert loaded.loc[loaded["isPractice"] == 1, "responseSide"].notna().all()
+    assert len(getStayProbabilities(ResultsLoader())) > 0
+
+########################################################################################################################
@@ -0,0 +1,101 @@
+########################################################################################################################
+# These are the tests of the texture atlases (textureAtlas.py and ATLAS.py): the images are packed in the cells of a
+# power-of-two texture, each stimulus is centred on its cell, and the atlases are built without PsychoPy.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import listdir, path
+from runpy import run_path
+from shutil import copytree, ignore_patterns
+import sys
+import numpy as np
+from PIL import Image
+from imageCache import ImageCache
+from stimuliEngine import StimuliEngine
+from textureAtlas import TextureAtlas, makeStimuliAtlases
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+colours = {"red": (255, 0, 0, 255), "green": (0, 255, 0, 255), "blue": (0, 0, 255, 255), "empty": (0, 0, 0, 0)}
+
+
+# This function writes an image of each colour, and gives their files in the order of the colours:
+def writeImages(directory):
+    imageFiles = {}
+    for name, colour in colours.items():
+        imageFiles[name] = str(directory / (name + ".png"))
+        Image.new("RGBA", (40, 40), colour).save(imageFiles[name])
+    return imageFiles
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The images are in a grid of cells on a power-of-two texture, the first row of the texture image being the top, a
+# transparent image shows the background, and the phase of each image centres a cell-sized stimulus on its cell:
+def testAtlasCells(tmp_path):
+    atlas = TextureAtlas(atlasName="colours", imageFiles=writeImages(tmp_path), cellSize=20.2, background=[1, 1, -1],
+                         imageCache=ImageCache(pathToCache=str(tmp_path / "cache")))
+    assert (atlas.nbColumns, atlas.nbRows, atlas.cellSize, atlas.atlasSize) == (2, 2, 20, 64)
+
+    texture = np.asarray(atlas.getTexture())
+    assert texture.shape == (64, 64, 3)
+    for i, (name, colour) in enumerate(colours.items()):
+        column, row = i % 2, i // 2
+        expected = (255, 255, 0) if name == "empty" else colour[:3]
+        assert tuple(texture[row * 20 + 10, column * 20 + 10]) == expected
+
+        # (the texture coordinates of the centre of the stimulus, the rows of the texture going up)
+        centre = [0.5 - atlas.phases[name][0], 0.5 - atlas.phases[name][1]]
+        assert np.allclose([centre[0] * 64, (1 - centre[1]) * 64], [column * 20 + 10, row * 20 + 10])
+    assert np.all(texture[40:, :] == 0) and np.all(texture[:, 40:] == 0)
+
+
+# An atlas is built once for its images, cell size and background, and rebuilt at the next launch when one of its
+# images changed:
+def testAtlasIsCached(tmp_path):
+    imageFiles = writeImages(tmp_path)
+    imageCache = ImageCache(pathToCache=str(tmp_path / "cache"))
+    atlas = TextureAtlas(atlasName="colours", imageFiles=imageFiles, cellSize=16, imageCache=imageCache)
+    atlasFile = atlas.buildAtlas()
+    assert atlas.buildAtlas() == atlasFile
+    assert TextureAtlas(atlasName="colours", imageFiles=imageFiles, cellSize=16, background=[0, 0, 0],
+                        imageCache=imageCache).getAtlasFile() != atlasFile
+
+    Image.new("RGBA", (40, 40), (9, 9, 9, 255)).save(imageFiles["red"])
+    atlas = TextureAtlas(atlasName="colours", imageFiles=imageFiles, cellSize=16,
+                         imageCache=ImageCache(pathToCache=str(tmp_path / "cache")))
+    assert atlas.getAtlasFile() != atlasFile
+    assert tuple(np.asarray(atlas.getTexture())[8, 8]) == (9, 9, 9)
+
+
+# The atlases of the stimuli have the sizes and the colour of the position rectangles of StimuliEngine, and ATLAS.py
+# builds them for a resolution without importing PsychoPy:
+def testStimuliAtlases(tmp_path, monkeypatch):
+    stimuli = StimuliEngine()
+    objectSize, roomSize = stimuli.getStimuliSizes(400)
+    objectAtlas, roomAtlas = makeStimuliAtlases(objectNames=stimuli.objectNames, roomNames=stimuli.roomNames,
+                                                objectSize=objectSize, roomSize=roomSize,
+                                                objectBackground=stimuli.positionRectColour,
+                                                imageCache=ImageCache(pathToCache=str(tmp_path / "cache")))
+    assert (objectAtlas.cellSize, objectAtlas.background, roomAtlas.cellSize) == (100, [.5, .5, .5], 360)
+    assert list(objectAtlas.imageFiles) == stimuli.objectNames and list(roomAtlas.imageFiles) == stimuli.roomNames
+
+    copytree("resources", tmp_path / "resources", ignore=ignore_patterns("cache"))
+    atlasFile = path.abspath("ATLAS.py")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(sys.modules, "psychopy", None)
+    monkeypatch.setattr(sys, "argv", ["ATLAS.py", "--resolutions", "160x120"])
+    run_path(atlasFile, run_name="__main__")
+    atlasFiles = listdir(tmp_path / "resources" / "cache")
+    assert any(fileName.startswith("objectsAtlas_30_") for fileName in atlasFiles)
+    assert any(fileName.startswith("roomsAtlas_108_") for fileName in atlasFiles)
+
+########################################################################################################################
@@ -0,0 +1,97 @@
+########################################################################################################################
+# These are the tests of the streamed images (textureManager.py): the images are read by the thread of the texture
+# manager, their textures are only made between frames once they are read, and the least recently used textures that
+# are not pinned are deleted when they take too much memory.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from concurrent.futures import wait
+import pytest
+from PIL import Image
+pytest.importorskip("psychopy")
+import textureManager
+from imageCache import ImageCache
+from textureManager import StreamedImages, TextureManager
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+# The textures are recorded instead of being made on the graphics card (there is no window in the tests)
+class RecordedImageStim:
+    def __init__(self, win, image, units, size):
+        self.image = image
+        self.size = size
+        self.isCleared = False
+
+    def clearTextures(self):
+        self.isCleared = True
+
+
+# This function gives a texture manager that keeps at most maxTextures textures of 10x10 pixels, and the files of the
+# images a, b, c and d:
+def makeTextureManager(tmp_path, monkeypatch, maxTextures):
+    monkeypatch.setattr(textureManager.visual, "ImageStim", RecordedImageStim)
+    imageFiles = {}
+    for i, name in enumerate("abcd"):
+        imageFiles[name] = str(tmp_path / (name + ".png"))
+        Image.new("RGB", (30, 30), (i * 60, 0, 0)).save(imageFiles[name])
+    manager = TextureManager(window=None, imageCache=ImageCache(pathToCache=str(tmp_path / "cache")),
+                             maxTextureBytes=maxTextures * 10 * 10 * 4)
+    return manager, imageFiles
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The least recently used textures are deleted when there are too many, but a pinned texture is kept until it is
+# unpinned:
+def testLeastRecentlyUsed(tmp_path, monkeypatch):
+    manager, imageFiles = makeTextureManager(tmp_path, monkeypatch, maxTextures=2)
+    textures = {name: manager.getTexture(imageFiles[name], 10) for name in "ab"}
+    assert manager.getTexture(imageFiles["a"], 10) is textures["a"]  # (b is now the least recently used)
+    textures["c"] = manager.getTexture(imageFiles["c"], 10)
+    assert textures["b"].isCleared and not textures["a"].isCleared
+    assert [manager.isReady(imageFiles[name], 10) for name in "abc"] == [True, False, True]
+
+    manager.pin(imageFiles["a"], 10)
+    manager.getTexture(imageFiles["d"], 10)
+    assert textures["c"].isCleared and not textures["a"].isCleared
+    manager.unpinAll()
+    manager.getTexture(imageFiles["b"], 10)
+    assert textures["a"].isCleared and manager.textureBytes == 2 * 10 * 10 * 4
+
+
+# The prefetched images are read by the thread, and their textures are only made between frames, a few at a time:
+def testPrefetchedTextures(tmp_path, monkeypatch):
+    manager, imageFiles = makeTextureManager(tmp_path, monkeypatch, maxTextures=4)
+    for name in "abc":
+        manager.prefetch(imageFiles[name], (10, 10.2))
+    wait(list(manager.loadingImages.values()))
+    assert not manager.isReady(imageFiles["a"], 10)
+
+    manager.makePrefetchedTextures(maxTextures=2)
+    assert sum(manager.isReady(imageFiles[name], 10) for name in "abc") == 2
+    manager.makePrefetchedTextures()
+    assert all(manager.isReady(imageFiles[name], 10) for name in "abc") and not manager.loadingImages
+    assert manager.getTexture(imageFiles["c"], 10).image.size == (10, 10)
+
+
+# The streamed images are a dictionary of the ImageStims of the stimuli, made when they are used:
+def testStreamedImages(tmp_path, monkeypatch):
+    manager, imageFiles = makeTextureManager(tmp_path, monkeypatch, maxTextures=4)
+    images = StreamedImages(manager, {name: (imageFiles[name], 10) for name in "ab"})
+    assert list(images) == ["a", "b"] and len(images) == 2
+    assert not images.isReady("a")
+    assert images["a"] is images["a"] and images.isReady("a")
+
+    images.prefetch("b")
+    images.pin("b")
+    assert manager.pinnedKeys == {(imageFiles["b"], (10, 10))}
+
+########################################################################################################################
@@ -0,0 +1,95 @@
+########################################################################################################################
+# These are the tests of the compiled forms (uiCompiler.py): the form is compiled into a module once, the next loads
+# use that module, a changed form is compiled again, and its images are found wherever the experiment is launched from.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from os import listdir, path
+from shutil import copyfile, rmtree
+import pytest
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+from PyQt5 import uic
+from uiCompiler import loadCompiledUi
+########################################
+
+
+########################################
+#                Helpers               #
+########################################
+pathToForm = path.abspath("resources/experimentGUI.ui")
+pathToWarning = path.abspath("resources/warning.png")
+
+
+# This function gives the application of the tests (Qt needs one before any widget is made), without a screen:
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+# This function copies the form and its image in a directory, and gives the path to the form:
+def copyForm(directory):
+    directory.mkdir()
+    copyfile(pathToWarning, directory / "warning.png")
+    copyfile(pathToForm, directory / "experimentGUI.ui")
+    return str(directory / "experimentGUI.ui")
+
+
+# This function gives the number of images (not null) on the labels of a window:
+def getNbPixmaps(window):
+    pixmaps = [label.pixmap() for label in window.findChildren(QtWidgets.QLabel) if label.pixmap() is not None]
+    return sum(not pixmap.isNull() for pixmap in pixmaps)
+
+########################################
+
+
+########################################
+#                 Tests                #
+########################################
+# The window has the widgets of the form (as with uic.loadUi), and the next loads do not compile the form again:
+def testCompiledOnce(tmp_path, monkeypatch, app):
+    uiFile = copyForm(tmp_path / "form")
+    window = loadCompiledUi(uiFile, pathToCache=str(tmp_path / "cache"))
+    loadedWindow = uic.loadUi(uiFile)
+    assert isinstance(window, QtWidgets.QMainWindow)
+    assert sorted(child.objectName() for child in window.findChildren(QtWidgets.QWidget) if child.objectName()) == \
+        sorted(child.objectName() for child in loadedWindow.findChildren(QtWidgets.QWidget) if child.objectName())
+
+    # (compiling a form is not possible any more)
+    def compileUi(*arguments, **keywords):
+        raise AssertionError("The form was compiled again")
+    monkeypatch.setattr(uic, "compileUi", compileUi)
+    assert isinstance(loadCompiledUi(uiFile, pathToCache=str(tmp_path / "cache")), QtWidgets.QMainWindow)
+
+
+# A changed form is compiled again, and the module of its older version is deleted:
+def testChangedForm(tmp_path, app):
+    uiFile = copyForm(tmp_path / "form")
+    loadCompiledUi(uiFile, pathToCache=str(tmp_path / "cache"))
+    with open(uiFile, "a") as form:
+        form.write("\n")
+    loadCompiledUi(uiFile, pathToCache=str(tmp_path / "cache"))
+    modules = [fileName for fileName in listdir(tmp_path / "cache") if fileName.endswith(".py")]
+    assert len(modules) == 1 and modules[0].startswith("experimentGUI_")
+
+
+# The images of the form are found from its directory, also when the experiment is launched from another directory,
+# and the module does not depend on where the form is (a copy of the form elsewhere, e.g. after the experiment was
+# moved, uses the same module, with its own images):
+def testImagesOfTheForm(tmp_path, monkeypatch, app):
+    (tmp_path / "elsewhere").mkdir()
+    monkeypatch.chdir(tmp_path / "elsewhere")
+    window = loadCompiledUi(copyForm(tmp_path / "form"), pathToCache=str(tmp_path / "cache"))
+    assert getNbPixmaps(window) == 10
+
+    # (compiling a form is not possible any more, and the first copy of the form is gone)
+    def compileUi(*arguments, **keywords):
+        raise AssertionError("The form was compiled again")
+    monkeypatch.setattr(uic, "compileUi", compileUi)
+    rmtree(tmp_path / "form")
+    window = loadCompiledUi(copyForm(tmp_path / "movedForm"), pathToCache=str(tmp_path / "cache"))
+    assert getNbPixmaps(window) == 10
+
+########################################################################################################################
@@ -0,0 +1,110 @@
+########################################################################################################################
+# This class packs images of the same size (e.g., the four objects, or the four rooms) in one texture, an atlas, so
+# that they can all be drawn from one texture: the objects of a trial are then drawn with one ElementArrayStim (one
+# texture and one draw for all of them) and the rooms with one GratingStim (see Stimuli in atlas mode).
+# The images are in a grid of square cells, in the order they are given, on a square texture whose side is a power of
+# two (PsychoPy only tiles such textures). An image can be put on a background colour (e.g., the objects on the colour
+# of their position rectangle, so that the rectangle does not have to be drawn).
+# The atlases are built for the size of the cells (and so for a screen resolution), from the images of the ImageCache,
+# and kept in its directory under the hash of their images: ATLAS.py builds them in advance for a resolution, otherwise
+# they are built the first time they are used.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from hashlib import sha256
+from math import ceil, log2, sqrt
+from os import path
+import numpy as np
+from PIL import Image
+from imageCache import ImageCache
+########################################
+
+
+########################################
+#             TextureAtlas             #
+########################################
+class TextureAtlas:
+    def __init__(self, atlasName, imageFiles, cellSize, background=None, imageCache=None):
+        self.atlasName = atlasName  # e.g. objects
+        self.imageFiles = imageFiles  # a dictionary of the image file of each name, in the order of the cells
+        self.cellSize = int(round(cellSize))  # the side of the cells in pixels (the size the images are shown at)
+        self.background = background  # a PsychoPy colour ([-1, -1, -1] to [1, 1, 1]), or None for a black background
+        if imageCache is None:
+            imageCache = ImageCache()
+        self.imageCache = imageCache
+
+        # The grid of the cells and the side of the texture (a power of two):
+        self.nbColumns = ceil(sqrt(len(imageFiles)))
+        self.nbRows = ceil(len(imageFiles) / self.nbColumns)
+        self.atlasSize = 2 ** ceil(log2(max(self.nbColumns, self.nbRows) * self.cellSize))
+
+        # The position of each image in the texture, as the phase that centres a cell-sized stimulus on its cell. The
+        # texture coordinates of a stimulus go from 0.5 - phase - cycles / 2 to 0.5 - phase + cycles / 2 (cycles being
+        # the part of the texture the stimulus shows, cellSize / atlasSize), and the rows of a texture go up (the first
+        # row of the atlas file is its top, see getTexture).
+        self.cycles = self.cellSize / self.atlasSize
+        self.phases = {}
+        for i, name in enumerate(imageFiles):
+            column, row = i % self.nbColumns, i // self.nbColumns
+            cellCentre = [(column + 0.5) * self.cycles, 1 - (row + 0.5) * self.cycles]
+            self.phases[name] = [0.5 - cellCentre[0], 0.5 - cellCentre[1]]
+
+    # This function gives the name of the cache file of the atlas, with the hash of its images and background:
+    def getAtlasFile(self):
+        atlasHash = sha256()
+        for name, imageFile in self.imageFiles.items():
+            atlasHash.update(f"{name}:{self.imageCache.getFileHash(imageFile)};".encode())
+        atlasHash.update(str(self.background).encode())
+        return path.join(self.imageCache.pathToCache,
+                         f"{self.atlasName}Atlas_{self.cellSize}_{atlasHash.hexdigest()[:16]}.npy")
+
+    # This function packs the images (resized by the ImageCache) in the cells of the atlas and saves it as an RGB array
+    # (the first row of the array is the top of the atlas, as in an image file).
+    def makeAtlasFile(self, atlasFile):
+        atlas = np.zeros((self.atlasSize, self.atlasSize, 3), dtype=np.uint8)
+        backgroundColour = (0, 0, 0, 255)
+        if self.background is not None:
+            backgroundColour = tuple(int(round((value + 1) * 127.5)) for value in self.background) + (255,)
+
+        for i, (name, imageFile) in enumerate(self.imageFiles.items()):
+            image = self.imageCache.getImage(imageFile, self.cellSize)
+            cell = Image.alpha_composite(Image.new("RGBA", image.size, backgroundColour), image).convert("RGB")
+            column, row = i % self.nbColumns, i // self.nbColumns
+            atlas[row * self.cellSize:(row + 1) * self.cellSize,
+                  column * self.cellSize:(column + 1) * self.cellSize] = np.asarray(cell)
+        self.imageCache.saveCacheFile(atlasFile, atlas)
+
+    # This function builds the atlas if it is not in the cache yet, and gives the name of its file:
+    def buildAtlas(self):
+        atlasFile = self.getAtlasFile()
+        if not path.exists(atlasFile):
+            self.makeAtlasFile(atlasFile)
+        return atlasFile
+
+    # This is the function that users use. It gives the atlas as a PsychoPy texture: an image of its bytes as they are
+    # in the file (PsychoPy flips images, so their first row is the top), with no float copy of the whole atlas.
+    def getTexture(self):
+        return Image.fromarray(np.load(self.buildAtlas(), mmap_mode="r"))
+
+
+########################################
+#          makeStimuliAtlases          #
+########################################
+# This function gives the atlases of the objects (on the colour of their position rectangles) and of the rooms of the
+# stimuli, at the sizes they are shown at (see Stimuli).
+def makeStimuliAtlases(objectNames, roomNames, objectSize, roomSize, objectBackground, pathToImages="resources/",
+                       imageCache=None):
+    objectAtlas = TextureAtlas(atlasName="objects",
+                               imageFiles={name: pathToImages + name + ".png" for name in objectNames},
+                               cellSize=objectSize,
+                               background=objectBackground,
+                               imageCache=imageCache)
+    roomAtlas = TextureAtlas(atlasName="rooms",
+                             imageFiles={name: pathToImages + name + ".jpg" for name in roomNames},
+                             cellSize=roomSize,
+                             imageCache=imageCache)
+    return objectAtlas, roomAtlas
+
+########################################################################################################################
@@ -0,0 +1,137 @@
+########################################################################################################################
+# This class gives the ImageStims of the stimuli only when they are needed, for stimulus sets too large to have all
+# their images decoded and on the graphics card at once (see Stimuli with streamImages=True).
+# The images of the next trial are prefetched: a thread of the texture manager reads them (from the ImageCache, which
+# decodes and resizes them the first time) while the trial's inter-trial interval is shown, and their textures are made
+# between the frames of the interval (OpenGL textures can only be made in the thread of the window), once the thread
+# has read them: a frame never waits for the thread (see Stimuli.areImagesReady). The textures are kept from the least
+# to the most recently used, and the least recently used ones are deleted when their total size is over
+# maxTextureBytes, except the pinned ones (the images of the screen being shown, see pin).
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from psychopy import visual
+from imageCache import ImageCache
+########################################
+
+
+########################################
+#            TextureManager            #
+########################################
+class TextureManager:
+    def __init__(self, window, imageCache=None, maxTextureBytes=256 * 1024 ** 2):
+        self.window = window  # The psychopy window we are using
+        if imageCache is None:
+            imageCache = ImageCache()
+        self.imageCache = imageCache
+        self.maxTextureBytes = maxTextureBytes  # the total size of the textures kept (RGBA, 4 bytes per pixel)
+
+        self.textures = OrderedDict()  # the ImageStim of each (image file, size), from the least recently used
+        self.textureBytes = 0
+        self.loadingImages = {}  # the images being read by the thread, as futures
+        self.pinnedKeys = set()  # the textures that cannot be deleted (see pin)
+        # (one thread, so that the image cache is only ever used by it)
+        self.loader = ThreadPoolExecutor(max_workers=1)
+
+    # This function gives the key of an image at a size (width and height in pixels, or one number for a square)
+    @staticmethod
+    def getKey(imageFile, size):
+        if np.isscalar(size):
+            size = (size, size)
+        return imageFile, (int(round(size[0])), int(round(size[1])))
+
+    # This function reads an image into memory (it is run in the thread):
+    def loadImage(self, imageFile, size):
+        return Image.fromarray(np.array(self.imageCache.getImage(imageFile, size)))
+
+    # This function starts reading an image in the thread, if it does not have a texture yet:
+    def prefetch(self, imageFile, size):
+        key = self.getKey(imageFile, size)
+        if key not in self.textures and key not in self.loadingImages:
+            self.loadingImages[key] = self.loader.submit(self.loadImage, *key)
+
+    # This function pins the texture of an image: it is not deleted until unpinAll is called, even if it is the least
+    # recently used (e.g., the images of a trial, from its prefetch to its end).
+    def pin(self, imageFile, size):
+        self.pinnedKeys.add(self.getKey(imageFile, size))
+
+    def unpinAll(self):
+        self.pinnedKeys.clear()
+
+    # This function gives whether the texture of an image is made (so that using it does not wait for anything):
+    def isReady(self, imageFile, size):
+        return self.getKey(imageFile, size) in self.textures
+
+    # This function makes the texture of an image (waiting for the thread to have read it, so it is only called with
+    # an image that was read, except when an image that was not prefetched is used), then deletes the least recently
+    # used textures that are not pinned until they fit in maxTextureBytes (the new one is always kept).
+    def makeTexture(self, key):
+        image = self.loadingImages.pop(key).result()
+        self.textures[key] = visual.ImageStim(
+            win=self.window,
+            image=image,
+            units="pix",
+            size=key[1])
+        self.textureBytes += key[1][0] * key[1][1] * 4
+
+        for oldKey in list(self.textures):
+            if self.textureBytes <= self.maxTextureBytes:
+                break
+            if oldKey != key and oldKey not in self.pinnedKeys:
+                self.textures.pop(oldKey).clearTextures()
+                self.textureBytes -= oldKey[1][0] * oldKey[1][1] * 4
+
+    # This function makes the textures of the images the thread has read, at most maxTextures of them (it is called
+    # between frames, so only a few are made before each frame).
+    def makePrefetchedTextures(self, maxTextures=1):
+        for key in [key for key, future in self.loadingImages.items() if future.done()][:maxTextures]:
+            self.makeTexture(key)
+
+    # This is the function that users use. It gives the ImageStim of an image at a size: the one already made, or else
+    # one made now (from the image prefetched, or read now).
+    def getTexture(self, imageFile, size):
+        key = self.getKey(imageFile, size)
+        if key not in self.textures:
+            self.prefetch(imageFile, size)
+            self.makeTexture(key)
+        self.textures.move_to_end(key)
+        return self.textures[key]
+
+
+########################################
+#            StreamedImages            #
+########################################
+# The images of stimuli (name: (image file, size)) as a dictionary of ImageStims that are made by the texture manager
+# when they are used, so it can replace the dictionaries of the images of Stimuli. An image can also be prefetched,
+# pinned, and checked to be ready by its name.
+class StreamedImages(Mapping):
+    def __init__(self, textureManager, images):
+        self.textureManager = textureManager
+        self.images = images
+
+    def prefetch(self, name):
+        self.textureManager.prefetch(*self.images[name])
+
+    def pin(self, name):
+        self.textureManager.pin(*self.images[name])
+
+    def isReady(self, name):
+        return self.textureManager.isReady(*self.images[name])
+
+    def __getitem__(self, name):
+        return self.textureManager.getTexture(*self.images[name])
+
+    def __iter__(self):
+        return iter(self.images)
+
+    def __len__(self):
+        return len(self.images)
+
+########################################################################################################################
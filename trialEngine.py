@@ -0,0 +1,415 @@
+########################################################################################################################
+# These two classes hold the logic of the trials without any window, sound or keyboard: which objects are presented,
+# which object the ghost selects, which rooms are visited, whether there is a treasure, and what is written in the
+# results. The PsychoPy trials (trials.py) are built on top of them, but they can also be run on their own (headless)
+# by giving them a responder that answers in place of the participant.
+########################################################################################################################
+
+##################################################
+#                    Imports                     #
+##################################################
+from randomStreams import generatorChoice
+##################################################
+
+
+##################################################
+#                 randomResponder                #
+##################################################
+# A responder is what answers the trials when they are run headless. It is given the trial, the current trial type and
+# the objects of the trial (as a dictionary of positions and objects) and it must return the response side ("left" or
+# "right") and the response time, or None if there was no response. It can also have a learn function that is given
+# what happened after the response (see agents.py).
+# This one simply answers randomly, in a response time between 300 ms and 1.5 seconds (using the responses stream of
+# the trial's random streams).
+def randomResponder(trial, currentTrialType, trialObjects):
+    generator = trial.randomStreams.responses
+    return generatorChoice(generator, ["left", "right"]), generator.uniform(0.300, 1.500)
+
+##################################################
+
+
+##################################################
+#                 TripletEngine                  #
+##################################################
+# This holds the logic of the three trials that form a triplet for the uncertain trials
+class TripletEngine:
+
+    def __init__(self, stimuliClass, randomStreams,
+                 uncertaintyComparison, ghostType, postType, standardType,
+                 rewardProbabilities, treasureOutcomes, isPractice=False):
+        # Only the combinations of the stimuli class are needed here (see StimuliEngine)
+        self.stimuliClass = stimuliClass
+        # The random streams of the session (see randomStreams.py), the trials use the layout stream
+        self.randomStreams = randomStreams
+
+        self.uncertaintyComparison = uncertaintyComparison  # the two pairs being compared in the uncertainty trial
+        self.ghostType = ghostType  # the choice of the ghost (index 0 or 1 of the pair of objects chosen)
+        self.postType = postType  # the type of trial occurring after the uncertainty trial ()
+        self.standardType = standardType  # the two objects of the standard trial
+        self.rewardProbabilities = rewardProbabilities  # The current reward probabilities of the different rooms
+        self.treasureOutcomes = treasureOutcomes  # Whether each room yields a treasure (drawn with the probabilities)
+        self.isPractice = isPractice  # Whether this is a practice trial or not
+
+        # The three trial types of a triplet
+        self.trialTypes = ["standard", "uncertain", "post"]
+
+        # Prepare the trial results: one row per trial type, as a dictionary of the columns of the results (see
+        # ResultsTable for the columns, the ones that are not given are NA)
+        self.trialResults = []
+        self.myType = "triplet"
+
+    # This function will run the trials of the triplet without presenting anything: the responder gives the responses
+    # (see randomResponder for what a responder is).
+    def runTrials(self, responder):
+        # It will go through each trial type
+        for currentTrialType in self.trialTypes:
+            trialObjects = self.startTrial(currentTrialType)
+            response = responder(self, currentTrialType, trialObjects)
+
+            # If the responder responded, go through the rooms of the response...
+            if response:
+                responseSide, responseTime = response
+                responseObjects, responseObjectsPositions, roomsToBeShown = \
+                    self.getResponseElements(currentTrialType, trialObjects, responseSide, responseTime)
+                isTreasures = [self.visitRoom(roomsToBeShown[0], currentTrialType, isLastRoom=False),
+                               self.visitRoom(roomsToBeShown[1], currentTrialType, isLastRoom=True)]
+                # ...and if the responder learns (e.g., an agent, see agents.py), give it what happened
+                if hasattr(responder, "learn"):
+                    responder.learn(self, currentTrialType, responseObjects, roomsToBeShown, isTreasures)
+
+            # ...otherwise record the missed response (and stop if the post trial cannot be created)
+            elif self.recordMissedResponse(currentTrialType):
+                break
+
+    # This function starts a trial: it records the trial type and the post type, and generates and records the objects
+    # of the trial.
+    def startTrial(self, currentTrialType):
+        # Adding trial type to results (as a new row):
+        self.currentResults = {"trialType": currentTrialType}
+        self.trialResults.append(self.currentResults)
+
+        # If post type, add the post trial's type (otherwise it is NA):
+        if currentTrialType == "post":
+            self.currentResults["postType"] = self.postType
+
+        # Get the objects (and generate the objects) for the trial:
+        trialObjects = self.getTrialObjects(currentTrialType)
+        # Adding the objects to results:
+        leftString = ""
+        rightString = ""
+        for key in trialObjects:
+            # by simply checking if there's left or right it allows to add the objects of standard trials that
+            # just have a left and a right object, but also the objects of uncertain trials because there are two
+            # left and two right objects. In uncertainty trial there will be two objects without a space between
+            # them, but that informs the experimenter as which combination of objects were presented.
+            if "left" in key.lower():  # use .lower() because it is top or bottom Left for uncertain trials
+                leftString += trialObjects[key]
+            else:  # right object
+                rightString += trialObjects[key]
+        self.currentResults["leftObjects"] = leftString
+        self.currentResults["rightObjects"] = rightString
+
+        return trialObjects
+
+    # This function records the response and prepares what follows it: the objects to present (and their positions)
+    # and the two rooms to be shown.
+    def getResponseElements(self, currentTrialType, trialObjects, responseSide, responseTime):
+        self.currentResults["responseSide"] = responseSide
+        self.currentResults["responseTime"] = responseTime
+
+        # Preparations if it is an uncertain trial:
+        if currentTrialType == "uncertain":
+
+            ############################
+            # Selecting with the ghost #
+            ############################
+            # Take the pair that was actually chosen (right or left)...
+            chosenPair = self.pairsForGhostSelection[responseSide]
+            # ...and select the one according to the ghost index (0 or 1)
+            ghostSelectedObject = chosenPair[self.ghostType]
+            # ...and keep track of which one was selected by the ghost
+            self.uncertaintyTrialInfo["ghostSelectedObject"] = ghostSelectedObject
+            self.currentResults["ghostSelected"] = ghostSelectedObject
+            # For each object in the chosen pair find the one NOT the select by the ghost one and set it as the
+            # rejected by the ghost
+            for object in chosenPair:
+                if object != ghostSelectedObject:
+                    ghostRejectedObject = object
+            self.uncertaintyTrialInfo["ghostRejectedObject"] = ghostRejectedObject
+            self.currentResults["ghostRejected"] = ghostRejectedObject
+
+            #####################
+            # Getting the rooms #
+            #####################
+            # The room common to both objects on that side:
+            commonSideRoom = self.uncertaintyTrialInfo["commonRoomLeftOrRight"][responseSide]
+
+            # For each room's object pair...
+            for room in self.stimuliClass.combiObjectsOfTheRooms:
+                # ...if the ghost-selected object is part of that pair but the ghost-reject object is not...
+                if ghostSelectedObject in self.stimuliClass.combiObjectsOfTheRooms[room] and \
+                        ghostRejectedObject not in self.stimuliClass.combiObjectsOfTheRooms[room]:
+                    # ...set this as the room unique to the ghost-selected object.
+                    roomUniqueToRewarded = room
+            # Create the rooms to be shown,
+            # the first one (the common one) will be shown first,
+            # and the second one (the one unique to the ghost-selected object) will be shown second.
+            roomsToBeShown = [commonSideRoom, roomUniqueToRewarded]
+
+            ###############################
+            # Getting the objectPositions #
+            ###############################
+            # Create a dictionary with the positions as keys and the objects that are top or bottom of the side
+            # chosen as entries.
+            if responseSide == "left":
+                responseObjects = {"centreTop": trialObjects["topLeft"],
+                                   "centreBottom": trialObjects["bottomLeft"]}
+            else:  # right
+                responseObjects = {"centreTop": trialObjects["topRight"],
+                                   "centreBottom": trialObjects["bottomRight"]}
+
+            responseObjectsPositions = list(responseObjects.keys())
+
+        # Preparations if it is a post or standard trial (there was no ghost selection):
+        else:
+            responseObjects = trialObjects[responseSide]  # just one left or right object
+            responseObjectsPositions = "centre"  # positioned in the centre
+            # select the rooms of the selected object and shuffle them to randomise which one is presented first
+            roomsToBeShown = self.stimuliClass.combiRoomsOfTheObjects[responseObjects]
+            self.randomStreams.layout.shuffle(roomsToBeShown)
+
+        return responseObjects, responseObjectsPositions, roomsToBeShown
+
+    # This function visits a room: it records the room, determines if there is treasure in it and notes it down.
+    # The second room is the last room of the trial.
+    def visitRoom(self, room, currentTrialType, isLastRoom):
+        if isLastRoom:
+            roomNb = "2"
+        else:
+            roomNb = "1"
+        # record which room:
+        self.currentResults["room" + roomNb] = room
+        # determine if there is treasure in this room:
+        isTreasure = self.getTreasure(room=room,
+                                      currentTrialType=currentTrialType,
+                                      roomNb=roomNb)
+        # Noting it down
+        if isTreasure:
+            self.currentResults["isTreasure" + roomNb] = 1
+        else:
+            self.currentResults["isTreasure" + roomNb] = 0
+
+        return isTreasure
+
+    # This function records a trial without response: the aspects that could not be collected (the response, the ghost
+    # selection and the rooms) are left as NA in its row. It returns True if the rest of the triplet cannot be run.
+    def recordMissedResponse(self, currentTrialType):
+        # If this was an uncertainty trail that was skipped, the post trial cannot be created; hence,
+        # it is best to stop here.
+        if currentTrialType == "uncertain":
+            # Need to record the skipped post trial that comes afterwards:
+            self.trialResults.append({"trialType": "post", "postType": self.postType})
+            return True
+        return False
+
+    # This function will generate all the object to present in the trail (and do other preparations)
+    def getTrialObjects(self, currentTrialType):
+
+        ##################
+        # Standard Trial #
+        ##################
+        if currentTrialType == "standard":
+            self.outroTiming = 0.150  # time at the end of each trial when participant see the selected object(s)
+
+            # Take the two objects of the standard trial and randomly set one to be on the left and one to be on the
+            # right. The use of the keys will help go through the objects and position them.
+            objectPair = list(self.standardType)
+            self.randomStreams.layout.shuffle(objectPair)
+            trialObjects = {"left": objectPair[0],
+                            "right": objectPair[1]}
+
+        ###################
+        # Uncertain Trial #
+        ###################
+        elif currentTrialType == "uncertain":
+            self.outroTiming = 0.850  # time at the end of each trial when participant see the selected object(s)
+
+            # Take the two pairs of objects from the uncertainty trial and randomly set one to be on the left and one
+            # to be on the right. The use of the keys will help go through the objects and position them.
+            uncertainComparison = self.uncertaintyComparison
+            self.randomStreams.layout.shuffle(uncertainComparison)
+            leftPair = uncertainComparison[0]
+            rightPair = uncertainComparison[1]
+            #####
+
+            # We are going to shuffle the left pair in order to randomly decide which objects goes on the top and
+            # which objects goes on the bottom:
+
+            # However, we want to keep the order of the pairs before the shuffle because we want the ghost selection
+            # to be counterbalanced
+            self.pairsForGhostSelection = {"left": leftPair,
+                                           "right": rightPair}
+
+            # shuffle the pair and set which on at top and which one at bottom:
+            self.randomStreams.layout.shuffle(leftPair)
+            topLeft = leftPair[0]
+            bottomLeft = leftPair[1]
+            #####
+
+            # Now we need to set the top and bottom right objects according to the room they have in common with the
+            # top and bottom left objects:
+
+            # Go through every room key of the combination of objects for each room...
+            for room in self.stimuliClass.combiObjectsOfTheRooms:
+
+                # ...if the top left object IS in the combination of objects for this room AND the bottom left object
+                # IS in this combination (i.e., it IS the combination of the left top and bottom objects)...
+                if topLeft in self.stimuliClass.combiObjectsOfTheRooms[room] and \
+                        bottomLeft in self.stimuliClass.combiObjectsOfTheRooms[room]:
+                    # ...set this room as the COMMON ROOM for the LEFT objects.
+                    leftSideCommonRoom = room
+
+                # ...if the top left object is NOT in the combination of objects for this room AND the bottom left
+                # object is NOT in this combination (i.e., it is NOT the combination of the left top and bottom objects;
+                # hence, it is the combination of the right top and bottom objects )...
+                if topLeft not in self.stimuliClass.combiObjectsOfTheRooms[room] and \
+                        bottomLeft not in self.stimuliClass.combiObjectsOfTheRooms[room]:
+                    # ...set this room as the COMMON ROOM for the RIGHT objects.
+                    rightSideCommonRoom = room
+
+                # For every object in the right pair...
+                for object in rightPair:
+
+                    # ...if the top left object is in the combination of objects for this room AND the this current
+                    # object of the right pair is part of the combination of objects for this room (i.e., this is the
+                    # room in common for the top left and right objects)...
+                    if topLeft in self.stimuliClass.combiObjectsOfTheRooms[room] and \
+                            object in self.stimuliClass.combiObjectsOfTheRooms[room]:
+                        # ...set this room as the top common room and...
+                        topCommonRoom = room
+                        # ...set this right pair object as the topRight object.
+                        topRight = object
+
+                    # ...if the bottom left object is in the combination of objects for this room AND the this current
+                    # object of the right pair is part of the combination of objects for this room (i.e., this is the
+                    # room in common for the bottom left and right objects)...
+                    if bottomLeft in self.stimuliClass.combiObjectsOfTheRooms[room] and \
+                            object in self.stimuliClass.combiObjectsOfTheRooms[room]:
+                        # ...set this room as the bottom common room and...
+                        bottomCommonRoom = room
+                        # ...set this right pair object as the bottomRight object.
+                        bottomRight = object
+
+            trialObjects = {"topLeft": topLeft,
+                            "bottomLeft": bottomLeft,
+                            "topRight": topRight,
+                            "bottomRight": bottomRight}
+
+            self.uncertaintyTrialInfo = {"commonRoomLeftOrRight": {"left": leftSideCommonRoom,
+                                                                   "right": rightSideCommonRoom},
+                                         "commonRoomTopOrBottom": {"top": topCommonRoom,
+                                                                   "bottom": bottomCommonRoom},
+                                         "trialObjects": trialObjects}
+        ##############
+        # Post Trial #
+        ##############
+        else:  # post trial type
+            self.outroTiming = 0.150  # time at the end of each trial when participant see the selected object(s)
+
+            if self.postType == "repeat":  # ghost-selected vs. horizontal counterpart
+
+                # For each possible position in the uncertainty trial...
+                for position in self.uncertaintyTrialInfo["trialObjects"]:
+                    # ...if the object at that position is the ghost-selected object...
+                    if self.uncertaintyTrialInfo["trialObjects"][position] \
+                            == self.uncertaintyTrialInfo["ghostSelectedObject"]:
+                        # ...get the position of that object, and replace any left or right in it with an empty string
+                        ghostSelectedPosition = position
+                        ghostSelectedPosition = ghostSelectedPosition.replace("Left", "")
+                        ghostSelectedPosition = ghostSelectedPosition.replace("Right", "")
+
+                # For each possible position in the uncertainty trial...
+                for position in self.uncertaintyTrialInfo["trialObjects"]:
+                    # ...if the object at that position is different from ghost-selected object but has the same top or
+                    # bottom position in it...
+                    if self.uncertaintyTrialInfo["trialObjects"][position] != \
+                            self.uncertaintyTrialInfo["ghostSelectedObject"] \
+                            and ghostSelectedPosition in position:
+                        # ...it is the vertical counter part of the ghost-selected object
+                        horizontalCounterpart = self.uncertaintyTrialInfo["trialObjects"][position]
+
+                # the object pair is made up of the ghost-selected and its horizontal counterpart
+                objectPair = [self.uncertaintyTrialInfo["ghostSelectedObject"], horizontalCounterpart]
+
+            elif self.postType == "switch":  # ghost-rejected vs. horizontal counterpart
+
+                # For each possible position in the uncertainty trial...
+                for position in self.uncertaintyTrialInfo["trialObjects"]:
+                    # ...if the object at that position is the ghost-rejected object...
+                    if self.uncertaintyTrialInfo["trialObjects"][position] \
+                            == self.uncertaintyTrialInfo["ghostRejectedObject"]:
+                        # ...get the position of that object, and replace any left or right in it with an empty string
+                        ghostRejectedPosition = position
+                        ghostRejectedPosition = ghostRejectedPosition.replace("Left", "")
+                        ghostRejectedPosition = ghostRejectedPosition.replace("Right", "")
+
+                # For each possible position in the uncertainty trial...
+                for position in self.uncertaintyTrialInfo["trialObjects"]:
+                    # ...if the object at that position is different from ghost-rejected object but has the same top or
+                    # bottom position in it...
+                    if self.uncertaintyTrialInfo["trialObjects"][position] != \
+                            self.uncertaintyTrialInfo["ghostRejectedObject"] \
+                            and ghostRejectedPosition in position:
+                        # ...it is the vertical counter part of the ghost-rejected object
+                        horizontalCounterpart = self.uncertaintyTrialInfo["trialObjects"][position]
+
+                # the object pair is made up of the ghost-rejected and its horizontal counterpart
+                objectPair = [self.uncertaintyTrialInfo["ghostRejectedObject"], horizontalCounterpart]
+
+            else:  # CLASH: ghost-selected vs. ghost-rejected
+                objectPair = [self.uncertaintyTrialInfo["ghostSelectedObject"],
+                              self.uncertaintyTrialInfo["ghostRejectedObject"]]
+
+            self.randomStreams.layout.shuffle(objectPair)  # randomly sets which one is left and which one is right
+            trialObjects = {"left": objectPair[0],
+                            "right": objectPair[1]}
+
+        return trialObjects
+
+    # This function determines if there was a treasure or not by using the room and the currentTrialType
+    # (the reward probabilities and treasure outcomes of each trial type are rows drawn beforehand by the experiment,
+    # with one column per room)
+    def getTreasure(self, room, currentTrialType, roomNb):
+        roomIndex = self.stimuliClass.roomIndices[room]
+        isTreasure = self.treasureOutcomes[currentTrialType][roomIndex]
+        # add the probability of the room (first or second room of the trial) to the results:
+        self.currentResults["rewardProbability" + roomNb] = self.rewardProbabilities[currentTrialType][roomIndex]
+
+        return isTreasure
+
+##################################################
+
+
+##################################################
+#                 StandardEngine                 #
+##################################################
+# This is the same as a triplet except it only has one trialType, the standard type:
+class StandardEngine(TripletEngine):
+    def __init__(self, stimuliClass, randomStreams, standardType, rewardProbabilities, treasureOutcomes,
+                 isPractice=False):
+        TripletEngine.__init__(self,
+                               stimuliClass=stimuliClass,
+                               randomStreams=randomStreams,
+                               uncertaintyComparison=None,
+                               ghostType=None,
+                               postType=None,
+                               standardType=standardType,
+                               rewardProbabilities=rewardProbabilities,
+                               treasureOutcomes=treasureOutcomes,
+                               isPractice=isPractice)
+
+        # The only trial type: standard
+        self.trialTypes = ["standard"]
+        self.myType = "standard"
+
+########################################################################################################################
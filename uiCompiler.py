@@ -0,0 +1,83 @@
+########################################################################################################################
+# This function gives the window of a Qt Designer form (.ui) like uic.loadUi, but from the form compiled into a python
+# module, so that its XML is not parsed again at every launch. The module is compiled by uic.compileUi the first time
+# and kept in resources/cache/ under the hash of the form: it is compiled again when the form is changed, and the older
+# versions are deleted. Python keeps the bytecode of the module, so the next launches only have to build the widgets.
+# The paths of the images of the form (e.g., its warning icons) are relative to the directory of the form, as with
+# uic.loadUi: the module joins them to formDirectory, which is set when it is loaded.
+########################################################################################################################
+
+########################################
+#                Imports               #
+########################################
+from hashlib import sha256
+from importlib.util import cache_from_source, module_from_spec, spec_from_file_location
+from io import StringIO
+from os import getpid, listdir, makedirs, path, remove, replace
+import re
+from xml.etree import ElementTree
+from PyQt5 import QtWidgets, uic
+########################################
+
+
+########################################
+#           compileUiModule            #
+########################################
+# This function compiles a form into a python module (through a temporary file, so that the module is always whole).
+# The form is compiled from its opened file, so that the paths of its images are kept as they are in the form, and they
+# are then joined to formDirectory (the resources of Qt, starting with ":", and absolute paths are left as they are).
+# The class of the top widget of the form (e.g., QMainWindow) is added at the end of the module as formWidgetClass.
+def compileUiModule(uiFile, moduleFile):
+    code = StringIO()
+    with open(uiFile, "rb") as form:
+        uic.compileUi(form, code)
+    code = re.sub(r'QtGui\.QPixmap\("([^":][^"]*)"\)',
+                  lambda image: image.group(0) if path.isabs(image.group(1))
+                  else f'QtGui.QPixmap(os.path.join(formDirectory, "{image.group(1)}"))',
+                  code.getvalue())
+    widgetClass = ElementTree.parse(uiFile).getroot().find("widget").get("class")
+
+    temporaryFile = moduleFile[:-len(".py")] + "." + str(getpid()) + ".tmp"
+    with open(temporaryFile, "w", encoding="utf-8") as module:
+        module.write(code)
+        module.write(f"\n\nimport os\n"
+                     f"formWidgetClass = \"{widgetClass}\"\n"
+                     f"formDirectory = \"\"  # (the directory of the form, set by loadCompiledUi)\n")
+    replace(temporaryFile, moduleFile)
+
+    # Deleting the older versions of the module (and their bytecode):
+    olderVersions = path.basename(moduleFile).rsplit("_", 1)[0] + "_"
+    for fileName in listdir(path.dirname(moduleFile)):
+        if fileName.startswith(olderVersions) and fileName.endswith(".py") and fileName != path.basename(moduleFile):
+            olderModule = path.join(path.dirname(moduleFile), fileName)
+            remove(olderModule)
+            if path.exists(cache_from_source(olderModule)):
+                remove(cache_from_source(olderModule))
+
+
+########################################
+#            loadCompiledUi            #
+########################################
+# This is the function that users use. It gives the window of the form, with its widgets as attributes (as uic.loadUi).
+def loadCompiledUi(uiFile, pathToCache="resources/cache/"):
+    with open(uiFile, "rb") as form:
+        formHash = sha256(form.read()).hexdigest()[:16]
+    formName = path.splitext(path.basename(uiFile))[0]
+    moduleFile = path.join(pathToCache, f"{formName}_{formHash}.py")
+    if not path.exists(moduleFile):
+        makedirs(pathToCache, exist_ok=True)
+        compileUiModule(uiFile, moduleFile)
+
+    moduleSpec = spec_from_file_location(f"{formName}_{formHash}", moduleFile)
+    module = module_from_spec(moduleSpec)
+    moduleSpec.loader.exec_module(module)
+    module.formDirectory = path.dirname(uiFile)
+
+    # The window is both the top widget and the form, so that setupUi puts the widgets on it:
+    formClass = next(value for name, value in vars(module).items() if name.startswith("Ui_"))
+    windowClass = type(formName + "Window", (getattr(QtWidgets, module.formWidgetClass), formClass), {})
+    window = windowClass()
+    window.setupUi(window)
+    return window
+
+########################################################################################################################